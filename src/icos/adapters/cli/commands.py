@@ -1,9 +1,8 @@
 from __future__ import annotations
 
 import json
-import sqlite3
 import time
-from typing import Dict, List, Optional
+from typing import Dict, List, Mapping, Optional
 
 from icos.tact.core.actions import ActionRequest
 from icos.tact.core.state import EncounterState
@@ -16,12 +15,11 @@ from icos.content.defs.entity import GenericEntityDefinition
 from icos.content.defs.item import EquipmentDefinition
 from icos.content.defs.spell import SpellDefinition
 from icos.game.runtime.actor import AttackProfile, ActorBlueprint
-from icos.game.runtime.instances import equipment_to_equipped_item
+from icos.game.runtime.instances import equipment_to_equipped_item, instantiate_actor_blueprint
 from icos.game.runtime.party import EncounterPlan
 from icos.game.systems import actor_snapshot
 from icos.game.combat.actions import ActionRegistry
 from icos.game.combat.controllers import PlannerConfig, PlannerController, PlayerController
-from icos.game.combat.factories import monster_to_actor_blueprint
 from icos.game.combat.loop import CombatLoop
 
 from .context import DevContext
@@ -47,10 +45,11 @@ def install_builtin_commands(registry: CommandRegistry[DevContext]) -> None:
     install_tact_commands(registry)
 
     registry.register("ensure_codex", "Build bundles + codex if needed.", _cmd_ensure_codex)
+    registry.register("warm", "Warm-up status, or warm endpoints in the background: warm [endpoint...]", _cmd_warm)
     registry.register("endpoints", "List all DB endpoints with entity counts.", _cmd_endpoints)
     registry.register("ls", "List entities in an endpoint: ls <endpoint> [limit]", _cmd_ls)
     registry.register("load", "Load one entity: load <endpoint> <api_index> [raw]", _cmd_load)
-    registry.register("find", "Search ids/names: find <text> [limit]", _cmd_find)
+    registry.register("find", "Search ids/names/descriptions: find <text...> [--limit N | limit=N]", _cmd_find)
 
     registry.register("play", "Start immediate playable battle: play [monster_api_index]", _cmd_play)
     registry.register("enc", "Encounter commands: enc new|add|run [replay=...]|reset|list", _cmd_enc)
@@ -101,6 +100,23 @@ def _cmd_ensure_codex(ctx: DevContext, _args: List[str]) -> str:
     return "Codex ensured."
 
 
+def _cmd_warm(ctx: DevContext, args: List[str]) -> str:
+    if args:
+        ctx.engine.warm(args)
+        return f"Warming {', '.join(args)} in the background."
+
+    warmup = ctx.engine.warmup
+    if warmup is None:
+        return "No warm-up started."
+    p = warmup.progress
+    if warmup.error is not None:
+        return f"Warm-up failed during {p.step}: {warmup.error}"
+    if warmup.cancelled:
+        return f"Warm-up cancelled during {p.step}."
+    state = "done" if warmup.done else f"{p.step} {p.done}/{p.total}"
+    return f"Warm-up {state} ({p.steps_done}/{p.steps_total} steps, {p.elapsed * 1000:.0f} ms)."
+
+
 def _cmd_endpoints(ctx: DevContext, _args: List[str]) -> str:
     counts = ctx.engine.count_entities_by_endpoint()
     if not counts:
@@ -151,41 +167,37 @@ def _cmd_load(ctx: DevContext, args: List[str]) -> str:
 
     if raw_mode:
         raw = getattr(entity, "raw_json", None)
-        if isinstance(raw, dict):
-            return json.dumps(raw, indent=2, sort_keys=True)
+        if isinstance(raw, Mapping):
+            return json.dumps(dict(raw), indent=2, sort_keys=True)
 
     return _format_entity_summary(entity)
 
 
 def _cmd_find(ctx: DevContext, args: List[str]) -> str:
-    if not args:
-        return "Usage: find <text> [limit]"
-
-    needle = args[0].lower()
-    limit = _parse_int(args[1]) if len(args) >= 2 else 50
+    # The limit needs an explicit token so numeric queries ("find cr 3") stay text.
+    limit: Optional[int] = 50
+    terms: List[str] = []
+    rest = iter(args)
+    for arg in rest:
+        if arg == "--limit":
+            limit = _parse_int(next(rest, None))
+        elif arg.startswith(("--limit=", "limit=")):
+            limit = _parse_int(arg.partition("=")[2])
+        else:
+            terms.append(arg)
+    if not terms:
+        return "Usage: find <text...> [--limit N | limit=N]"
     if limit is None or limit <= 0:
         return "Invalid limit."
+    query = " ".join(terms)
 
-    db = ctx.engine.paths.abs(ctx.engine.paths.codex_db)
-    con = sqlite3.connect(db.as_posix())
-    try:
-        cur = con.cursor()
-        cur.execute(
-            "SELECT endpoint, api_index, COALESCE(name, '') "
-            "FROM entities WHERE lower(id) LIKE ? OR lower(name) LIKE ? "
-            "ORDER BY endpoint, api_index LIMIT ?",
-            (f"%{needle}%", f"%{needle}%", limit),
-        )
-        rows = cur.fetchall()
-    finally:
-        con.close()
-
-    if not rows:
+    hits = ctx.engine.search(query, limit=limit)
+    if not hits:
         return "No matches."
 
-    lines = [f"Matches ({len(rows)}):"]
-    for endpoint, api_index, name in rows:
-        lines.append(f"  {endpoint}:{api_index:<24} {name}")
+    lines = [f"Matches ({len(hits)}):"]
+    for hit in hits:
+        lines.append(f"  {hit.endpoint}:{hit.api_index:<24} {hit.name}")
     return "\n".join(lines)
 
 
@@ -457,12 +469,12 @@ def _add_monster(
     if ctx.encounter is None:
         raise RuntimeError("No encounter initialized")
 
-    monster_def = ctx.engine.get_monster(api_index)
+    template = ctx.engine.get_actor_template(api_index, team=team)
     if heals is None:
-        heals = _default_enemy_heals(monster_def) if team == "enemies" else 0
+        heals = _default_enemy_heals(template.challenge_rating) if team == "enemies" else 0
 
-    monster = monster_to_actor_blueprint(
-        monster_def,
+    monster = instantiate_actor_blueprint(
+        template,
         team=team,
         instance_id=f"{team}:{api_index}_{len(ctx.encounter.actors) + 1}",
         max_hp_override=hp,
@@ -602,8 +614,7 @@ def _find_actor(ctx: DevContext, actor_id: str) -> ActorBlueprint | None:
     return next((a for a in ctx.encounter.actors if a.id == actor_id), None)
 
 
-def _default_enemy_heals(monster: MonsterDefinition) -> int:
-    cr = monster.challenge_rating
+def _default_enemy_heals(cr: float) -> int:
     if cr >= 10:
         return 3
     if cr >= 5:
@@ -11,6 +11,32 @@ def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--seed", type=int, default=None)
     parser.add_argument("--no-build", action="store_true", help="Skip ensure_codex() (dev only)")
+    parser.add_argument("--jobs", type=int, default=1, help="Bundle worker processes (0 = one per CPU)")
+    parser.add_argument(
+        "--snapshot",
+        action="store_true",
+        help="Serve compiled content from a precompiled codex snapshot (built on demand).",
+    )
+    parser.add_argument(
+        "--lazy-raw-json",
+        action="store_true",
+        help="Keep only typed fields of compiled content; fetch raw JSON on demand.",
+    )
+    parser.add_argument(
+        "--compress-codex",
+        action="store_true",
+        help="Store entity JSON in codex.db compressed with per-endpoint dictionaries.",
+    )
+    parser.add_argument(
+        "--ability-cache",
+        action="store_true",
+        help="Persist the compiled ability catalog next to codex.db and reuse it across runs.",
+    )
+    parser.add_argument(
+        "--no-warm",
+        action="store_true",
+        help="Do not compile hot content (conditions, monsters, features) in the background at startup.",
+    )
     parser.add_argument(
         "--verbose-events",
         dest="verbose_events",
@@ -26,9 +52,17 @@ def main() -> None:
     parser.set_defaults(verbose_events=False)
     args = parser.parse_args()
 
-    engine = GameEngine[ActorBlueprint](seed=args.seed)
+    engine = GameEngine[ActorBlueprint](
+        seed=args.seed,
+        use_snapshot=bool(args.snapshot),
+        lazy_raw_json=bool(args.lazy_raw_json),
+        persist_ability_catalog=bool(args.ability_cache),
+        compress_codex=bool(args.compress_codex),
+    )
     if not args.no_build:
-        engine.ensure_codex()
+        engine.ensure_codex(jobs=args.jobs)
+        if not args.no_warm:
+            engine.warm()
 
     ctx = DevContext(engine=engine, verbose_events=bool(args.verbose_events))
     registry = CommandRegistry()
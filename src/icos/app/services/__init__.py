@@ -1,3 +1,4 @@
 from .engine import GameEngine
+from .warmup import DEFAULT_WARM_ENDPOINTS, Warmup, WarmupProgress
 
-__all__ = ["GameEngine"]
+__all__ = ["DEFAULT_WARM_ENDPOINTS", "GameEngine", "Warmup", "WarmupProgress"]
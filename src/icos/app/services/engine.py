@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-from typing import Any, Callable, Generic, List, Mapping, Optional, TypeVar
+from typing import Any, Callable, Generic, Iterable, Iterator, List, Mapping, Optional, TypeVar
 
 from icos.tact.api.engine import KernelEngine
 from icos.tact.core.session import EncounterController, EncounterLoop
@@ -10,9 +11,11 @@ from icos.tact.core.types import ActorLike
 from icos.tact.events.types import Event
 from icos.tact.replay import ReplayFileV1, build_replay, write_replay
 
+from icos.content.cache import ContentCache
 from icos.content.loader import CodexLoader
 from icos.content.paths import ContentPaths
-from icos.content.db import CodexDb
+from icos.content.db import CodexDb, MonsterStats, SearchHit
+from icos.content.snapshot import CodexSnapshot, build_snapshot, open_snapshot
 from icos.content.store import ContentStore
 from icos.content.defs.condition import ConditionDefinition
 from icos.content.defs.creature import MonsterDefinition
@@ -20,10 +23,13 @@ from icos.content.defs.entity import GenericEntityDefinition
 from icos.content.defs.item import EquipmentDefinition
 from icos.content.defs.spell import SpellDefinition
 from icos.game.rules.dice import Dice
+from icos.game.runtime.instances import ActorTemplate, ActorTemplateCache
 from icos.game.runtime.party import EncounterPlan
-from icos.game.effects import AbilityDefinition, ability_from_feature
+from icos.game.effects import AbilityCatalog, AbilityCatalogCache
 
-from icos.content.bundles import bundle_pack
+from .warmup import DEFAULT_WARM_ENDPOINTS, ProgressSink, Warmup, WarmStep
+
+from icos.content.bundles import bundle_packs
 from icos.content.codex import (
     bundle_name_for_pack,
     compute_codex_checksum,
@@ -42,11 +48,19 @@ class GameEngine(Generic[TActor]):
     """
     paths: ContentPaths = field(default_factory=ContentPaths)
     seed: Optional[int] = None
+    content_cache: Optional[ContentCache] = None
+    use_snapshot: bool = False
+    lazy_raw_json: bool = False
+    persist_ability_catalog: bool = False
+    compress_codex: bool = False
 
     dice: Dice = field(init=False)
     loader: CodexLoader = field(init=False)
     db: CodexDb = field(init=False)
     content: ContentStore = field(init=False)
+    templates: ActorTemplateCache = field(init=False)
+    abilities: AbilityCatalogCache = field(init=False)
+    warmup: Optional[Warmup] = field(default=None, init=False)
     kernel: KernelEngine[TActor] = field(default_factory=KernelEngine)
 
     def __post_init__(self) -> None:
@@ -54,13 +68,22 @@ class GameEngine(Generic[TActor]):
         db_path = str(self.paths.abs(self.paths.codex_db))
         self.loader = CodexLoader(db_path=db_path)
         self.db = CodexDb(db_path=db_path)
-        self.content = ContentStore(db=self.db)
+        if self.content_cache is not None:
+            self.content = ContentStore(db=self.db, cache=self.content_cache, lazy_raw_json=self.lazy_raw_json)
+        else:
+            self.content = ContentStore(db=self.db, lazy_raw_json=self.lazy_raw_json)
+        self.templates = ActorTemplateCache(self.content)
+        catalog_path = self.paths.abs(self.paths.ability_catalog) if self.persist_ability_catalog else None
+        self.abilities = AbilityCatalogCache(self.content, path=catalog_path)
 
     # --- Content pipeline -------------------------------------------------
 
-    def ensure_codex(self) -> None:
+    def ensure_codex(self, *, jobs: int = 1) -> None:
         """
         Ensure bundles and codex.db exist and match the current enabled load order.
+
+        `jobs` > 1 bundles packs with that many worker processes (0 = one per CPU).
+        With `compress_codex`, entity JSON in codex.db is stored compressed.
         """
         manifest_path = self.paths.abs(self.paths.codex_manifest)
         bundles_dir = self.paths.abs(self.paths.bundles_dir)
@@ -73,21 +96,98 @@ class GameEngine(Generic[TActor]):
         pack_paths = [Path(p) for p in read_codex_manifest(manifest_path)]
         pack_roots = [self.paths.abs(p) for p in pack_paths]
 
-        for pack_root in pack_roots:
-            out_db = bundles_dir / bundle_name_for_pack(pack_root)
-            bundle_pack(pack_root, out_db)
+        bundle_packs(
+            [(pack_root, bundles_dir / bundle_name_for_pack(pack_root)) for pack_root in pack_roots],
+            jobs=jobs,
+        )
 
-        new_checksum = compute_codex_checksum(pack_roots, bundles_dir)
+        new_checksum = compute_codex_checksum(pack_roots, bundles_dir, compress=self.compress_codex)
 
         old_checksum = ""
         if checksum_path.exists():
             old_checksum = checksum_path.read_text(encoding="utf-8").strip()
 
-        if codex_db.exists() and old_checksum == new_checksum:
+        if not codex_db.exists() or old_checksum != new_checksum:
+            self.cancel_warm()
+            # Drop pooled read connections and the stale snapshot before the codex file is replaced.
+            self.content.set_snapshot(None)
+            self.db.close()
+            self.loader.close()
+            merge_codex(pack_roots, bundles_dir, codex_db, compress=self.compress_codex)
+            checksum_path.write_text(new_checksum + "\n", encoding="utf-8")
+            self.content.clear_cache()
+        self.templates.reset(new_checksum)
+        self.abilities.reset(new_checksum)
+
+        if self.use_snapshot:
+            self.ensure_snapshot()
+
+    def ensure_snapshot(self) -> None:
+        """
+        Attach a precompiled snapshot to the content store, rebuilding it when it
+        does not match the current codex checksum or compiler sources.
+        """
+        snapshot_path = self.paths.abs(self.paths.codex_snapshot)
+        checksum = self.db.get_meta("codex_checksum") or ""
+
+        current = self.content.snapshot
+        if current is not None and current.is_current(checksum):
             return
 
-        merge_codex(pack_roots, bundles_dir, codex_db)
-        checksum_path.write_text(new_checksum + "\n", encoding="utf-8")
+        snapshot = open_snapshot(snapshot_path)
+        if snapshot is not None and not snapshot.is_current(checksum):
+            snapshot.close()
+            snapshot = None
+
+        if snapshot is None:
+            self.content.set_snapshot(None)
+            build_snapshot(self.db, snapshot_path)
+            snapshot = CodexSnapshot(snapshot_path)
+
+        self.content.set_snapshot(snapshot)
+
+    def warm(
+        self,
+        endpoints: Iterable[str] | None = None,
+        *,
+        background: bool = True,
+        on_progress: Optional[ProgressSink] = None,
+    ) -> Warmup:
+        """
+        Compile `endpoints` (default: conditions, monsters, features) into the
+        content cache so the first encounter does not pay for it. "monsters"
+        also prefetches actor templates and "features" builds the ability catalog.
+
+        With `background` the work runs on a daemon thread and the returned
+        `Warmup` reports progress; otherwise it runs to completion first. Call
+        after `ensure_codex`; a previous warm-up is cancelled.
+        """
+        self.cancel_warm()
+        wanted = list(dict.fromkeys(DEFAULT_WARM_ENDPOINTS if endpoints is None else endpoints))
+        counts = self.content.count_by_endpoint()
+
+        steps: List[WarmStep] = []
+        for endpoint in wanted:
+            total = counts.get(endpoint, 0)
+            if endpoint == "features":
+                steps.append((endpoint, total, self.abilities.build))
+                continue
+            steps.append((endpoint, total, partial(self.content.iter_compiled, endpoint, populate_cache=True)))
+            if endpoint == "monsters":
+                steps.append(("monster templates", total, self._warm_templates))
+
+        self.warmup = Warmup(steps, on_progress=on_progress).start(background=background)
+        return self.warmup
+
+    def cancel_warm(self) -> None:
+        """Stop a running warm-up and wait for its worker to exit."""
+        if self.warmup is not None and not self.warmup.done:
+            self.warmup.cancel()
+
+    def _warm_templates(self) -> Iterator[str]:
+        api_indexes = [row.api_index for row in self.content.query_monsters()]
+        self.templates.prefetch(api_indexes)
+        yield from api_indexes
 
     # --- Generic content access ------------------------------------------
 
@@ -100,24 +200,47 @@ class GameEngine(Generic[TActor]):
     def get_entity(self, endpoint: str, api_index: str) -> object:
         return self.content.get_compiled(endpoint, api_index)
 
+    def get_entities(self, endpoint: str, api_indexes: Iterable[str]) -> list[object]:
+        return self.content.get_many(endpoint, api_indexes)
+
     def list_entities(self, endpoint: str, *, limit: int | None = None) -> list[object]:
         return self.content.list_compiled(endpoint, limit=limit)
 
+    def iter_entities(self, endpoint: str, *, limit: int | None = None) -> Iterator[object]:
+        return self.content.iter_compiled(endpoint, limit=limit)
+
     def list_endpoints(self) -> list[str]:
         return self.content.list_endpoints()
 
+    def search(self, query: str, *, endpoints: Iterable[str] | None = None, limit: int = 50) -> list[SearchHit]:
+        return self.content.search(query, endpoints=endpoints, limit=limit)
+
     def count_entities_by_endpoint(self) -> dict[str, int]:
         return self.content.count_by_endpoint()
 
     def get_monster(self, api_index: str) -> MonsterDefinition:
         return self.content.get_monster(api_index)
 
+    def get_actor_template(self, api_index: str, *, team: str = "enemies") -> ActorTemplate:
+        """Cached combat template for a monster; raises ValueError if it has no usable attacks."""
+        return self.templates.get(api_index, team=team)
+
+    def get_monsters(self, api_indexes: Iterable[str]) -> list[MonsterDefinition]:
+        return self.content.get_monsters(api_indexes)
+
     def list_monsters(self, *, limit: int | None = None) -> list[MonsterDefinition]:
         return self.content.list_monsters(limit=limit)
 
+    def query_monsters(self, **filters: Any) -> list[MonsterStats]:
+        """See `ContentStore.query_monsters` for the available filters."""
+        return self.content.query_monsters(**filters)
+
     def get_equipment(self, api_index: str) -> EquipmentDefinition:
         return self.content.get_equipment(api_index)
 
+    def get_equipment_many(self, api_indexes: Iterable[str]) -> list[EquipmentDefinition]:
+        return self.content.get_equipment_many(api_indexes)
+
     def list_equipment(self, *, limit: int | None = None) -> list[EquipmentDefinition]:
         return self.content.list_equipment(limit=limit)
 
@@ -186,29 +309,12 @@ class GameEngine(Generic[TActor]):
     ) -> ReplayFileV1:
         return build_replay(actors=actors, events=events, metadata=metadata)
 
+    def ability_catalog(self) -> AbilityCatalog:
+        """Abilities by feature api_index and id, built once per codex checksum; read-only."""
+        return self.abilities.get()
+
     def _inject_ability_catalog(self, loop: EncounterLoop[TActor]) -> None:
         setter = getattr(loop, "set_ability_catalog", None)
         if not callable(setter):
             return
-        setter(self._build_ability_catalog())
-
-    def _build_ability_catalog(self) -> dict[str, AbilityDefinition]:
-        out: dict[str, AbilityDefinition] = {}
-        try:
-            features = self.content.list_compiled("features")
-        except Exception:
-            return out
-
-        for entry in features:
-            if not isinstance(entry, GenericEntityDefinition):
-                continue
-            try:
-                ability = ability_from_feature(entry)
-            except Exception:
-                continue
-            if ability is None:
-                continue
-            out[entry.api_index] = ability
-            out[entry.id] = ability
-
-        return out
+        setter(self.abilities.get())
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, List, Sequence, Tuple
+
+# Endpoints the first interactive encounter touches: conditions for effects,
+# monsters for spawning, features for the ability catalog.
+DEFAULT_WARM_ENDPOINTS: Tuple[str, ...] = ("conditions", "monsters", "features")
+
+# name, expected item count (0 = unknown), work generator yielding once per item
+WarmStep = Tuple[str, int, Callable[[], Iterable[Any]]]
+
+
+@dataclass(frozen=True)
+class WarmupProgress:
+    step: str
+    done: int
+    total: int
+    steps_done: int
+    steps_total: int
+    elapsed: float
+    finished: bool = False
+
+
+ProgressSink = Callable[[WarmupProgress], None]
+
+
+class Warmup:
+    """
+    Runs warm-up steps (compile an endpoint, prefetch templates, ...) either
+    inline or on a daemon worker thread.
+
+    Progress is published every `report_every` items and at the end of each
+    step, both to `on_progress` (called from the worker thread) and to
+    `progress`. A failing step stops the run and is kept in `error`; it never
+    propagates into the caller, since everything warmed is also built on demand.
+    """
+
+    def __init__(
+        self,
+        steps: Sequence[WarmStep],
+        *,
+        on_progress: ProgressSink | None = None,
+        report_every: int = 64,
+    ) -> None:
+        self.steps: List[WarmStep] = list(steps)
+        self.on_progress = on_progress
+        self.report_every = max(1, int(report_every))
+        self.error: Exception | None = None
+        self.progress = WarmupProgress(step="", done=0, total=0, steps_done=0, steps_total=len(self.steps), elapsed=0.0)
+        self._cancel = threading.Event()
+        self._finished = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self, *, background: bool = True) -> "Warmup":
+        if self._thread is not None or self._finished.is_set():
+            raise RuntimeError("Warm-up already started.")
+        if not background:
+            self._run()
+            return self
+        self._thread = threading.Thread(target=self._run, name="icos-warmup", daemon=True)
+        self._thread.start()
+        return self
+
+    @property
+    def done(self) -> bool:
+        return self._finished.is_set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until the warm-up finishes; False if `timeout` expired first."""
+        return self._finished.wait(timeout)
+
+    def cancel(self, *, wait: bool = True) -> None:
+        """Stop after the current item (and wait for the worker unless `wait=False`)."""
+        self._cancel.set()
+        if wait and self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _run(self) -> None:
+        start = time.perf_counter()
+        steps_done = 0
+        try:
+            for name, total, work in self.steps:
+                done = 0
+                self._report(name, done, total, steps_done, start)
+                for _ in work():
+                    if self._cancel.is_set():
+                        return
+                    done += 1
+                    if done % self.report_every == 0:
+                        self._report(name, done, total, steps_done, start)
+                steps_done += 1
+                self._report(name, done, max(total, done), steps_done, start)
+        except Exception as exc:
+            self.error = exc
+        finally:
+            last = self.progress
+            self._report(last.step, last.done, last.total, last.steps_done, start, finished=True)
+            self._finished.set()
+
+    def _report(self, step: str, done: int, total: int, steps_done: int, start: float, *, finished: bool = False) -> None:
+        self.progress = WarmupProgress(
+            step=step,
+            done=done,
+            total=total,
+            steps_done=steps_done,
+            steps_total=len(self.steps),
+            elapsed=time.perf_counter() - start,
+            finished=finished,
+        )
+        if self.on_progress is not None:
+            try:
+                self.on_progress(self.progress)
+            except Exception:
+                pass
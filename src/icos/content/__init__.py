@@ -1,6 +1,20 @@
-from .db import CodexDb, EntityRow
+from .cache import CacheStats, ContentCache, LruCache, UnboundedCache
+from .db import CodexDb, EntityRow, MonsterStats, MonsterTemplateRow, SearchHit
 from .loader import CodexLoader
 from .paths import ContentPaths
 from .store import ContentStore
 
-__all__ = ["CodexDb", "CodexLoader", "ContentPaths", "ContentStore", "EntityRow"]
+__all__ = [
+    "CacheStats",
+    "CodexDb",
+    "CodexLoader",
+    "ContentCache",
+    "ContentPaths",
+    "ContentStore",
+    "EntityRow",
+    "LruCache",
+    "MonsterStats",
+    "MonsterTemplateRow",
+    "SearchHit",
+    "UnboundedCache",
+]
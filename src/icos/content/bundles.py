@@ -3,13 +3,20 @@ from __future__ import annotations
 import argparse
 import hashlib
 import json
+import os
 import sqlite3
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 Json = Dict[str, Any]
 
+# Bumped whenever the bundle schema or content hash definition changes;
+# bundles written with a different format are rebuilt from scratch.
+BUNDLE_FORMAT = "3"
+
 
 @dataclass(frozen=True)
 class SourceFile:
@@ -45,14 +52,28 @@ def iter_pack_json_files(pack_root: Path) -> List[SourceFile]:
     return files
 
 
-def compute_hash(files: List[SourceFile]) -> str:
+def file_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def compute_hash(files: List[SourceFile], digests: Dict[str, str] | None = None) -> str:
+    """
+    Pack content hash over (endpoint, api_index, per-file sha256) in file order.
+
+    `digests` maps source paths to precomputed file digests; files without an
+    entry are read from disk.
+    """
     h = hashlib.sha256()
     for f in files:
+        key = f.path.as_posix()
+        digest = digests.get(key) if digests is not None else None
+        if digest is None:
+            digest = file_digest(f.path.read_bytes())
         h.update(f.endpoint.encode("utf-8"))
         h.update(b"\0")
         h.update(f.api_index.encode("utf-8"))
         h.update(b"\0")
-        h.update(f.path.read_bytes())
+        h.update(digest.encode("ascii"))
         h.update(b"\n")
     return h.hexdigest()
 
@@ -87,9 +108,30 @@ def init_db(conn: sqlite3.Connection) -> None:
         )
         """
     )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS files (
+            source_path TEXT PRIMARY KEY,
+            entity_id TEXT NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            size INTEGER NOT NULL,
+            sha256 TEXT NOT NULL
+        )
+        """
+    )
     conn.commit()
 
 
+def read_meta(conn: sqlite3.Connection, key: str) -> str | None:
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT value FROM meta WHERE key = ? LIMIT 1", (key,))
+    except sqlite3.DatabaseError:
+        return None
+    row = cur.fetchone()
+    return str(row[0]) if row and row[0] is not None else None
+
+
 def set_meta(conn: sqlite3.Connection, key: str, value: str) -> None:
     cur = conn.cursor()
     cur.execute(
@@ -100,13 +142,85 @@ def set_meta(conn: sqlite3.Connection, key: str, value: str) -> None:
     conn.commit()
 
 
-def bundle_pack(pack_root: Path, out_db: Path) -> str:
+@dataclass(frozen=True)
+class _SourceTask:
+    source: SourceFile
+    known_digest: str | None = None
+
+
+@dataclass(frozen=True)
+class _LoadedSource:
+    digest: str
+    mtime_ns: int
+    size: int
+    name: str | None = None
+    json_text: str | None = None  # None when the content matches known_digest
+
+
+def _load_source(task: _SourceTask) -> _LoadedSource:
+    """
+    Read one pack file once and feed the same buffer to the hasher and the JSON
+    parser (runs in worker processes). Stat comes from the open descriptor so it
+    describes exactly the bytes that were hashed.
+    """
+    f = task.source
+    with f.path.open("rb") as fh:
+        st = os.fstat(fh.fileno())
+        data = fh.read()
+
+    digest = file_digest(data)
+    if digest == task.known_digest:
+        return _LoadedSource(digest=digest, mtime_ns=st.st_mtime_ns, size=st.st_size)
+
+    raw = json.loads(data)
+    validate_entity_schema(endpoint=f.endpoint, raw=raw, path=f.path)
+    name = raw.get("name") if isinstance(raw.get("name"), str) else None
+    return _LoadedSource(
+        digest=digest,
+        mtime_ns=st.st_mtime_ns,
+        size=st.st_size,
+        name=name,
+        json_text=canonical_json(raw),
+    )
+
+
+def canonical_json(raw: Any) -> str:
+    """Compact, key-order-preserving JSON text stored in bundle and codex DBs."""
+    return json.dumps(raw, ensure_ascii=False, separators=(",", ":"))
+
+
+def _chunksize(task_count: int) -> int:
+    return max(1, min(256, task_count // (4 * (os.cpu_count() or 1))))
+
+
+def resolve_jobs(jobs: int) -> int:
+    """Normalize a --jobs value: 0 or less means one worker per CPU."""
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def bundle_pack(
+    pack_root: Path,
+    out_db: Path,
+    *,
+    incremental: bool = True,
+    executor: Executor | None = None,
+) -> str:
     """
     Compile a content pack folder into a bundle SQLite DB.
     Returns the computed content hash.
+
+    In incremental mode an existing bundle is patched in place: files whose
+    (mtime, size) match the `files` table are trusted, files whose sha256 is
+    unchanged only get their stat refreshed, and only new/edited files are
+    re-parsed and validated. Entities for deleted files are dropped.
+
+    When `executor` is given, file loading is fanned out to it in chunks;
+    this process stays the single writer.
     """
     files = iter_pack_json_files(pack_root)
-    content_hash = compute_hash(files)
+    _check_duplicate_ids(files)
 
     manifest = read_manifest(pack_root)
     pack_type = str(manifest.get("type", "pack"))
@@ -114,35 +228,108 @@ def bundle_pack(pack_root: Path, out_db: Path) -> str:
     pack_version = str(manifest.get("version", "0.0.0"))
 
     out_db.parent.mkdir(parents=True, exist_ok=True)
-    if out_db.exists():
+    if out_db.exists() and not (incremental and _is_current_bundle(out_db)):
         out_db.unlink()
 
+    scan_started_ns = time.time_ns()
     conn = sqlite3.connect(out_db.as_posix())
     try:
         init_db(conn)
         cur = conn.cursor()
 
+        previous = _read_file_index(conn)
+        # Stat data is only trusted for files last modified before the previous
+        # scan began; anything newer may have changed within the same mtime tick.
+        trusted_before_ns = int(read_meta(conn, "scanned_at_ns") or 0)
+
+        current_paths = {f.path.as_posix() for f in files}
+        current_ids = {f"{f.endpoint}:{f.api_index}" for f in files}
+        for source_path, (entity_id, _mtime_ns, _size, _sha) in previous.items():
+            if source_path in current_paths:
+                continue
+            cur.execute("DELETE FROM files WHERE source_path = ?", (source_path,))
+            if entity_id not in current_ids:
+                cur.execute("DELETE FROM entities WHERE id = ?", (entity_id,))
+
+        digests: Dict[str, str] = {}
+        tasks: List[_SourceTask] = []
         for f in files:
-            raw = json.loads(f.path.read_text(encoding="utf-8"))
-            validate_entity_schema(endpoint=f.endpoint, raw=raw, path=f.path)
-            name = raw.get("name") if isinstance(raw.get("name"), str) else None
+            source_path = f.path.as_posix()
+            entity_id = f"{f.endpoint}:{f.api_index}"
+            prev = previous.get(source_path)
+            if prev is None:
+                tasks.append(_SourceTask(source=f))
+                continue
+
+            st = f.path.stat()
+            if (
+                prev[0] == entity_id
+                and prev[1] == st.st_mtime_ns
+                and prev[2] == st.st_size
+                and prev[1] < trusted_before_ns
+            ):
+                digests[source_path] = prev[3]
+                continue
+
+            tasks.append(
+                _SourceTask(
+                    source=f,
+                    known_digest=prev[3] if prev[0] == entity_id else None,
+                )
+            )
+
+        # Workers only read/parse/validate; rows are written here in file order
+        # so the bundle is identical however the work was scheduled.
+        if executor is not None and len(tasks) > 1:
+            loaded = executor.map(_load_source, tasks, chunksize=_chunksize(len(tasks)))
+        else:
+            loaded = map(_load_source, tasks)
+
+        for task, result in zip(tasks, loaded):
+            f = task.source
+            source_path = f.path.as_posix()
             entity_id = f"{f.endpoint}:{f.api_index}"
+            digests[source_path] = result.digest
+
+            if result.json_text is not None:
+                cur.execute(
+                    """
+                    INSERT INTO entities(id, endpoint, api_index, name, json, source_path)
+                    VALUES(?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                      endpoint=excluded.endpoint,
+                      api_index=excluded.api_index,
+                      name=excluded.name,
+                      json=excluded.json,
+                      source_path=excluded.source_path
+                    """,
+                    (entity_id, f.endpoint, f.api_index, result.name, result.json_text, source_path),
+                )
 
             cur.execute(
                 """
-                INSERT INTO entities(id, endpoint, api_index, name, json, source_path)
-                VALUES(?, ?, ?, ?, ?, ?)
+                INSERT INTO files(source_path, entity_id, mtime_ns, size, sha256)
+                VALUES(?, ?, ?, ?, ?)
+                ON CONFLICT(source_path) DO UPDATE SET
+                  entity_id=excluded.entity_id,
+                  mtime_ns=excluded.mtime_ns,
+                  size=excluded.size,
+                  sha256=excluded.sha256
                 """,
-                (entity_id, f.endpoint, f.api_index, name, json.dumps(raw), f.path.as_posix()),
+                (source_path, entity_id, result.mtime_ns, result.size, result.digest),
             )
 
         conn.commit()
 
+        content_hash = compute_hash(files, digests)
+
+        set_meta(conn, "bundle_format", BUNDLE_FORMAT)
         set_meta(conn, "pack_type", pack_type)
         set_meta(conn, "pack_name", pack_name)
         set_meta(conn, "pack_version", pack_version)
         set_meta(conn, "pack_root", pack_root.as_posix())
         set_meta(conn, "content_hash", content_hash)
+        set_meta(conn, "scanned_at_ns", str(scan_started_ns))
 
     finally:
         conn.close()
@@ -150,6 +337,59 @@ def bundle_pack(pack_root: Path, out_db: Path) -> str:
     return content_hash
 
 
+def bundle_packs(
+    packs: List[Tuple[Path, Path]],
+    *,
+    incremental: bool = True,
+    jobs: int = 1,
+) -> List[str]:
+    """
+    Bundle several (pack_root, out_db) pairs; returns content hashes in input order.
+
+    With jobs > 1 the packs are driven concurrently and share one process pool
+    for file loading, so both large packs and many small packs use all cores.
+    Each bundle still has a single writer, so output hashes match a serial run.
+    """
+    jobs = resolve_jobs(jobs)
+    if jobs <= 1:
+        return [bundle_pack(root, out_db, incremental=incremental) for root, out_db in packs]
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        with ThreadPoolExecutor(max_workers=max(1, len(packs))) as drivers:
+            futures = [
+                drivers.submit(bundle_pack, root, out_db, incremental=incremental, executor=pool)
+                for root, out_db in packs
+            ]
+            return [future.result() for future in futures]
+
+
+def _check_duplicate_ids(files: List[SourceFile]) -> None:
+    seen: Dict[str, Path] = {}
+    for f in files:
+        entity_id = f"{f.endpoint}:{f.api_index}"
+        other = seen.get(entity_id)
+        if other is not None:
+            raise ValueError(f"{f.path}: duplicate entity id {entity_id!r} (also defined by {other}).")
+        seen[entity_id] = f.path
+
+
+def _is_current_bundle(db_path: Path) -> bool:
+    conn = sqlite3.connect(db_path.as_posix())
+    try:
+        return read_meta(conn, "bundle_format") == BUNDLE_FORMAT
+    finally:
+        conn.close()
+
+
+def _read_file_index(conn: sqlite3.Connection) -> Dict[str, Tuple[str, int, int, str]]:
+    cur = conn.cursor()
+    cur.execute("SELECT source_path, entity_id, mtime_ns, size, sha256 FROM files")
+    return {
+        str(source_path): (str(entity_id), int(mtime_ns), int(size), str(sha))
+        for (source_path, entity_id, mtime_ns, size, sha) in cur.fetchall()
+    }
+
+
 def validate_entity_schema(*, endpoint: str, raw: Any, path: Path) -> None:
     if not isinstance(raw, dict):
         raise ValueError(f"{path}: entity JSON must be an object.")
@@ -226,15 +466,16 @@ def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--pack", action="append", required=True, help="Pack folder (repeatable)")
     parser.add_argument("--out-dir", default="data/bundles", help="Output directory for bundle DBs")
+    parser.add_argument("--full", action="store_true", help="Rebuild bundles from scratch instead of patching")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes (0 = one per CPU)")
     args = parser.parse_args()
 
     out_dir = Path(args.out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    for p in args.pack:
-        pack_root = Path(p)
-        out_db = out_dir / default_bundle_name(pack_root)
-        h = bundle_pack(pack_root, out_db)
+    packs = [(Path(p), out_dir / default_bundle_name(Path(p))) for p in args.pack]
+    hashes = bundle_packs(packs, incremental=not args.full, jobs=args.jobs)
+    for (pack_root, out_db), h in zip(packs, hashes):
         print(f"Bundled {pack_root} -> {out_db} (hash={h})")
 
 
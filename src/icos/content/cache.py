@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, fields, is_dataclass
+from typing import Any, Dict, Iterable, Protocol
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    pinned_entries: int = 0
+    approx_bytes: int = 0
+
+
+class ContentCache(Protocol):
+    """Cache policy for compiled definitions keyed by entity id (`endpoint:api_index`)."""
+
+    def get(self, key: str) -> Any | None: ...
+
+    def put(self, key: str, value: Any) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def stats(self) -> CacheStats: ...
+
+
+class UnboundedCache:
+    """Keeps every compiled definition for the life of the store (no byte accounting)."""
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, Any] = {}
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: str) -> Any | None:
+        value = self._entries.get(key)
+        if value is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        self._entries[key] = value
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(hits=self._hits, misses=self._misses, entries=len(self._entries))
+
+
+class LruCache:
+    """
+    Least-recently-used cache bounded by entry count and/or approximate bytes.
+
+    Entries of `pinned_endpoints` are kept outside the LRU and never evicted,
+    so hot lookup tables (e.g. conditions) survive churn from bulk browsing.
+    Safe to share with a warm-up thread: every operation holds one lock.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int | None = 4096,
+        max_bytes: int | None = None,
+        pinned_endpoints: Iterable[str] = (),
+    ) -> None:
+        if max_entries is not None and max_entries < 0:
+            raise ValueError("max_entries must be >= 0")
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError("max_bytes must be >= 0")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.pinned_endpoints = frozenset(pinned_endpoints)
+
+        self._lru: OrderedDict[str, tuple[Any, int]] = OrderedDict()
+        self._pinned: Dict[str, tuple[Any, int]] = {}
+        self._lru_bytes = 0
+        self._pinned_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._pinned.get(key)
+            if entry is None:
+                entry = self._lru.get(key)
+                if entry is not None:
+                    self._lru.move_to_end(key)
+
+            if entry is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: str, value: Any) -> None:
+        size = approx_size(value)
+
+        with self._lock:
+            if key.split(":", 1)[0] in self.pinned_endpoints:
+                old = self._pinned.get(key)
+                if old is not None:
+                    self._pinned_bytes -= old[1]
+                self._pinned[key] = (value, size)
+                self._pinned_bytes += size
+                return
+
+            old = self._lru.pop(key, None)
+            if old is not None:
+                self._lru_bytes -= old[1]
+            self._lru[key] = (value, size)
+            self._lru_bytes += size
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
+            self._pinned.clear()
+            self._lru_bytes = 0
+            self._pinned_bytes = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._lru) + len(self._pinned),
+                pinned_entries=len(self._pinned),
+                approx_bytes=self._lru_bytes + self._pinned_bytes,
+            )
+
+    def _evict(self) -> None:
+        while self._lru and self._over_budget():
+            _key, (_value, size) = self._lru.popitem(last=False)
+            self._lru_bytes -= size
+            self._evictions += 1
+
+    def _over_budget(self) -> bool:
+        if self.max_entries is not None and len(self._lru) > self.max_entries:
+            return True
+        if self.max_bytes is not None and self._lru_bytes > self.max_bytes:
+            return True
+        return False
+
+
+def approx_size(obj: Any) -> int:
+    """
+    Approximate deep size in bytes of a compiled definition.
+
+    Walks dataclass fields and builtin containers with `sys.getsizeof`; shared
+    objects are counted once. Intended for budgeting, not exact accounting.
+    """
+    seen: set[int] = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+
+        if isinstance(current, (str, bytes, int, float, bool)) or current is None:
+            continue
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif is_dataclass(current):
+            stack.extend(getattr(current, f.name) for f in fields(current))
+    return total
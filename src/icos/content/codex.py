@@ -3,12 +3,38 @@ from __future__ import annotations
 import argparse
 import hashlib
 import json
+import os
 import sqlite3
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
+
+from icos.content.compilers.creatures import MonsterCompiler
+from icos.content.db import CodexDb, EntityRow
+from icos.content.defs.creature import AttackSpec, MonsterDefinition, usable_attacks
+from icos.content.jsoncodec import DICT_SAMPLES, JSON_CODEC, JsonDecoder, JsonPacker, build_dictionary, load_dictionaries
+from icos.content.snapshot import build_snapshot
 
 Json = Dict[str, Any]
 
+# Bumped when the codex layout changes; part of the checksum so stale codexes are rebuilt.
+CODEX_FORMAT = "6"
+
+# `json_codec` meta value of a codex storing plain JSON text.
+PLAIN_CODEC = "plain"
+
+# Descriptive text gathered into the search index: every `desc` / `higher_level`
+# string in the entity JSON, top-level or nested, plus the names of creature
+# actions and traits (e.g. "Nimble Escape"). `{json}` is the JSON text expression.
+_SEARCH_BODY_SQL = """
+    (SELECT group_concat(t.value, ' ') FROM json_tree({json}) AS t
+     WHERE t.type = 'text'
+       AND (t.key IN ('desc', 'higher_level')
+            OR t.path LIKE '%.desc'
+            OR t.path LIKE '%.higher_level'
+            OR (t.key = 'name' AND rtrim(t.path, '[]0123456789') IN
+                ('$.actions', '$."legendary_actions"', '$.reactions', '$."special_abilities"'))))
+"""
+
 
 def read_codex_manifest(path: Path) -> List[Path]:
     """
@@ -71,23 +97,39 @@ def read_bundle_hash(bundle_db: Path) -> str:
         conn.close()
 
 
-def compute_codex_checksum(pack_roots: List[Path], bundle_dir: Path) -> str:
-    h = hashlib.sha256()
+def bundle_layers(pack_roots: List[Path], bundle_dir: Path) -> List[Tuple[str, str, str]]:
+    """(pack_root, bundle_name, content_hash) per pack, in load order."""
+    layers: List[Tuple[str, str, str]] = []
     for pack_root in pack_roots:
         bname = bundle_name_for_pack(pack_root)
-        bpath = bundle_dir / bname
+        layers.append((pack_root.as_posix(), bname, read_bundle_hash(bundle_dir / bname)))
+    return layers
+
+
+def compute_codex_checksum(pack_roots: List[Path], bundle_dir: Path, *, compress: bool = False) -> str:
+    return _layers_checksum(bundle_layers(pack_roots, bundle_dir), _codec(compress))
 
-        h.update(pack_root.as_posix().encode("utf-8"))
+
+def _codec(compress: bool) -> str:
+    return JSON_CODEC if compress else PLAIN_CODEC
+
+
+def _layers_checksum(layers: List[Tuple[str, str, str]], codec: str = PLAIN_CODEC) -> str:
+    h = hashlib.sha256()
+    h.update(f"codex_format={CODEX_FORMAT}\n".encode("utf-8"))
+    h.update(f"json_codec={codec}\n".encode("utf-8"))
+    for pack_root, bname, content_hash in layers:
+        h.update(pack_root.encode("utf-8"))
         h.update(b"\0")
         h.update(bname.encode("utf-8"))
         h.update(b"\0")
-        h.update(read_bundle_hash(bpath).encode("utf-8"))
+        h.update(content_hash.encode("utf-8"))
         h.update(b"\n")
 
     return h.hexdigest()
 
 
-def init_db(conn: sqlite3.Connection) -> None:
+def init_db(conn: sqlite3.Connection, *, with_indexes: bool = True) -> None:
     cur = conn.cursor()
     cur.execute(
         """
@@ -102,7 +144,6 @@ def init_db(conn: sqlite3.Connection) -> None:
         )
         """
     )
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_entities_endpoint_index ON entities(endpoint, api_index)")
     cur.execute(
         """
         CREATE TABLE IF NOT EXISTS meta (
@@ -111,77 +152,456 @@ def init_db(conn: sqlite3.Connection) -> None:
         )
         """
     )
+    # Per-endpoint zlib dictionaries of a compressed codex (see `jsoncodec`).
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS json_dicts (
+            endpoint TEXT PRIMARY KEY,
+            dict BLOB NOT NULL
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS entities_fts USING fts5(
+            id UNINDEXED,
+            endpoint UNINDEXED,
+            api_index,
+            name,
+            body,
+            tokenize = 'unicode61'
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS monster_stats (
+            id TEXT PRIMARY KEY,
+            api_index TEXT NOT NULL,
+            name TEXT NOT NULL,
+            challenge_rating REAL NOT NULL,
+            xp INTEGER NOT NULL,
+            hit_points INTEGER NOT NULL,
+            armor_class INTEGER NOT NULL,
+            size TEXT NOT NULL COLLATE NOCASE,
+            creature_type TEXT NOT NULL COLLATE NOCASE,
+            dexterity INTEGER NOT NULL,
+            attack_count INTEGER NOT NULL,
+            melee_attack_count INTEGER NOT NULL,
+            ranged_attack_count INTEGER NOT NULL
+        )
+        """
+    )
+    # Runtime-ready combat template per monster; usable = 0 marks "no usable attacks".
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS monster_templates (
+            id TEXT PRIMARY KEY,
+            api_index TEXT NOT NULL,
+            name TEXT NOT NULL,
+            challenge_rating REAL NOT NULL,
+            ac INTEGER NOT NULL,
+            max_hp INTEGER NOT NULL,
+            dex INTEGER NOT NULL,
+            usable INTEGER NOT NULL,
+            attacks TEXT NOT NULL
+        )
+        """
+    )
+    conn.commit()
+    if with_indexes:
+        create_indexes(conn)
+
+
+def create_indexes(conn: sqlite3.Connection) -> None:
+    cur = conn.cursor()
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_entities_endpoint_index ON entities(endpoint, api_index)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_entities_source_pack ON entities(source_pack)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_monster_stats_cr ON monster_stats(challenge_rating)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_monster_stats_type_cr ON monster_stats(creature_type, challenge_rating)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_monster_stats_size_cr ON monster_stats(size, challenge_rating)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_monster_stats_hp ON monster_stats(hit_points)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_monster_stats_ac ON monster_stats(armor_class)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_monster_stats_xp ON monster_stats(xp)")
     conn.commit()
 
 
-def set_meta(conn: sqlite3.Connection, key: str, value: str) -> None:
+def index_search_rows(conn: sqlite3.Connection, where: str = "", params: Tuple[Any, ...] = ()) -> None:
+    """
+    Add entities to the FTS index keyed by entity rowid. Hyphenated api_indexes
+    tokenize into words, so `find dragon` matches `adult-red-dragon`.
+    """
+    json_expr = "e.json"
+    if load_dictionaries(conn):
+        decoder = JsonDecoder(lambda: load_dictionaries(conn))
+        conn.create_function("icos_json_text", 2, decoder.text, deterministic=True)
+        json_expr = "icos_json_text(e.endpoint, e.json)"
+
+    body_sql = _SEARCH_BODY_SQL.format(json=json_expr)
+    conn.execute(
+        "INSERT INTO entities_fts(rowid, id, endpoint, api_index, name, body) "
+        f"SELECT e.rowid, e.id, e.endpoint, e.api_index, COALESCE(e.name, ''), COALESCE({body_sql}, '') "
+        f"FROM entities AS e {where}",
+        params,
+    )
+
+
+def index_monsters(conn: sqlite3.Connection, condition: str = "") -> None:
+    """
+    Materialize `monster_stats` and `monster_templates` rows for monsters
+    (optionally only those matching `condition` on `e`). Both come from the
+    compiled MonsterDefinition so they agree with what the game sees.
+    """
+    sql = "SELECT e.id, e.endpoint, e.api_index, COALESCE(e.name, ''), e.json FROM entities AS e WHERE e.endpoint = 'monsters'"
+    if condition:
+        sql += f" AND ({condition})"
+
+    compiler = MonsterCompiler()
+    decoder = JsonDecoder(lambda: load_dictionaries(conn))
+    cur = conn.execute(sql)
+    while True:
+        rows = cur.fetchmany(256)
+        if not rows:
+            break
+
+        stats: List[Tuple[Any, ...]] = []
+        templates: List[Tuple[Any, ...]] = []
+        for eid, endpoint, api_index, name, raw in rows:
+            monster = compiler.compile(
+                EntityRow(id=eid, endpoint=endpoint, api_index=api_index, name=name, json=decoder.loads(endpoint, raw))
+            )
+            attacks = usable_attacks(monster)
+            stats.append(_monster_stats_row(monster, attacks))
+            templates.append(_monster_template_row(monster, attacks))
+
+        conn.executemany("INSERT OR REPLACE INTO monster_stats VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", stats)
+        conn.executemany("INSERT OR REPLACE INTO monster_templates VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", templates)
+
+
+def _monster_armor_class(monster: MonsterDefinition) -> int:
+    return monster.armor_class[0].value if monster.armor_class else 10
+
+
+def _monster_stats_row(monster: MonsterDefinition, attacks: List[AttackSpec]) -> Tuple[Any, ...]:
+    ranged = sum(1 for attack in attacks if attack[4] == "ranged")
+    return (
+        monster.id,
+        monster.api_index,
+        monster.name,
+        float(monster.challenge_rating),
+        int(monster.xp),
+        max(1, int(monster.hit_points)),
+        _monster_armor_class(monster),
+        monster.size,
+        monster.creature_type,
+        int(monster.abilities.dexterity),
+        len(attacks),
+        len(attacks) - ranged,
+        ranged,
+    )
+
+
+def _monster_template_row(monster: MonsterDefinition, attacks: List[AttackSpec]) -> Tuple[Any, ...]:
+    return (
+        monster.id,
+        monster.api_index,
+        monster.name,
+        float(monster.challenge_rating),
+        _monster_armor_class(monster),
+        max(1, int(monster.hit_points)),
+        int(monster.abilities.dexterity),
+        1 if attacks else 0,
+        json.dumps(attacks, ensure_ascii=False, separators=(",", ":")),
+    )
+
+
+def set_meta(conn: sqlite3.Connection, key: str, value: str, *, commit: bool = True) -> None:
     cur = conn.cursor()
     cur.execute(
         "INSERT INTO meta(key, value) VALUES(?, ?) "
         "ON CONFLICT(key) DO UPDATE SET value=excluded.value",
         (key, value),
     )
+    if commit:
+        conn.commit()
+
+
+def read_meta(conn: sqlite3.Connection, key: str) -> str | None:
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT value FROM meta WHERE key = ? LIMIT 1", (key,))
+    except sqlite3.DatabaseError:
+        return None
+    row = cur.fetchone()
+    return str(row[0]) if row and row[0] is not None else None
+
+
+def _write_codex_meta(
+    conn: sqlite3.Connection,
+    *,
+    checksum: str,
+    layers: List[Tuple[str, str, str]],
+    bundle_dir: Path,
+    codec: str,
+) -> None:
+    set_meta(conn, "codex_format", CODEX_FORMAT, commit=False)
+    set_meta(conn, "json_codec", codec, commit=False)
+    set_meta(conn, "codex_checksum", checksum, commit=False)
+    set_meta(conn, "bundle_dir", bundle_dir.as_posix(), commit=False)
+    set_meta(conn, "pack_count", str(len(layers)), commit=False)
+    set_meta(conn, "packs", json.dumps([pack_root for pack_root, _bname, _hash in layers]), commit=False)
+    set_meta(conn, "bundles", json.dumps([list(layer) for layer in layers]), commit=False)
     conn.commit()
 
 
-def merge_codex(pack_roots: List[Path], bundle_dir: Path, out_db: Path) -> str:
+_COPY_BUNDLE_SQL = """
+    INSERT OR REPLACE INTO {target}(id, endpoint, api_index, name, json, source_pack, source_path)
+    SELECT id, endpoint, api_index, name, {json}, ?, source_path FROM bundle.entities
+"""
+
+# Evenly spaced sample documents per endpoint of the attached bundle.
+_SAMPLE_BUNDLE_SQL = """
+    SELECT endpoint, json FROM (
+        SELECT endpoint, json,
+               row_number() OVER (PARTITION BY endpoint ORDER BY id) - 1 AS rn,
+               count(*) OVER (PARTITION BY endpoint) AS n
+        FROM bundle.entities
+    )
+    WHERE rn % max(1, n / ?) = 0
+    ORDER BY endpoint, rn
+"""
+
+
+def merge_codex(
+    pack_roots: List[Path],
+    bundle_dir: Path,
+    out_db: Path,
+    *,
+    incremental: bool = True,
+    compress: bool = False,
+) -> str:
     """
     Merge bundle DBs into a single codex DB.
 
     Last writer wins by load order: later packs override earlier ones by entity id.
+
+    With `incremental`, an existing codex built from the same load order is patched
+    in place: only ids contributed by bundles whose content hash changed are
+    re-resolved. Otherwise the codex is rebuilt from scratch.
+
+    With `compress`, entity JSON is stored deflated against a per-endpoint
+    dictionary sampled from the bundles (`json_codec` = "zlib-dict"); readers
+    decode it transparently. Switching `compress` forces a rebuild.
     """
-    out_db.parent.mkdir(parents=True, exist_ok=True)
-    if out_db.exists():
-        out_db.unlink()
+    for pack_root in pack_roots:
+        bundle_path = bundle_dir / bundle_name_for_pack(pack_root)
+        if not bundle_path.exists():
+            raise FileNotFoundError(f"Missing bundle for pack {pack_root}: {bundle_path}")
+
+    layers = bundle_layers(pack_roots, bundle_dir)
+    codec = _codec(compress)
+    checksum = _layers_checksum(layers, codec)
 
-    checksum = compute_codex_checksum(pack_roots, bundle_dir)
+    if incremental and out_db.exists():
+        if _patch_codex(
+            out_db, pack_roots=pack_roots, bundle_dir=bundle_dir, layers=layers, checksum=checksum, codec=codec
+        ):
+            return checksum
+
+    _rebuild_codex(out_db, pack_roots=pack_roots, bundle_dir=bundle_dir, layers=layers, checksum=checksum, codec=codec)
+    return checksum
+
+
+def _attach_bundle(conn: sqlite3.Connection, bundle_path: Path) -> None:
+    conn.execute("ATTACH DATABASE ? AS bundle", (f"{bundle_path.resolve().as_uri()}?mode=ro",))
+
+
+def _copy_json_sql(conn: sqlite3.Connection, codec: str) -> str:
+    """
+    Column expression for bundle JSON copied into the codex. For a compressed
+    codex, registers the packer over the dictionaries already in `json_dicts`;
+    endpoints without a dictionary are stored plain.
+    """
+    if codec == PLAIN_CODEC:
+        return "json"
+    packer = JsonPacker(load_dictionaries(conn))
+    conn.create_function("icos_pack_json", 2, packer.pack, deterministic=True)
+    return "icos_pack_json(endpoint, json)"
+
+
+def _build_dictionaries(conn: sqlite3.Connection, bundle_paths: List[Path]) -> None:
+    """Sample every bundle (in load order) and store one dictionary per endpoint."""
+    samples: Dict[str, List[str]] = {}
+    for bundle_path in bundle_paths:
+        _attach_bundle(conn, bundle_path)
+        try:
+            for endpoint, raw in conn.execute(_SAMPLE_BUNDLE_SQL, (DICT_SAMPLES,)):
+                bucket = samples.setdefault(endpoint, [])
+                if len(bucket) < DICT_SAMPLES:
+                    bucket.append(raw)
+        finally:
+            conn.execute("DETACH DATABASE bundle")
+
+    conn.executemany(
+        "INSERT OR REPLACE INTO json_dicts(endpoint, dict) VALUES (?, ?)",
+        [(endpoint, build_dictionary(docs)) for endpoint, docs in sorted(samples.items())],
+    )
+    conn.commit()
+
+
+def _rebuild_codex(
+    out_db: Path,
+    *,
+    pack_roots: List[Path],
+    bundle_dir: Path,
+    layers: List[Tuple[str, str, str]],
+    checksum: str,
+    codec: str,
+) -> None:
+    """
+    Each bundle is ATTACHed read-only and copied with one INSERT OR REPLACE ... SELECT,
+    so rows never pass through Python (except through the compressor when
+    `codec` asks for it). The codex is a rebuildable artifact: it is written
+    unjournaled to a temp file and atomically swapped into place.
+    """
+    out_db.parent.mkdir(parents=True, exist_ok=True)
+    tmp_db = out_db.with_name(out_db.name + ".tmp")
+    if tmp_db.exists():
+        tmp_db.unlink()
 
-    conn_out = sqlite3.connect(out_db.as_posix())
+    conn_out = sqlite3.connect(tmp_db.resolve().as_uri(), uri=True)
     try:
-        init_db(conn_out)
-        cur_out = conn_out.cursor()
+        conn_out.execute("PRAGMA journal_mode=OFF")
+        conn_out.execute("PRAGMA synchronous=OFF")
+        init_db(conn_out, with_indexes=False)
+        if codec != PLAIN_CODEC:
+            _build_dictionaries(conn_out, [bundle_dir / bundle_name_for_pack(pack_root) for pack_root in pack_roots])
+        json_sql = _copy_json_sql(conn_out, codec)
 
         for pack_root in pack_roots:
-            bundle_path = bundle_dir / bundle_name_for_pack(pack_root)
-            if not bundle_path.exists():
-                raise FileNotFoundError(f"Missing bundle for pack {pack_root}: {bundle_path}")
-
-            conn_in = sqlite3.connect(bundle_path.as_posix())
+            # ATTACH is not allowed inside a transaction; each bundle is copied in its own.
+            _attach_bundle(conn_out, bundle_dir / bundle_name_for_pack(pack_root))
             try:
-                cur_in = conn_in.cursor()
-                cur_in.execute("SELECT id, endpoint, api_index, name, json, source_path FROM entities")
-                rows = cur_in.fetchall()
+                conn_out.execute(_COPY_BUNDLE_SQL.format(target="entities", json=json_sql), (pack_root.as_posix(),))
+                conn_out.commit()
             finally:
-                conn_in.close()
-
-            source_pack = pack_root.as_posix()
-            for (eid, endpoint, api_index, name, raw_json, source_path) in rows:
-                cur_out.execute(
-                    """
-                    INSERT INTO entities(id, endpoint, api_index, name, json, source_pack, source_path)
-                    VALUES(?, ?, ?, ?, ?, ?, ?)
-                    ON CONFLICT(id) DO UPDATE SET
-                      endpoint=excluded.endpoint,
-                      api_index=excluded.api_index,
-                      name=excluded.name,
-                      json=excluded.json,
-                      source_pack=excluded.source_pack,
-                      source_path=excluded.source_path
-                    """,
-                    (eid, endpoint, api_index, name, raw_json, source_pack, source_path),
-                )
+                conn_out.execute("DETACH DATABASE bundle")
 
-            conn_out.commit()
+        create_indexes(conn_out)
+        index_search_rows(conn_out)
+        index_monsters(conn_out)
+        _write_codex_meta(conn_out, checksum=checksum, layers=layers, bundle_dir=bundle_dir, codec=codec)
 
-        set_meta(conn_out, "codex_checksum", checksum)
-        set_meta(conn_out, "bundle_dir", bundle_dir.as_posix())
-        set_meta(conn_out, "pack_count", str(len(pack_roots)))
-        set_meta(conn_out, "packs", json.dumps([p.as_posix() for p in pack_roots]))
-
-    finally:
+    except BaseException:
         conn_out.close()
+        tmp_db.unlink(missing_ok=True)
+        raise
+    conn_out.close()
+
+    os.replace(tmp_db, out_db)
+
+
+def _patch_codex(
+    out_db: Path,
+    *,
+    pack_roots: List[Path],
+    bundle_dir: Path,
+    layers: List[Tuple[str, str, str]],
+    checksum: str,
+    codec: str,
+) -> bool:
+    """
+    Re-resolve only the entity ids touched by changed bundles. Returns False when
+    the existing codex cannot be patched (different load order, unknown layout,
+    other JSON codec). A compressed codex keeps its dictionaries.
+
+    Affected ids are those the changed bundles contain now plus those they won
+    previously (source_pack), which covers edits, additions and deletions. Winners
+    for those ids are recomputed across all bundles in load order into a temp
+    staging table, then swapped into `entities` in a single transaction.
+    """
+    conn = sqlite3.connect(out_db.resolve().as_uri(), uri=True)
+    try:
+        stored = read_meta(conn, "bundles")
+        if stored is None or read_meta(conn, "codex_format") != CODEX_FORMAT:
+            return False
+        if read_meta(conn, "json_codec") != codec:
+            return False
+        try:
+            previous = [tuple(layer) for layer in json.loads(stored)]
+        except (ValueError, TypeError):
+            return False
+        if [layer[:2] for layer in previous] != [layer[:2] for layer in layers]:
+            return False
+
+        changed = [i for i, (old, new) in enumerate(zip(previous, layers)) if old[2] != new[2]]
+        if not changed:
+            _write_codex_meta(conn, checksum=checksum, layers=layers, bundle_dir=bundle_dir, codec=codec)
+            return True
+
+        conn.execute("CREATE TEMP TABLE affected (id TEXT PRIMARY KEY)")
+        conn.execute(
+            """
+            CREATE TEMP TABLE staged (
+                id TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                api_index TEXT NOT NULL,
+                name TEXT,
+                json TEXT NOT NULL,
+                source_pack TEXT,
+                source_path TEXT
+            )
+            """
+        )
+        json_sql = _copy_json_sql(conn, codec)
 
-    return checksum
+        changed_packs = [layers[i][0] for i in changed]
+        placeholders = ", ".join("?" for _ in changed_packs)
+        conn.execute(
+            f"INSERT OR IGNORE INTO affected(id) SELECT id FROM main.entities WHERE source_pack IN ({placeholders})",
+            changed_packs,
+        )
+        conn.commit()
+
+        for i in changed:
+            _attach_bundle(conn, bundle_dir / layers[i][1])
+            try:
+                conn.execute("INSERT OR IGNORE INTO affected(id) SELECT id FROM bundle.entities")
+                conn.commit()
+            finally:
+                conn.execute("DETACH DATABASE bundle")
+
+        for pack_root in pack_roots:
+            _attach_bundle(conn, bundle_dir / bundle_name_for_pack(pack_root))
+            try:
+                conn.execute(
+                    _COPY_BUNDLE_SQL.format(target="staged", json=json_sql) + " WHERE id IN (SELECT id FROM affected)",
+                    (pack_root.as_posix(),),
+                )
+                conn.commit()
+            finally:
+                conn.execute("DETACH DATABASE bundle")
+
+        conn.execute(
+            "DELETE FROM main.entities_fts WHERE rowid IN "
+            "(SELECT rowid FROM main.entities WHERE id IN (SELECT id FROM affected))"
+        )
+        conn.execute("DELETE FROM main.monster_stats WHERE id IN (SELECT id FROM affected)")
+        conn.execute("DELETE FROM main.monster_templates WHERE id IN (SELECT id FROM affected)")
+        conn.execute("DELETE FROM main.entities WHERE id IN (SELECT id FROM affected)")
+        conn.execute(
+            "INSERT INTO main.entities(id, endpoint, api_index, name, json, source_pack, source_path) "
+            "SELECT id, endpoint, api_index, name, json, source_pack, source_path FROM staged"
+        )
+        index_search_rows(conn, "WHERE e.id IN (SELECT id FROM affected)")
+        index_monsters(conn, "e.id IN (SELECT id FROM affected)")
+        _write_codex_meta(conn, checksum=checksum, layers=layers, bundle_dir=bundle_dir, codec=codec)
+        return True
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
 
 
 def main() -> None:
@@ -190,6 +610,9 @@ def main() -> None:
     parser.add_argument("--bundle-dir", default="data/bundles", help="Bundle DB directory")
     parser.add_argument("--out", default="data/codex/codex.db", help="Output codex DB path")
     parser.add_argument("--write-checksum", default="data/codex/checksum.txt", help="Write checksum here")
+    parser.add_argument("--snapshot", default=None, help="Also write a precompiled snapshot to this path")
+    parser.add_argument("--full", action="store_true", help="Rebuild the codex instead of patching it")
+    parser.add_argument("--compress", action="store_true", help="Store entity JSON compressed (per-endpoint dictionaries)")
     args = parser.parse_args()
 
     manifest_path = Path(args.manifest)
@@ -198,13 +621,21 @@ def main() -> None:
     checksum_path = Path(args.write_checksum)
 
     pack_paths = [Path(p) for p in read_codex_manifest(manifest_path)]
-    checksum = merge_codex(pack_paths, bundle_dir, out_db)
+    checksum = merge_codex(pack_paths, bundle_dir, out_db, incremental=not args.full, compress=args.compress)
 
     checksum_path.parent.mkdir(parents=True, exist_ok=True)
     checksum_path.write_text(checksum + "\n", encoding="utf-8")
 
     print(f"Built {out_db} (codex_checksum={checksum})")
 
+    if args.snapshot:
+        db = CodexDb(out_db.as_posix())
+        try:
+            build_snapshot(db, Path(args.snapshot))
+        finally:
+            db.close()
+        print(f"Built {args.snapshot}")
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
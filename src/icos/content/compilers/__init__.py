@@ -3,7 +3,8 @@ from .conditions import ConditionCompiler
 from .creatures import MonsterCompiler
 from .generic import GenericCompiler
 from .items import EquipmentCompiler
-from .registry import CompilerRegistry
+from .plan import FieldPlan, PlanField
+from .registry import CompilerRegistry, register_default_compilers
 from .spells import SpellCompiler
 
 __all__ = [
@@ -12,7 +13,10 @@ __all__ = [
     "EntityCompiler",
     "EntityRecord",
     "EquipmentCompiler",
+    "FieldPlan",
     "GenericCompiler",
     "MonsterCompiler",
+    "PlanField",
     "SpellCompiler",
+    "register_default_compilers",
 ]
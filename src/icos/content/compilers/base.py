@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Generic, Mapping, Protocol, TypeVar
+from typing import Any, ClassVar, Generic, Mapping, Protocol, TypeVar
 
 T = TypeVar("T")
 
@@ -13,6 +13,13 @@ class EntityRecord:
     api_index: str
     name: str
     json: Mapping[str, Any]
+    # What compilers keep as the definition's `raw_json` instead of `json`
+    # (e.g. a `LazyRawJson` proxy); None keeps `json` itself.
+    raw_json: Mapping[str, Any] | None = None
+
+    # True for record types whose `json` is a private dict decoded for this
+    # record alone, which compilers may keep as `raw_json` without copying.
+    owns_json: ClassVar[bool] = False
 
 
 class EntityCompiler(Protocol[T]):
@@ -1,43 +1,31 @@
 from __future__ import annotations
 
-from typing import Any, Iterable
-
 from icos.content.defs.condition import ConditionDefinition
 
 from .base import EntityCompiler, EntityRecord
+from .plan import FieldPlan, PlanField, as_str, as_text_tuple, owned_json, str_or
 
 
 class ConditionCompiler(EntityCompiler[ConditionDefinition]):
     endpoint = "conditions"
 
     def compile(self, record: EntityRecord) -> ConditionDefinition:
-        raw = dict(record.json)
-        return ConditionDefinition(
+        raw = record.json
+        return _CONDITION_PLAN.build(
+            raw,
             id=record.id,
             endpoint=record.endpoint,
             api_index=record.api_index,
-            name=_as_str(raw.get("name"), fallback=record.name),
-            desc=tuple(_parse_desc(raw.get("desc"))),
-            url=_as_str(raw.get("url")),
-            raw_json=raw,
+            name=str_or(raw.get("name"), record.name),
+            raw_json=owned_json(record),
         )
 
 
-def _as_str(value: Any, *, fallback: str = "") -> str:
-    if isinstance(value, str):
-        return value
-    if value is None:
-        return fallback
-    return str(value)
-
-
-def _parse_desc(raw: Any) -> Iterable[str]:
-    if isinstance(raw, str):
-        return (raw,)
-    if not isinstance(raw, list):
-        return ()
-    out: list[str] = []
-    for value in raw:
-        if isinstance(value, (str, int, float)):
-            out.append(str(value))
-    return out
+_CONDITION_PLAN: FieldPlan[ConditionDefinition] = FieldPlan(
+    ConditionDefinition,
+    [
+        PlanField("desc", "desc", as_text_tuple),
+        PlanField("url", "url", as_str()),
+    ],
+    fixed=("id", "endpoint", "api_index", "name", "raw_json"),
+)
@@ -7,109 +7,44 @@ from icos.content.defs.common import (
     ActionTextBlock,
     ArmorClassEntry,
     DamageSpec,
-    ResourceRef,
     SpeedProfile,
 )
 from icos.content.defs.creature import MonsterAction, MonsterDefinition
 
 from .base import EntityCompiler, EntityRecord
-
+from .plan import (
+    FieldPlan,
+    PlanField,
+    as_dict,
+    as_float,
+    as_int,
+    as_ref,
+    as_ref_tuple,
+    as_scalar_str_tuple,
+    as_str,
+    as_str_map,
+    owned_json,
+    str_or,
+    tuple_of,
+)
 
 class MonsterCompiler(EntityCompiler[MonsterDefinition]):
     endpoint = "monsters"
 
     def compile(self, record: EntityRecord) -> MonsterDefinition:
-        raw = dict(record.json)
-        return MonsterDefinition(
+        raw = record.json
+        return _MONSTER_PLAN.build(
+            raw,
             id=record.id,
             endpoint=record.endpoint,
             api_index=record.api_index,
-            name=_as_str(raw.get("name"), fallback=record.name),
-            creature_type=_as_str(raw.get("type")),
-            subtype=_as_str(raw.get("subtype")),
-            size=_as_str(raw.get("size")),
-            alignment=_as_str(raw.get("alignment")),
-            languages=_as_str(raw.get("languages")),
-            challenge_rating=_as_float(raw.get("challenge_rating"), default=0.0),
-            xp=_as_int(raw.get("xp"), default=0),
-            proficiency_bonus=_as_int(raw.get("proficiency_bonus"), default=0),
-            armor_class=tuple(_parse_armor_class(raw.get("armor_class"))),
-            hit_points=_as_int(raw.get("hit_points"), default=1),
-            hit_dice=_as_str(raw.get("hit_dice")),
-            hit_points_roll=_as_str(raw.get("hit_points_roll")),
-            abilities=AbilityScores(
-                strength=_as_int(raw.get("strength"), default=10),
-                dexterity=_as_int(raw.get("dexterity"), default=10),
-                constitution=_as_int(raw.get("constitution"), default=10),
-                intelligence=_as_int(raw.get("intelligence"), default=10),
-                wisdom=_as_int(raw.get("wisdom"), default=10),
-                charisma=_as_int(raw.get("charisma"), default=10),
-            ),
-            speed=SpeedProfile(values=_parse_speed(raw.get("speed"))),
-            senses=_parse_dict(raw.get("senses")),
-            damage_immunities=tuple(_parse_str_seq(raw.get("damage_immunities"))),
-            damage_resistances=tuple(_parse_str_seq(raw.get("damage_resistances"))),
-            damage_vulnerabilities=tuple(_parse_str_seq(raw.get("damage_vulnerabilities"))),
-            condition_immunities=tuple(_parse_ref_names(raw.get("condition_immunities"))),
-            actions=tuple(_parse_monster_actions(raw.get("actions"))),
-            special_abilities=tuple(_parse_action_text(raw.get("special_abilities"))),
-            reactions=tuple(_parse_action_text(raw.get("reactions"))),
-            legendary_actions=tuple(_parse_action_text(raw.get("legendary_actions"))),
-            image=_as_str(raw.get("image")),
-            url=_as_str(raw.get("url")),
-            updated_at=_as_str(raw.get("updated_at")),
-            raw_json=raw,
+            name=str_or(raw.get("name"), record.name),
+            raw_json=owned_json(record),
         )
 
 
-def _as_int(value: Any, *, default: int = 0) -> int:
-    try:
-        return int(value)
-    except (TypeError, ValueError):
-        return default
-
-
-def _as_float(value: Any, *, default: float = 0.0) -> float:
-    try:
-        return float(value)
-    except (TypeError, ValueError):
-        return default
-
-
-def _as_str(value: Any, *, fallback: str = "") -> str:
-    if isinstance(value, str):
-        return value
-    if value is None:
-        return fallback
-    return str(value)
-
-
-def _parse_dict(value: Any) -> dict[str, Any]:
-    if isinstance(value, dict):
-        return dict(value)
-    return {}
-
-
-def _parse_ref(value: Any) -> ResourceRef | None:
-    if not isinstance(value, dict):
-        return None
-    index = value.get("index")
-    name = value.get("name")
-    if not isinstance(index, str) or not isinstance(name, str):
-        return None
-    url = value.get("url")
-    return ResourceRef(index=index, name=name, url=url if isinstance(url, str) else "")
-
-
-def _parse_ref_seq(values: Any) -> Iterable[ResourceRef]:
-    if not isinstance(values, list):
-        return ()
-    out: list[ResourceRef] = []
-    for value in values:
-        ref = _parse_ref(value)
-        if ref is not None:
-            out.append(ref)
-    return out
+_int = as_int()
+_str = as_str()
 
 
 def _parse_ref_names(values: Any) -> Iterable[str]:
@@ -126,22 +61,6 @@ def _parse_ref_names(values: Any) -> Iterable[str]:
     return out
 
 
-def _parse_str_seq(values: Any) -> Iterable[str]:
-    if not isinstance(values, list):
-        return ()
-    return [str(v) for v in values if isinstance(v, (str, int, float))]
-
-
-def _parse_speed(raw: Any) -> dict[str, str]:
-    if not isinstance(raw, dict):
-        return {}
-    out: dict[str, str] = {}
-    for key, value in raw.items():
-        if isinstance(key, str):
-            out[key] = _as_str(value)
-    return out
-
-
 def _parse_armor_class(raw: Any) -> Iterable[ArmorClassEntry]:
     if isinstance(raw, int):
         return (ArmorClassEntry(value=raw),)
@@ -157,19 +76,19 @@ def _parse_armor_class(raw: Any) -> Iterable[ArmorClassEntry]:
         if not isinstance(entry, dict):
             continue
 
-        value = _as_int(entry.get("value"), default=0)
+        value = _int(entry.get("value"))
         if value <= 0:
             continue
 
-        armor = tuple(_parse_ref_seq(entry.get("armor")))
-        spell = _parse_ref(entry.get("spell"))
+        armor = as_ref_tuple(entry.get("armor"))
+        spell = as_ref(entry.get("spell"))
 
         out.append(
             ArmorClassEntry(
                 value=value,
-                ac_type=_as_str(entry.get("type")),
+                ac_type=_str(entry.get("type")),
                 armor=armor,
-                condition=_as_str(entry.get("condition")),
+                condition=_str(entry.get("condition")),
                 spell=spell,
             )
         )
@@ -186,11 +105,11 @@ def _parse_damage(raw: Any) -> Iterable[DamageSpec]:
         if not isinstance(entry, dict):
             continue
 
-        dice = _as_str(entry.get("damage_dice"))
+        dice = _str(entry.get("damage_dice"))
         if not dice:
             continue
 
-        out.append(DamageSpec(damage_dice=dice, damage_type=_parse_ref(entry.get("damage_type"))))
+        out.append(DamageSpec(damage_dice=dice, damage_type=as_ref(entry.get("damage_type"))))
 
     return out
 
@@ -216,8 +135,8 @@ def _parse_action_text(raw: Any) -> Iterable[ActionTextBlock]:
     for entry in raw:
         if not isinstance(entry, dict):
             continue
-        name = _as_str(entry.get("name"))
-        desc = _as_str(entry.get("desc"))
+        name = _str(entry.get("name"))
+        desc = _str(entry.get("desc"))
         if name:
             out.append(ActionTextBlock(name=name, desc=desc))
     return out
@@ -232,13 +151,13 @@ def _parse_monster_actions(raw: Any) -> Iterable[MonsterAction]:
         if not isinstance(entry, dict):
             continue
 
-        name = _as_str(entry.get("name"))
+        name = _str(entry.get("name"))
         if not name:
             continue
 
-        desc = _as_str(entry.get("desc"))
+        desc = _str(entry.get("desc"))
         attack_bonus = entry.get("attack_bonus")
-        attack_bonus_num = _as_int(attack_bonus) if attack_bonus is not None else None
+        attack_bonus_num = _int(attack_bonus) if attack_bonus is not None else None
 
         nested_actions = tuple(_parse_action_text(entry.get("actions")))
 
@@ -254,3 +173,56 @@ def _parse_monster_actions(raw: Any) -> Iterable[MonsterAction]:
         )
 
     return out
+
+
+_ability = as_int(10)
+
+
+def _parse_speed_profile(raw: Any) -> SpeedProfile:
+    return SpeedProfile(values=as_str_map(raw))
+
+
+def _parse_abilities(raw: Any) -> AbilityScores:
+    get = raw.get
+    return AbilityScores(
+        strength=_ability(get("strength")),
+        dexterity=_ability(get("dexterity")),
+        constitution=_ability(get("constitution")),
+        intelligence=_ability(get("intelligence")),
+        wisdom=_ability(get("wisdom")),
+        charisma=_ability(get("charisma")),
+    )
+
+
+_MONSTER_PLAN: FieldPlan[MonsterDefinition] = FieldPlan(
+    MonsterDefinition,
+    [
+        PlanField("creature_type", "type", as_str()),
+        PlanField("subtype", "subtype", as_str()),
+        PlanField("size", "size", as_str()),
+        PlanField("alignment", "alignment", as_str()),
+        PlanField("languages", "languages", as_str()),
+        PlanField("challenge_rating", "challenge_rating", as_float(0.0)),
+        PlanField("xp", "xp", as_int(0)),
+        PlanField("proficiency_bonus", "proficiency_bonus", as_int(0)),
+        PlanField("armor_class", "armor_class", tuple_of(_parse_armor_class)),
+        PlanField("hit_points", "hit_points", as_int(1)),
+        PlanField("hit_dice", "hit_dice", as_str()),
+        PlanField("hit_points_roll", "hit_points_roll", as_str()),
+        PlanField("abilities", None, _parse_abilities),
+        PlanField("speed", "speed", _parse_speed_profile),
+        PlanField("senses", "senses", as_dict),
+        PlanField("damage_immunities", "damage_immunities", as_scalar_str_tuple),
+        PlanField("damage_resistances", "damage_resistances", as_scalar_str_tuple),
+        PlanField("damage_vulnerabilities", "damage_vulnerabilities", as_scalar_str_tuple),
+        PlanField("condition_immunities", "condition_immunities", tuple_of(_parse_ref_names)),
+        PlanField("actions", "actions", tuple_of(_parse_monster_actions)),
+        PlanField("special_abilities", "special_abilities", tuple_of(_parse_action_text)),
+        PlanField("reactions", "reactions", tuple_of(_parse_action_text)),
+        PlanField("legendary_actions", "legendary_actions", tuple_of(_parse_action_text)),
+        PlanField("image", "image", as_str()),
+        PlanField("url", "url", as_str()),
+        PlanField("updated_at", "updated_at", as_str()),
+    ],
+    fixed=("id", "endpoint", "api_index", "name", "raw_json"),
+)
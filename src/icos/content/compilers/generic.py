@@ -1,10 +1,9 @@
 from __future__ import annotations
 
-from typing import Any, Iterable
-
 from icos.content.defs.entity import GenericEntityDefinition
 
 from .base import EntityCompiler, EntityRecord
+from .plan import FieldPlan, PlanField, as_str, as_text_tuple, owned_json, str_or
 
 
 class GenericCompiler(EntityCompiler[GenericEntityDefinition]):
@@ -12,33 +11,22 @@ class GenericCompiler(EntityCompiler[GenericEntityDefinition]):
         self.endpoint = endpoint
 
     def compile(self, record: EntityRecord) -> GenericEntityDefinition:
-        raw = dict(record.json)
-        return GenericEntityDefinition(
+        raw = record.json
+        return _GENERIC_PLAN.build(
+            raw,
             id=record.id,
             endpoint=record.endpoint,
             api_index=record.api_index,
-            name=_as_str(raw.get("name"), fallback=record.name or record.api_index),
-            desc=tuple(_parse_desc(raw.get("desc"))),
-            url=_as_str(raw.get("url")),
-            raw_json=raw,
+            name=str_or(raw.get("name"), record.name or record.api_index),
+            raw_json=owned_json(record),
         )
 
 
-def _as_str(value: Any, *, fallback: str = "") -> str:
-    if isinstance(value, str):
-        return value
-    if value is None:
-        return fallback
-    return str(value)
-
-
-def _parse_desc(raw: Any) -> Iterable[str]:
-    if isinstance(raw, str):
-        return (raw,)
-    if not isinstance(raw, list):
-        return ()
-    out: list[str] = []
-    for item in raw:
-        if isinstance(item, (str, int, float)):
-            out.append(str(item))
-    return out
+_GENERIC_PLAN: FieldPlan[GenericEntityDefinition] = FieldPlan(
+    GenericEntityDefinition,
+    [
+        PlanField("desc", "desc", as_text_tuple),
+        PlanField("url", "url", as_str()),
+    ],
+    fixed=("id", "endpoint", "api_index", "name", "raw_json"),
+)
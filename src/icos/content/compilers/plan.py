@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+from dataclasses import MISSING, dataclass, fields
+from typing import Any, Callable, Generic, Iterable, Mapping, Sequence, Tuple, Type, TypeVar
+
+from icos.content.defs.common import ResourceRef
+
+from .base import EntityRecord
+
+T = TypeVar("T")
+
+Coercer = Callable[[Any], Any]
+
+
+@dataclass(frozen=True)
+class PlanField:
+    """
+    One definition field: where its value lives in the entity JSON and how to coerce it.
+
+    `key` is a top-level key, a path of keys into nested objects (a missing or
+    non-object step yields None), or None to hand the coercer the whole JSON object.
+    """
+
+    name: str
+    key: str | Tuple[str, ...] | None
+    coerce: Coercer
+
+
+class FieldPlan(Generic[T]):
+    """
+    Per-definition-class compile plan, built once per compiler.
+
+    `build(raw, **fixed)` reads every planned field straight from the entity
+    JSON, coerces it and passes it with the `fixed` values to the class
+    constructor. Fields that are neither planned nor fixed get their declared
+    defaults.
+    """
+
+    def __init__(self, cls: Type[T], plan: Sequence[PlanField], *, fixed: Iterable[str] = ()) -> None:
+        declared = {f.name: f for f in fields(cls)}  # type: ignore[arg-type]
+        fixed = tuple(fixed)
+
+        unknown = [f.name for f in plan if f.name not in declared] + [name for name in fixed if name not in declared]
+        if unknown:
+            raise ValueError(f"{cls.__name__} has no fields {unknown}")
+
+        covered = {f.name for f in plan} | set(fixed)
+        for f in declared.values():
+            if f.name not in covered and f.default is MISSING and f.default_factory is MISSING:
+                raise ValueError(f"{cls.__name__}.{f.name} has no default and is not planned")
+
+        self.cls = cls
+        self.plan = tuple(plan)
+        self.fixed = fixed
+        self._steps = tuple((f.name, *_split_key(f.key), f.coerce) for f in self.plan)
+
+    def build(self, raw: Mapping[str, Any], **fixed: Any) -> T:
+        get = raw.get
+        values = fixed
+        for name, key, rest, coerce in self._steps:
+            if key is None:
+                values[name] = coerce(raw)
+                continue
+            value = get(key)
+            for step in rest:
+                value = value.get(step) if isinstance(value, dict) else None
+            values[name] = coerce(value)
+        return self.cls(**values)
+
+
+def _split_key(key: str | Tuple[str, ...] | None) -> Tuple[str | None, Tuple[str, ...]]:
+    if key is None or isinstance(key, str):
+        return key, ()
+    return key[0], tuple(key[1:])
+
+
+def owned_json(record: EntityRecord) -> Mapping[str, Any]:
+    """
+    The record's JSON object as `raw_json`: the record's `raw_json` override
+    when set, adopted when the record owns it (a freshly decoded codex row),
+    otherwise copied so later changes to the caller's dict cannot reach the
+    definition.
+    """
+    if record.raw_json is not None:
+        return record.raw_json
+    raw = record.json
+    if record.owns_json and type(raw) is dict:
+        return raw
+    return dict(raw)
+
+
+# --- Coercers ---------------------------------------------------------------
+# Factories return closures with the default baked in and a fast path for the
+# JSON type that normally appears, so the common case is one type check.
+
+
+def str_or(value: Any, fallback: str) -> str:
+    """One-off `as_str` with a per-record fallback (e.g. the row's name)."""
+    if type(value) is str:
+        return value
+    if value is None:
+        return fallback
+    return value if isinstance(value, str) else str(value)
+
+
+def as_str(fallback: str = "") -> Coercer:
+    def coerce(value: Any) -> str:
+        if type(value) is str:
+            return value
+        if value is None:
+            return fallback
+        if isinstance(value, str):
+            return value
+        return str(value)
+
+    return coerce
+
+
+def as_int(default: int = 0) -> Coercer:
+    def coerce(value: Any) -> int:
+        if type(value) is int:
+            return value
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return default
+
+    return coerce
+
+
+def as_optional_int(value: Any) -> int | None:
+    if type(value) is int:
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def as_float(default: float = 0.0) -> Coercer:
+    def coerce(value: Any) -> float:
+        if type(value) is float:
+            return value
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return default
+
+    return coerce
+
+
+def as_bool(value: Any) -> bool:
+    return bool(value)
+
+
+def as_ref(value: Any) -> ResourceRef | None:
+    if not isinstance(value, dict):
+        return None
+    index = value.get("index")
+    name = value.get("name")
+    if not isinstance(index, str) or not isinstance(name, str):
+        return None
+    url = value.get("url")
+    return ResourceRef(index, name, url if isinstance(url, str) else "")
+
+
+def as_ref_tuple(values: Any) -> tuple[ResourceRef, ...]:
+    if not isinstance(values, list):
+        return ()
+    out: list[ResourceRef] = []
+    for value in values:
+        ref = as_ref(value)
+        if ref is not None:
+            out.append(ref)
+    return tuple(out)
+
+
+def as_text_tuple(values: Any) -> tuple[str, ...]:
+    """A string or a list of scalars as a tuple of strings (`desc`, `higher_level`)."""
+    if isinstance(values, str):
+        return (values,)
+    if not isinstance(values, list):
+        return ()
+    return tuple(v if type(v) is str else str(v) for v in values if isinstance(v, (str, int, float)))
+
+
+def as_scalar_str_tuple(values: Any) -> tuple[str, ...]:
+    """A list of scalars as a tuple of strings; anything else is empty."""
+    if not isinstance(values, list):
+        return ()
+    return tuple(v if type(v) is str else str(v) for v in values if isinstance(v, (str, int, float)))
+
+
+def as_str_map(value: Any) -> dict[str, str]:
+    if not isinstance(value, dict):
+        return {}
+    to_str = as_str()
+    return {key: to_str(val) for key, val in value.items() if isinstance(key, str)}
+
+
+def as_dict(value: Any) -> dict[str, Any]:
+    return dict(value) if isinstance(value, dict) else {}
+
+
+def tuple_of(parse: Callable[[Any], Iterable[T]]) -> Callable[[Any], tuple[T, ...]]:
+    """Adapt an existing `_parse_*` helper that returns an iterable."""
+
+    def coerce(value: Any) -> tuple[T, ...]:
+        return tuple(parse(value))
+
+    return coerce
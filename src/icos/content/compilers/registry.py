@@ -4,7 +4,11 @@ from dataclasses import dataclass, field
 from typing import Any, Dict
 
 from .base import EntityCompiler
+from .conditions import ConditionCompiler
+from .creatures import MonsterCompiler
 from .generic import GenericCompiler
+from .items import EquipmentCompiler
+from .spells import SpellCompiler
 
 
 @dataclass
@@ -26,3 +30,11 @@ class CompilerRegistry:
 
     def endpoints(self) -> list[str]:
         return sorted(self._compilers)
+
+
+def register_default_compilers(registry: CompilerRegistry) -> CompilerRegistry:
+    registry.register(MonsterCompiler())
+    registry.register(EquipmentCompiler())
+    registry.register(SpellCompiler())
+    registry.register(ConditionCompiler())
+    return registry
@@ -1,116 +1,70 @@
 from __future__ import annotations
 
-from typing import Any, Iterable
+from typing import Any
 
-from icos.content.defs.common import DamageSpec, ResourceRef
+from icos.content.defs.common import DamageSpec
 from icos.content.defs.spell import SpellDefinition
 
 from .base import EntityCompiler, EntityRecord
+from .plan import (
+    FieldPlan,
+    PlanField,
+    as_bool,
+    as_int,
+    as_ref,
+    as_ref_tuple,
+    as_scalar_str_tuple,
+    as_str,
+    as_str_map,
+    as_text_tuple,
+    owned_json,
+    str_or,
+)
 
 
 class SpellCompiler(EntityCompiler[SpellDefinition]):
     endpoint = "spells"
 
     def compile(self, record: EntityRecord) -> SpellDefinition:
-        raw = dict(record.json)
-        damage = raw.get("damage")
-
-        return SpellDefinition(
+        raw = record.json
+        return _SPELL_PLAN.build(
+            raw,
             id=record.id,
             endpoint=record.endpoint,
             api_index=record.api_index,
-            name=_as_str(raw.get("name"), fallback=record.name),
-            level=_as_int(raw.get("level"), default=0),
-            school=_parse_ref(raw.get("school")),
-            casting_time=_as_str(raw.get("casting_time")),
-            range=_as_str(raw.get("range")),
-            duration=_as_str(raw.get("duration")),
-            concentration=bool(raw.get("concentration")),
-            ritual=bool(raw.get("ritual")),
-            components=tuple(_parse_components(raw.get("components"))),
-            material=_as_str(raw.get("material")),
-            desc=tuple(_parse_text_list(raw.get("desc"))),
-            higher_level=tuple(_parse_text_list(raw.get("higher_level"))),
-            attack_type=_as_str(raw.get("attack_type")),
-            damage_at_slot_level=_parse_str_map(
-                damage.get("damage_at_slot_level") if isinstance(damage, dict) else None
-            ),
-            damage_at_character_level=_parse_str_map(
-                damage.get("damage_at_character_level") if isinstance(damage, dict) else None
-            ),
-            damage=tuple(_parse_damage_entries(damage.get("damage_type") if isinstance(damage, dict) else None)),
-            classes=tuple(_parse_ref_seq(raw.get("classes"))),
-            subclasses=tuple(_parse_ref_seq(raw.get("subclasses"))),
-            url=_as_str(raw.get("url")),
-            raw_json=raw,
+            name=str_or(raw.get("name"), record.name),
+            raw_json=owned_json(record),
         )
 
 
-def _as_str(value: Any, *, fallback: str = "") -> str:
-    if isinstance(value, str):
-        return value
-    if value is None:
-        return fallback
-    return str(value)
-
-
-def _as_int(value: Any, *, default: int = 0) -> int:
-    try:
-        return int(value)
-    except (TypeError, ValueError):
-        return default
-
-
-def _parse_ref(value: Any) -> ResourceRef | None:
-    if not isinstance(value, dict):
-        return None
-    index = value.get("index")
-    name = value.get("name")
-    if not isinstance(index, str) or not isinstance(name, str):
-        return None
-    url = value.get("url")
-    return ResourceRef(index=index, name=name, url=url if isinstance(url, str) else "")
-
-
-def _parse_ref_seq(values: Any) -> Iterable[ResourceRef]:
-    if not isinstance(values, list):
-        return ()
-    out: list[ResourceRef] = []
-    for value in values:
-        ref = _parse_ref(value)
-        if ref is not None:
-            out.append(ref)
-    return out
-
-
-def _parse_components(values: Any) -> Iterable[str]:
-    if not isinstance(values, list):
-        return ()
-    return [_as_str(v) for v in values if isinstance(v, (str, int, float))]
-
-
-def _parse_text_list(values: Any) -> Iterable[str]:
-    if isinstance(values, str):
-        return (values,)
-    if not isinstance(values, list):
-        return ()
-    return [_as_str(v) for v in values if isinstance(v, (str, int, float))]
-
-
-def _parse_str_map(value: Any) -> dict[str, str]:
-    if not isinstance(value, dict):
-        return {}
-    out: dict[str, str] = {}
-    for key, val in value.items():
-        if isinstance(key, str):
-            out[key] = _as_str(val)
-    return out
-
-
-def _parse_damage_entries(raw_damage_type: Any) -> Iterable[DamageSpec]:
-    if raw_damage_type is None:
-        return ()
-    ref = _parse_ref(raw_damage_type)
+def _parse_damage_entries(raw_damage_type: Any) -> tuple[DamageSpec, ...]:
+    ref = as_ref(raw_damage_type)
     if ref is None:
         return ()
     return (DamageSpec(damage_dice="", damage_type=ref),)
+
+
+_SPELL_PLAN: FieldPlan[SpellDefinition] = FieldPlan(
+    SpellDefinition,
+    [
+        PlanField("level", "level", as_int(0)),
+        PlanField("school", "school", as_ref),
+        PlanField("casting_time", "casting_time", as_str()),
+        PlanField("range", "range", as_str()),
+        PlanField("duration", "duration", as_str()),
+        PlanField("concentration", "concentration", as_bool),
+        PlanField("ritual", "ritual", as_bool),
+        PlanField("components", "components", as_scalar_str_tuple),
+        PlanField("material", "material", as_str()),
+        PlanField("desc", "desc", as_text_tuple),
+        PlanField("higher_level", "higher_level", as_text_tuple),
+        PlanField("attack_type", "attack_type", as_str()),
+        PlanField("damage_at_slot_level", ("damage", "damage_at_slot_level"), as_str_map),
+        PlanField("damage_at_character_level", ("damage", "damage_at_character_level"), as_str_map),
+        PlanField("damage", ("damage", "damage_type"), _parse_damage_entries),
+        PlanField("classes", "classes", as_ref_tuple),
+        PlanField("subclasses", "subclasses", as_ref_tuple),
+        PlanField("url", "url", as_str()),
+    ],
+    fixed=("id", "endpoint", "api_index", "name", "raw_json"),
+)
@@ -1,40 +1,213 @@
 from __future__ import annotations
 
 import json
+import re
 import sqlite3
+import threading
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, Iterator
+from pathlib import Path
+from typing import Any, Callable, ClassVar, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from icos.content.compilers.base import EntityRecord
+from icos.content.jsoncodec import JsonDecoder, load_dictionaries
 
 JsonDict = Dict[str, Any]
 
+# Inclusive (low, high) bounds; None leaves that side open.
+Range = Tuple[float | None, float | None]
+
+_ROW_COLUMNS = "id, endpoint, api_index, COALESCE(name, ''), json"
+_SQL_GET_ROW = f"SELECT {_ROW_COLUMNS} FROM entities WHERE endpoint = ? AND api_index = ? LIMIT 1"
+_SQL_GET_JSON = "SELECT json FROM entities WHERE id = ? LIMIT 1"
+_SQL_ITER_ENDPOINT = f"SELECT {_ROW_COLUMNS} FROM entities WHERE endpoint = ? ORDER BY api_index"
+_SQL_ITER_ENDPOINT_LIMIT = _SQL_ITER_ENDPOINT + " LIMIT ?"
+_SQL_LIST_ENDPOINTS = "SELECT DISTINCT endpoint FROM entities ORDER BY endpoint"
+_SQL_COUNT_BY_ENDPOINT = "SELECT endpoint, COUNT(*) FROM entities GROUP BY endpoint ORDER BY endpoint"
+
+# bm25 column weights for entities_fts(id, endpoint, api_index, name, body):
+# identifier and name hits outrank matches buried in description text.
+_SQL_SEARCH = (
+    "SELECT id, endpoint, api_index, name, bm25(entities_fts, 0.0, 0.0, 10.0, 10.0, 1.0) AS score "
+    "FROM entities_fts WHERE entities_fts MATCH ?{endpoint_filter} "
+    "ORDER BY score, endpoint, api_index LIMIT ?"
+)
+
+_MONSTER_STATS_COLUMNS = (
+    "id, api_index, name, challenge_rating, xp, hit_points, armor_class, size, creature_type, "
+    "dexterity, attack_count, melee_attack_count, ranged_attack_count"
+)
+_MONSTER_TEMPLATE_COLUMNS = "id, api_index, name, challenge_rating, ac, max_hp, dex, usable, attacks"
+_SQL_GET_MONSTER_TEMPLATE = f"SELECT {_MONSTER_TEMPLATE_COLUMNS} FROM monster_templates WHERE id = ? LIMIT 1"
+_MONSTER_STATS_ORDER = frozenset(
+    {"challenge_rating", "xp", "hit_points", "armor_class", "dexterity", "attack_count", "name", "api_index"}
+)
+
+_SEARCH_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+# Rows pulled per fetchmany() while streaming an endpoint.
+_ITER_BATCH_SIZE = 256
+
+# Stay well under SQLITE_MAX_VARIABLE_NUMBER (999 on older SQLite builds).
+_MAX_IN_PARAMS = 500
+
 
 @dataclass(frozen=True)
-class EntityRow:
+class EntityRow(EntityRecord):
+    """
+    A codex row; usable directly as a compiler `EntityRecord`. Every fetch
+    decodes a fresh `json` dict, so compilers adopt it instead of copying.
+    """
+
+    json: JsonDict
+
+    owns_json: ClassVar[bool] = True
+
+
+@dataclass(frozen=True)
+class SearchHit:
     id: str
     endpoint: str
     api_index: str
     name: str
-    json: JsonDict
+    score: float
+
+
+@dataclass(frozen=True)
+class MonsterStats:
+    id: str
+    api_index: str
+    name: str
+    challenge_rating: float
+    xp: int
+    hit_points: int
+    armor_class: int
+    size: str
+    creature_type: str
+    dexterity: int
+    attack_count: int
+    melee_attack_count: int
+    ranged_attack_count: int
+
+
+@dataclass(frozen=True)
+class MonsterTemplateRow:
+    """
+    Combat template persisted at merge time. `attacks` holds
+    (name, attack_bonus, damage_dice, damage_type, attack_kind) per usable
+    attack; `usable` is False for monsters the runtime cannot field.
+    """
+
+    id: str
+    api_index: str
+    name: str
+    challenge_rating: float
+    ac: int
+    max_hp: int
+    dex: int
+    usable: bool
+    attacks: Tuple[Tuple[str, int, str, str, str], ...]
+
+
+def fts_query(text: str) -> str:
+    """
+    Turn free text into an FTS5 query: every word must match, as a prefix.
+    Punctuation is dropped so user input never reaches the FTS query syntax.
+    """
+    return " ".join(f'"{token}"*' for token in _SEARCH_TOKEN.findall(text.lower()))
+
+
+class CodexConnectionPool:
+    """
+    Thread-local, long-lived read-only connections to a codex DB.
+
+    Each connection is opened with `mode=ro` (plus `immutable=1` when requested),
+    validated once, and reused; sqlite3's per-connection statement cache then
+    keeps the prepared lookups warm. `close()` drops every connection so the
+    next access reopens the (possibly rebuilt) file.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        *,
+        validate: Callable[[sqlite3.Connection], None],
+        immutable: bool = False,
+    ) -> None:
+        self.db_path = db_path
+        self.immutable = immutable
+        self._validate = validate
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._open: List[sqlite3.Connection] = []
+
+    def get(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and getattr(self._local, "generation", -1) == self._generation:
+            return conn
+
+        conn = self._open_connection()
+        with self._lock:
+            self._open.append(conn)
+            self._local.conn = conn
+            self._local.generation = self._generation
+            self._local.tables = None
+        return conn
+
+    def has_table(self, name: str) -> bool:
+        """Whether the codex has table `name` (read once per connection)."""
+        conn = self.get()
+        tables = self._local.tables
+        if tables is None:
+            cur = conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+            tables = self._local.tables = frozenset(str(row[0]) for row in cur.fetchall())
+        return name in tables
+
+    def close(self) -> None:
+        with self._lock:
+            conns, self._open = self._open, []
+            self._generation += 1
+        for conn in conns:
+            conn.close()
+
+    def _open_connection(self) -> sqlite3.Connection:
+        path = Path(self.db_path)
+        if not path.exists():
+            raise RuntimeError(f"Codex DB not found: {self.db_path}")
+
+        uri = f"{path.resolve().as_uri()}?mode=ro"
+        if self.immutable:
+            uri += "&immutable=1"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        try:
+            self._validate(conn)
+        except Exception:
+            conn.close()
+            raise
+        return conn
 
 
 class CodexDb:
     """Read-only typed access to codex entities table."""
 
-    def __init__(self, db_path: str) -> None:
+    def __init__(self, db_path: str, *, immutable: bool = False) -> None:
         self.db_path = db_path
+        self._pool = CodexConnectionPool(db_path, validate=self._assert_schema, immutable=immutable)
+        self._json = JsonDecoder(lambda: load_dictionaries(self._connect()))
 
     def _connect(self) -> sqlite3.Connection:
-        return sqlite3.connect(self.db_path)
+        return self._pool.get()
+
+    def close(self) -> None:
+        self._pool.close()
+        self._json.reset()
+
+    def _loads_json(self, endpoint: str, value: Any) -> JsonDict:
+        """Decode a `json` column value: JSON text, or a compressed value (see `jsoncodec`)."""
+        return self._json.loads(endpoint, value)
 
     @staticmethod
-    def _loads_json(value: Any) -> JsonDict:
-        if isinstance(value, (bytes, bytearray)):
-            return json.loads(value.decode("utf-8"))
-        if isinstance(value, str):
-            return json.loads(value)
-        raise TypeError(f"Unsupported JSON column type: {type(value)}")
-
-    def _assert_schema(self, conn: sqlite3.Connection) -> None:
+    def _assert_schema(conn: sqlite3.Connection) -> None:
         cur = conn.cursor()
         cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='entities'")
         if cur.fetchone() is None:
@@ -47,71 +220,253 @@ class CodexDb:
         if missing:
             raise RuntimeError(f"Invalid codex DB: entities table missing columns: {sorted(missing)}")
 
+    def _make_row(self, row: tuple[Any, ...]) -> EntityRow:
+        return EntityRow(
+            id=str(row[0]),
+            endpoint=str(row[1]),
+            api_index=str(row[2]),
+            name=str(row[3]),
+            json=self._loads_json(row[1], row[4]),
+        )
+
     def get_row(self, endpoint: str, api_index: str) -> EntityRow:
-        with self._connect() as conn:
-            self._assert_schema(conn)
-            cur = conn.cursor()
-            cur.execute(
-                "SELECT id, endpoint, api_index, COALESCE(name, ''), json "
-                "FROM entities WHERE endpoint = ? AND api_index = ? LIMIT 1",
-                (endpoint, api_index),
-            )
-            row = cur.fetchone()
-            if row is None:
-                raise KeyError(f"Entity not found: {endpoint}:{api_index}")
-
-            return EntityRow(
-                id=str(row[0]),
-                endpoint=str(row[1]),
-                api_index=str(row[2]),
-                name=str(row[3]),
-                json=self._loads_json(row[4]),
-            )
+        cur = self._connect().execute(_SQL_GET_ROW, (endpoint, api_index))
+        row = cur.fetchone()
+        if row is None:
+            raise KeyError(f"Entity not found: {endpoint}:{api_index}")
+        return self._make_row(row)
 
-    def iter_endpoint(self, endpoint: str, *, limit: int | None = None) -> Iterator[EntityRow]:
-        with self._connect() as conn:
-            self._assert_schema(conn)
-            cur = conn.cursor()
+    def get_json(self, entity_id: str) -> JsonDict:
+        row = self._connect().execute(_SQL_GET_JSON, (entity_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"Entity not found: {entity_id}")
+        return self._loads_json(entity_id.split(":", 1)[0], row[0])
 
-            sql = (
-                "SELECT id, endpoint, api_index, COALESCE(name, ''), json "
-                "FROM entities WHERE endpoint = ? ORDER BY api_index"
-            )
-            params: tuple[Any, ...]
-            if limit is not None:
-                sql += " LIMIT ?"
-                params = (endpoint, int(limit))
-            else:
-                params = (endpoint,)
-
-            cur.execute(sql, params)
-            rows = cur.fetchall()
-
-        for row in rows:
-            yield EntityRow(
-                id=str(row[0]),
-                endpoint=str(row[1]),
-                api_index=str(row[2]),
-                name=str(row[3]),
-                json=self._loads_json(row[4]),
+    def get_rows(self, endpoint: str, api_indexes: Iterable[str]) -> Dict[str, EntityRow]:
+        return self.get_rows_by_ids(f"{endpoint}:{api_index}" for api_index in api_indexes)
+
+    def get_rows_by_ids(self, entity_ids: Iterable[str]) -> Dict[str, EntityRow]:
+        """
+        Fetch many entities with `WHERE id IN (...)` batches, keyed by entity id.
+        Unknown ids are simply absent from the result.
+        """
+        ids = list(dict.fromkeys(entity_ids))
+        out: Dict[str, EntityRow] = {}
+        conn = self._connect()
+        for start in range(0, len(ids), _MAX_IN_PARAMS):
+            chunk = ids[start:start + _MAX_IN_PARAMS]
+            placeholders = ", ".join("?" for _ in chunk)
+            cur = conn.execute(f"SELECT {_ROW_COLUMNS} FROM entities WHERE id IN ({placeholders})", chunk)
+            for row in cur.fetchall():
+                entity = self._make_row(row)
+                out[entity.id] = entity
+        return out
+
+    def iter_endpoint(
+        self,
+        endpoint: str,
+        *,
+        limit: int | None = None,
+        batch_size: int = _ITER_BATCH_SIZE,
+    ) -> Iterator[EntityRow]:
+        """
+        Stream an endpoint in api_index order. Rows are fetched `batch_size` at a
+        time from a cursor that stays open until the iterator is exhausted or
+        closed, so only one batch is decoded and resident at once.
+        """
+        if limit is not None:
+            cur = self._connect().execute(_SQL_ITER_ENDPOINT_LIMIT, (endpoint, int(limit)))
+        else:
+            cur = self._connect().execute(_SQL_ITER_ENDPOINT, (endpoint,))
+
+        try:
+            while True:
+                rows = cur.fetchmany(max(1, batch_size))
+                if not rows:
+                    break
+                for row in rows:
+                    yield self._make_row(row)
+        finally:
+            cur.close()
+
+    def search(
+        self,
+        query: str,
+        *,
+        endpoints: Iterable[str] | None = None,
+        limit: int = 50,
+    ) -> List[SearchHit]:
+        """Ranked full-text search over ids, names and description text (best first)."""
+        match = fts_query(query)
+        if not match:
+            return []
+
+        params: List[Any] = [match]
+        endpoint_filter = ""
+        if endpoints is not None:
+            wanted = list(dict.fromkeys(endpoints))
+            if not wanted:
+                return []
+            endpoint_filter = f" AND endpoint IN ({', '.join('?' for _ in wanted)})"
+            params.extend(wanted)
+        params.append(int(limit))
+
+        cur = self._connect().execute(_SQL_SEARCH.format(endpoint_filter=endpoint_filter), params)
+        return [
+            SearchHit(id=str(eid), endpoint=str(endpoint), api_index=str(api_index), name=str(name), score=float(score))
+            for eid, endpoint, api_index, name, score in cur.fetchall()
+        ]
+
+    def query_monster_stats(
+        self,
+        *,
+        challenge_rating: Range | None = None,
+        xp: Range | None = None,
+        hit_points: Range | None = None,
+        armor_class: Range | None = None,
+        dexterity: Range | None = None,
+        sizes: Iterable[str] | None = None,
+        creature_types: Iterable[str] | None = None,
+        min_attacks: int | None = None,
+        min_melee_attacks: int | None = None,
+        min_ranged_attacks: int | None = None,
+        order_by: str = "challenge_rating",
+        descending: bool = False,
+        limit: int | None = None,
+    ) -> List[MonsterStats]:
+        """
+        Filter the indexed `monster_stats` table. Ranges are inclusive; size and
+        type matches are case-insensitive. Results are ordered by `order_by`,
+        then api_index.
+        """
+        if order_by not in _MONSTER_STATS_ORDER:
+            raise ValueError(f"Unsupported order_by {order_by!r}; expected one of {sorted(_MONSTER_STATS_ORDER)}")
+
+        clauses: List[str] = []
+        params: List[Any] = []
+        for column, bounds in (
+            ("challenge_rating", challenge_rating),
+            ("xp", xp),
+            ("hit_points", hit_points),
+            ("armor_class", armor_class),
+            ("dexterity", dexterity),
+        ):
+            if bounds is None:
+                continue
+            low, high = bounds
+            if low is not None:
+                clauses.append(f"{column} >= ?")
+                params.append(low)
+            if high is not None:
+                clauses.append(f"{column} <= ?")
+                params.append(high)
+
+        for column, values in (("size", sizes), ("creature_type", creature_types)):
+            if values is None:
+                continue
+            wanted = list(dict.fromkeys(values))
+            if not wanted:
+                return []
+            clauses.append(f"{column} IN ({', '.join('?' for _ in wanted)})")
+            params.extend(wanted)
+
+        for column, minimum in (
+            ("attack_count", min_attacks),
+            ("melee_attack_count", min_melee_attacks),
+            ("ranged_attack_count", min_ranged_attacks),
+        ):
+            if minimum is not None:
+                clauses.append(f"{column} >= ?")
+                params.append(int(minimum))
+
+        sql = f"SELECT {_MONSTER_STATS_COLUMNS} FROM monster_stats"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        direction = "DESC" if descending else "ASC"
+        sql += f" ORDER BY {order_by} {direction}, api_index"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        cur = self._connect().execute(sql, params)
+        return [_monster_stats(row) for row in cur.fetchall()]
+
+    def get_monster_template(self, entity_id: str) -> MonsterTemplateRow | None:
+        # Codexes merged before templates were persisted have no table: callers compile instead.
+        if not self._pool.has_table("monster_templates"):
+            return None
+        row = self._connect().execute(_SQL_GET_MONSTER_TEMPLATE, (entity_id,)).fetchone()
+        return _monster_template(row) if row is not None else None
+
+    def get_monster_templates(self, entity_ids: Iterable[str]) -> Dict[str, MonsterTemplateRow]:
+        """Persisted templates keyed by entity id; unknown ids are absent."""
+        ids = list(dict.fromkeys(entity_ids))
+        out: Dict[str, MonsterTemplateRow] = {}
+        if not self._pool.has_table("monster_templates"):
+            return out
+        conn = self._connect()
+        for start in range(0, len(ids), _MAX_IN_PARAMS):
+            chunk = ids[start:start + _MAX_IN_PARAMS]
+            placeholders = ", ".join("?" for _ in chunk)
+            cur = conn.execute(
+                f"SELECT {_MONSTER_TEMPLATE_COLUMNS} FROM monster_templates WHERE id IN ({placeholders})",
+                chunk,
             )
+            for row in cur.fetchall():
+                template = _monster_template(row)
+                out[template.id] = template
+        return out
+
+    def get_meta(self, key: str) -> str | None:
+        cur = self._connect().execute("SELECT value FROM meta WHERE key = ? LIMIT 1", (key,))
+        row = cur.fetchone()
+        return str(row[0]) if row and row[0] is not None else None
 
     def list_endpoints(self) -> Iterable[str]:
-        with self._connect() as conn:
-            self._assert_schema(conn)
-            cur = conn.cursor()
-            cur.execute("SELECT DISTINCT endpoint FROM entities ORDER BY endpoint")
-            for (endpoint,) in cur.fetchall():
-                if isinstance(endpoint, str):
-                    yield endpoint
+        cur = self._connect().execute(_SQL_LIST_ENDPOINTS)
+        for (endpoint,) in cur.fetchall():
+            if isinstance(endpoint, str):
+                yield endpoint
 
     def count_by_endpoint(self) -> Dict[str, int]:
-        with self._connect() as conn:
-            self._assert_schema(conn)
-            cur = conn.cursor()
-            cur.execute("SELECT endpoint, COUNT(*) FROM entities GROUP BY endpoint ORDER BY endpoint")
-            out: Dict[str, int] = {}
-            for endpoint, count in cur.fetchall():
-                if isinstance(endpoint, str):
-                    out[endpoint] = int(count)
-            return out
+        cur = self._connect().execute(_SQL_COUNT_BY_ENDPOINT)
+        out: Dict[str, int] = {}
+        for endpoint, count in cur.fetchall():
+            if isinstance(endpoint, str):
+                out[endpoint] = int(count)
+        return out
+
+
+def _monster_stats(row: Sequence[Any]) -> MonsterStats:
+    return MonsterStats(
+        id=str(row[0]),
+        api_index=str(row[1]),
+        name=str(row[2]),
+        challenge_rating=float(row[3]),
+        xp=int(row[4]),
+        hit_points=int(row[5]),
+        armor_class=int(row[6]),
+        size=str(row[7]),
+        creature_type=str(row[8]),
+        dexterity=int(row[9]),
+        attack_count=int(row[10]),
+        melee_attack_count=int(row[11]),
+        ranged_attack_count=int(row[12]),
+    )
+
+
+def _monster_template(row: Sequence[Any]) -> MonsterTemplateRow:
+    return MonsterTemplateRow(
+        id=str(row[0]),
+        api_index=str(row[1]),
+        name=str(row[2]),
+        challenge_rating=float(row[3]),
+        ac=int(row[4]),
+        max_hp=int(row[5]),
+        dex=int(row[6]),
+        usable=bool(row[7]),
+        attacks=tuple(
+            (str(name), int(bonus), str(dice), str(damage_type), str(kind))
+            for name, bonus, dice, damage_type, kind in json.loads(row[8])
+        ),
+    )
@@ -9,7 +9,7 @@ from .common import (
     ability_mod,
 )
 from .condition import ConditionDefinition
-from .creature import MonsterAction, MonsterDefinition
+from .creature import AttackSpec, MonsterAction, MonsterDefinition, usable_attacks
 from .entity import GenericEntityDefinition
 from .item import EquipmentDefinition
 from .spell import SpellDefinition
@@ -18,6 +18,7 @@ __all__ = [
     "AbilityScores",
     "ActionTextBlock",
     "ArmorClassEntry",
+    "AttackSpec",
     "ConditionDefinition",
     "DamageSpec",
     "DamageType",
@@ -29,4 +30,5 @@ __all__ = [
     "SpeedProfile",
     "SpellDefinition",
     "ability_mod",
+    "usable_attacks",
 ]
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Mapping
 
 
 @dataclass(frozen=True)
@@ -13,4 +13,4 @@ class ConditionDefinition:
 
     desc: tuple[str, ...] = field(default_factory=tuple)
     url: str = ""
-    raw_json: dict[str, Any] = field(default_factory=dict)
+    raw_json: Mapping[str, Any] = field(default_factory=dict)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Mapping
 
 from .common import AbilityScores, ActionTextBlock, ArmorClassEntry, DamageSpec, SpeedProfile
 
@@ -63,4 +63,35 @@ class MonsterDefinition:
     url: str = ""
     updated_at: str = ""
 
-    raw_json: dict[str, Any] = field(default_factory=dict)
+    raw_json: Mapping[str, Any] = field(default_factory=dict)
+
+
+# name, attack_bonus, damage_dice, damage_type, attack_kind
+AttackSpec = tuple[str, int, str, str, str]
+
+
+def usable_attacks(monster: MonsterDefinition) -> list[AttackSpec]:
+    """
+    Attacks a monster can make in combat: actions with an attack bonus and a
+    first damage roll that has dice. Unlabelled attacks count as melee. Shared by
+    the codex's persisted templates and the runtime so both yield the same actors.
+    """
+    attacks: list[AttackSpec] = []
+    for action in monster.actions:
+        if action.attack_bonus is None or not action.damages:
+            continue
+
+        damage = action.damages[0]
+        if not damage.damage_dice:
+            continue
+
+        attacks.append(
+            (
+                action.name or "Attack",
+                int(action.attack_bonus),
+                damage.damage_dice.strip(),
+                damage.damage_type.name if damage.damage_type is not None else "Unknown",
+                action.attack_kind or "melee",
+            )
+        )
+    return attacks
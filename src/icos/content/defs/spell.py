@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Mapping
 
 from .common import DamageSpec, ResourceRef
 
@@ -35,4 +35,4 @@ class SpellDefinition:
     subclasses: tuple[ResourceRef, ...] = field(default_factory=tuple)
 
     url: str = ""
-    raw_json: dict[str, Any] = field(default_factory=dict)
+    raw_json: Mapping[str, Any] = field(default_factory=dict)
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import zlib
+from typing import Any, Callable, Dict, Iterable, Mapping
+
+JsonDict = Dict[str, Any]
+
+# Value of the codex `json_codec` meta key when entity JSON is compressed.
+JSON_CODEC = "zlib-dict"
+
+# Leading byte of a compressed value. JSON text never starts with it, so plain
+# TEXT (or UTF-8 BLOB) rows and compressed rows can share the column.
+PACKED_TAG = b"\x01"
+
+# Sample documents per endpoint used to build its dictionary, and the dictionary
+# size cap (zlib only looks back 32 KiB).
+DICT_SAMPLES = 64
+DICT_SIZE = 32 * 1024
+
+_WBITS = -15  # raw deflate: no zlib header/checksum per value
+_LEVEL = 6
+
+
+def build_dictionary(samples: Iterable[str | bytes]) -> bytes:
+    """
+    Preset dictionary for one endpoint: sample documents concatenated, keeping
+    the last `DICT_SIZE` bytes. Entities of an endpoint share their keys,
+    nested shapes and most reference URLs, which is what deflate then reuses.
+    """
+    parts = [s.encode("utf-8") if isinstance(s, str) else bytes(s) for s in samples]
+    return b"".join(parts)[-DICT_SIZE:]
+
+
+def load_dictionaries(conn: sqlite3.Connection) -> Dict[str, bytes]:
+    """Per-endpoint dictionaries stored in a codex (empty for uncompressed codexes)."""
+    try:
+        rows = conn.execute("SELECT endpoint, dict FROM json_dicts").fetchall()
+    except sqlite3.OperationalError:
+        return {}
+    return {str(endpoint): bytes(blob) for endpoint, blob in rows}
+
+
+class JsonPacker:
+    """Compresses entity JSON with its endpoint's dictionary; endpoints without one stay plain."""
+
+    def __init__(self, dictionaries: Mapping[str, bytes]) -> None:
+        self.dictionaries = dict(dictionaries)
+
+    def pack(self, endpoint: str, value: Any) -> Any:
+        zdict = self.dictionaries.get(endpoint)
+        if zdict is None or value is None:
+            return value
+        if isinstance(value, (bytes, bytearray)):
+            if value[:1] == PACKED_TAG:
+                return value
+            data = bytes(value)
+        else:
+            data = str(value).encode("utf-8")
+        comp = zlib.compressobj(_LEVEL, zlib.DEFLATED, _WBITS, zdict=zdict)
+        return PACKED_TAG + comp.compress(data) + comp.flush()
+
+
+class JsonDecoder:
+    """
+    Decodes the codex `json` column, plain or compressed. Dictionaries are
+    fetched with `load` on the first compressed value and kept until `reset`.
+    """
+
+    def __init__(self, load: Callable[[], Dict[str, bytes]]) -> None:
+        self._load = load
+        self._dicts: Dict[str, bytes] | None = None
+
+    def reset(self) -> None:
+        self._dicts = None
+
+    def loads(self, endpoint: str, value: Any) -> JsonDict:
+        if isinstance(value, str):
+            return json.loads(value)
+        if isinstance(value, (bytes, bytearray)):
+            return json.loads(self.decode(endpoint, value))
+        raise TypeError(f"Unsupported JSON column type: {type(value)}")
+
+    def text(self, endpoint: str, value: Any) -> Any:
+        """JSON text of a column value (plain values are returned unchanged)."""
+        if isinstance(value, (bytes, bytearray)) and value[:1] == PACKED_TAG:
+            return self.decode(endpoint, value).decode("utf-8")
+        return value
+
+    def decode(self, endpoint: str, value: bytes | bytearray) -> bytes:
+        if value[:1] != PACKED_TAG:
+            return bytes(value)
+        dicts = self._dicts
+        if dicts is None or endpoint not in dicts:
+            dicts = self._dicts = self._load()
+        zdict = dicts.get(endpoint)
+        if zdict is None:
+            raise ValueError(f"No JSON dictionary for endpoint {endpoint!r} in codex.")
+        decomp = zlib.decompressobj(_WBITS, zdict=zdict)
+        return decomp.decompress(memoryview(value)[1:]) + decomp.flush()
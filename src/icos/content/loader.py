@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-import json
 import sqlite3
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Dict
 
+from icos.content.db import CodexConnectionPool
+from icos.content.jsoncodec import JsonDecoder, load_dictionaries
+
 JsonDict = Dict[str, Any]
 
 
@@ -15,21 +17,32 @@ class CodexLoader:
 
     Required schema:
       - entities(id TEXT PRIMARY KEY, endpoint TEXT, api_index TEXT, json TEXT, ...)
+
+    `json` holds JSON text, or compressed values in codexes merged with
+    `compress=True`; both decode transparently.
     """
     db_path: str
+    immutable: bool = False
+
+    _pool: CodexConnectionPool = field(init=False, repr=False)
+    _json: JsonDecoder = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._pool = CodexConnectionPool(self.db_path, validate=self._assert_schema, immutable=self.immutable)
+        self._json = JsonDecoder(lambda: load_dictionaries(self._connect()))
 
     def _connect(self) -> sqlite3.Connection:
-        return sqlite3.connect(self.db_path)
+        return self._pool.get()
+
+    def close(self) -> None:
+        self._pool.close()
+        self._json.reset()
+
+    def _loads_json(self, endpoint: str, value: Any) -> JsonDict:
+        return self._json.loads(endpoint, value)
 
     @staticmethod
-    def _loads_json(value: Any) -> JsonDict:
-        if isinstance(value, (bytes, bytearray)):
-            return json.loads(value.decode("utf-8"))
-        if isinstance(value, str):
-            return json.loads(value)
-        raise TypeError(f"Unsupported JSON column type: {type(value)}")
-
-    def _assert_schema(self, conn: sqlite3.Connection) -> None:
+    def _assert_schema(conn: sqlite3.Connection) -> None:
         cur = conn.cursor()
         cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='entities'")
         if cur.fetchone() is None:
@@ -43,14 +56,11 @@ class CodexLoader:
             raise RuntimeError(f"Invalid codex DB: entities table missing columns: {sorted(missing)}")
 
     def get_json_by_id(self, entity_id: str) -> JsonDict:
-        with self._connect() as conn:
-            self._assert_schema(conn)
-            cur = conn.cursor()
-            cur.execute("SELECT json FROM entities WHERE id = ? LIMIT 1", (entity_id,))
-            row = cur.fetchone()
-            if not row or row[0] is None:
-                raise KeyError(f"Entity not found: {entity_id!r}")
-            return self._loads_json(row[0])
+        cur = self._connect().execute("SELECT json FROM entities WHERE id = ? LIMIT 1", (entity_id,))
+        row = cur.fetchone()
+        if not row or row[0] is None:
+            raise KeyError(f"Entity not found: {entity_id!r}")
+        return self._loads_json(entity_id.split(":", 1)[0], row[0])
 
     def get_entity_json(self, endpoint: str, api_index: str) -> JsonDict:
-        return self.get_json_by_id(f"{endpoint}:{api_index}")
\ No newline at end of file
+        return self.get_json_by_id(f"{endpoint}:{api_index}")
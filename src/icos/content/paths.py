@@ -23,6 +23,8 @@ class ContentPaths:
     codex_db: Path = Path("data/codex/codex.db")
     codex_manifest: Path = Path("data/codex/manifest.json")
     codex_checksum: Path = Path("data/codex/checksum.txt")
+    codex_snapshot: Path = Path("data/codex/codex.snapshot")
+    ability_catalog: Path = Path("data/codex/abilities.pickle")
 
     def abs(self, p: Path) -> Path:
         return (self.root / p).resolve()
\ No newline at end of file
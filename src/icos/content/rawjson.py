@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator
+
+JsonDict = Dict[str, Any]
+
+
+class LazyRawJson(Mapping[str, Any]):
+    """
+    Read-only stand-in for a definition's `raw_json` that fetches the entity JSON
+    on first access instead of keeping it resident next to the typed fields.
+
+    The fetched dict is kept once loaded, so only entities whose raw JSON is
+    actually read pay for it. Pickles and deep-copies as a plain dict.
+    """
+
+    __slots__ = ("entity_id", "_fetch", "_data")
+
+    def __init__(self, entity_id: str, fetch: Callable[[str], JsonDict]) -> None:
+        self.entity_id = entity_id
+        self._fetch = fetch
+        self._data: JsonDict | None = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._data is not None
+
+    def _load(self) -> JsonDict:
+        data = self._data
+        if data is None:
+            data = self._data = self._fetch(self.entity_id)
+        return data
+
+    def __getitem__(self, key: str) -> Any:
+        return self._load()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._load())
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def __repr__(self) -> str:
+        if self._data is None:
+            return f"LazyRawJson({self.entity_id!r}, <not loaded>)"
+        return f"LazyRawJson({self.entity_id!r}, {self._data!r})"
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (dict, (dict(self._load()),))
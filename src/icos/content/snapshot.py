@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+from dataclasses import fields, is_dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Tuple
+
+from icos.content.compilers.registry import CompilerRegistry, register_default_compilers
+from icos.content.db import CodexDb
+from icos.content.rawjson import JsonDict, LazyRawJson
+
+SNAPSHOT_MAGIC = b"ICOSSNAP"
+SNAPSHOT_FORMAT = 2
+
+# magic, format version, byte offset of the pickled index
+_HEADER = struct.Struct("<8sIQ")
+
+# Stand-in pickled in place of `raw_json`, which is stored separately.
+_DETACHED: JsonDict = {}
+
+# Sources whose changes invalidate previously compiled definitions.
+_FINGERPRINT_PACKAGES = ("compilers", "defs")
+
+
+@lru_cache(maxsize=1)
+def compiler_fingerprint() -> str:
+    """Hash of the compiler and definition sources used to build snapshots."""
+    root = Path(__file__).resolve().parent
+    h = hashlib.sha256()
+    for package in _FINGERPRINT_PACKAGES:
+        for path in sorted((root / package).glob("*.py")):
+            h.update(path.name.encode("utf-8"))
+            h.update(b"\0")
+            h.update(path.read_bytes())
+            h.update(b"\n")
+    return h.hexdigest()
+
+
+def build_snapshot(db: CodexDb, out_path: Path, *, registry: CompilerRegistry | None = None) -> str:
+    """
+    Compile every codex entity and write a versioned binary snapshot.
+
+    Layout: fixed header, per entity a pickled definition without its
+    `raw_json` followed by the pickled raw JSON, then a pickled index of
+    per-endpoint (api_index, offset, length, raw_length) entries in api_index
+    order; raw_length is 0 for definitions without `raw_json`. Keeping the raw
+    JSON apart lets readers load it lazily. The file is written next to
+    `out_path` and swapped in atomically.
+    Returns the codex checksum the snapshot is keyed by.
+    """
+    if registry is None:
+        registry = register_default_compilers(CompilerRegistry())
+
+    checksum = db.get_meta("codex_checksum") or ""
+    endpoints: Dict[str, List[Tuple[str, int, int, int]]] = {}
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+    with tmp_path.open("wb") as fh:
+        fh.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT, 0))
+
+        for endpoint in db.list_endpoints():
+            compiler = registry.resolve(endpoint)
+            entries = endpoints.setdefault(endpoint, [])
+            for row in db.iter_endpoint(endpoint):
+                compiled = compiler.compile(row)
+                raw_blob = b""
+                if _has_raw_json(compiled):
+                    raw_blob = pickle.dumps(dict(compiled.raw_json), protocol=pickle.HIGHEST_PROTOCOL)
+                    object.__setattr__(compiled, "raw_json", _DETACHED)
+                blob = pickle.dumps(compiled, protocol=pickle.HIGHEST_PROTOCOL)
+                entries.append((row.api_index, fh.tell(), len(blob), len(raw_blob)))
+                fh.write(blob)
+                fh.write(raw_blob)
+
+        index = {
+            "codex_checksum": checksum,
+            "compiler_fingerprint": compiler_fingerprint(),
+            "endpoints": endpoints,
+        }
+        index_offset = fh.tell()
+        pickle.dump(index, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        fh.seek(0)
+        fh.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT, index_offset))
+
+    os.replace(tmp_path, out_path)
+    return checksum
+
+
+class CodexSnapshot:
+    """
+    Memory-mapped reader for a snapshot written by `build_snapshot`.
+
+    Only the index is decoded at open; definitions are unpickled on demand,
+    with their raw JSON attached eagerly or as a `LazyRawJson`.
+    Snapshots are trusted local build artifacts (pickle), never user input.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._fh: BinaryIO = path.open("rb")
+        try:
+            self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._fh.close()
+            raise
+
+        try:
+            magic, fmt, index_offset = _HEADER.unpack_from(self._mm, 0)
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError(f"{path}: not a codex snapshot.")
+            if fmt != SNAPSHOT_FORMAT:
+                raise ValueError(f"{path}: unsupported snapshot format {fmt} (expected {SNAPSHOT_FORMAT}).")
+            index = pickle.loads(self._mm[index_offset:])
+        except Exception:
+            self.close()
+            raise
+
+        self.codex_checksum: str = str(index.get("codex_checksum", ""))
+        self.compiler_fingerprint: str = str(index.get("compiler_fingerprint", ""))
+        self._endpoints: Dict[str, List[Tuple[str, int, int, int]]] = index.get("endpoints", {})
+        self._offsets: Dict[str, Tuple[int, int, int]] = {
+            f"{endpoint}:{api_index}": (offset, length, raw_length)
+            for endpoint, entries in self._endpoints.items()
+            for (api_index, offset, length, raw_length) in entries
+        }
+
+    def close(self) -> None:
+        mm = getattr(self, "_mm", None)
+        if mm is not None:
+            mm.close()
+        self._fh.close()
+
+    def is_current(self, codex_checksum: str) -> bool:
+        return self.codex_checksum == codex_checksum and self.compiler_fingerprint == compiler_fingerprint()
+
+    def has(self, entity_id: str) -> bool:
+        return entity_id in self._offsets
+
+    def get(self, entity_id: str, *, lazy_raw_json: bool = False) -> Any | None:
+        """The compiled definition, with `raw_json` read now or as a `LazyRawJson`."""
+        loc = self._offsets.get(entity_id)
+        if loc is None:
+            return None
+        offset, length, raw_length = loc
+        compiled = pickle.loads(self._mm[offset:offset + length])
+        if raw_length:
+            if lazy_raw_json:
+                raw: Any = LazyRawJson(entity_id, self.get_raw_json)
+            else:
+                raw = pickle.loads(self._mm[offset + length:offset + length + raw_length])
+            # Freshly unpickled and not shared yet, so filling in the field is safe.
+            object.__setattr__(compiled, "raw_json", raw)
+        return compiled
+
+    def get_raw_json(self, entity_id: str) -> JsonDict:
+        """The raw JSON stored for a definition; KeyError when there is none."""
+        loc = self._offsets.get(entity_id)
+        if loc is None or not loc[2]:
+            raise KeyError(f"No raw JSON in snapshot: {entity_id}")
+        offset, length, raw_length = loc
+        return pickle.loads(self._mm[offset + length:offset + length + raw_length])
+
+    def ids_for(self, endpoint: str, *, limit: int | None = None) -> List[str]:
+        entries = self._endpoints.get(endpoint, [])
+        if limit is not None:
+            entries = entries[: max(0, int(limit))]
+        return [f"{endpoint}:{api_index}" for (api_index, *_loc) in entries]
+
+    def endpoints(self) -> List[str]:
+        return sorted(self._endpoints)
+
+
+def _has_raw_json(compiled: Any) -> bool:
+    return is_dataclass(compiled) and any(f.name == "raw_json" for f in fields(compiled))
+
+
+def open_snapshot(path: Path) -> CodexSnapshot | None:
+    """Open a snapshot, or return None when it is missing, truncated or of another format."""
+    if not path.exists():
+        return None
+    try:
+        return CodexSnapshot(path)
+    except (OSError, ValueError, EOFError, struct.error, pickle.UnpicklingError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--codex", default="data/codex/codex.db", help="Codex DB path")
+    parser.add_argument("--out", default="data/codex/codex.snapshot", help="Output snapshot path")
+    args = parser.parse_args()
+
+    db = CodexDb(args.codex)
+    try:
+        checksum = build_snapshot(db, Path(args.out))
+    finally:
+        db.close()
+
+    print(f"Built {args.out} (codex_checksum={checksum})")
+
+
+if __name__ == "__main__":
+    main()
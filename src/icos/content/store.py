@@ -1,62 +1,161 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Any, Dict, List, TypeVar, cast
-
-from icos.content.compilers.base import EntityRecord
-from icos.content.compilers.conditions import ConditionCompiler
-from icos.content.compilers.creatures import MonsterCompiler
-from icos.content.compilers.generic import GenericCompiler
-from icos.content.compilers.items import EquipmentCompiler
-from icos.content.compilers.registry import CompilerRegistry
-from icos.content.compilers.spells import SpellCompiler
-from icos.content.db import CodexDb, EntityRow
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TypeVar, cast
+
+from icos.content.cache import CacheStats, ContentCache, UnboundedCache
+from icos.content.compilers.registry import CompilerRegistry, register_default_compilers
+from icos.content.db import CodexDb, EntityRow, MonsterStats, MonsterTemplateRow, Range, SearchHit
 from icos.content.defs.condition import ConditionDefinition
 from icos.content.defs.creature import MonsterDefinition
 from icos.content.defs.entity import GenericEntityDefinition
 from icos.content.defs.item import EquipmentDefinition
 from icos.content.defs.spell import SpellDefinition
+from icos.content.rawjson import LazyRawJson
+from icos.content.snapshot import CodexSnapshot
 
 T = TypeVar("T")
 
 
 @dataclass
 class ContentStore:
+    """
+    Compiled-definition access over a codex DB.
+
+    With `lazy_raw_json`, definitions keep only their typed fields; `raw_json`
+    becomes a `LazyRawJson` that loads the entity JSON on first access, from
+    the snapshot for snapshot-served definitions and from the DB otherwise.
+    """
     db: CodexDb
     registry: CompilerRegistry = field(default_factory=CompilerRegistry)
-    _cache: Dict[str, Any] = field(default_factory=dict)
+    cache: ContentCache = field(default_factory=UnboundedCache)
+    snapshot: Optional[CodexSnapshot] = None
+    lazy_raw_json: bool = False
 
     def __post_init__(self) -> None:
         if not self.registry.endpoints():
-            self.registry.register(MonsterCompiler())
-            self.registry.register(EquipmentCompiler())
-            self.registry.register(SpellCompiler())
-            self.registry.register(ConditionCompiler())
-            for endpoint in self.db.list_endpoints():
-                if not self.registry.has(endpoint):
-                    self.registry.register(GenericCompiler(endpoint=endpoint))
+            register_default_compilers(self.registry)
+
+    def set_snapshot(self, snapshot: Optional[CodexSnapshot]) -> None:
+        """
+        Serve compiled definitions from a precompiled snapshot (None = compile from DB).
+        The previous snapshot is closed and the cache cleared.
+        """
+        if self.snapshot is not None and self.snapshot is not snapshot:
+            self.snapshot.close()
+        self.snapshot = snapshot
+        self.cache.clear()
 
     def get_compiled(self, endpoint: str, api_index: str) -> Any:
         entity_id = f"{endpoint}:{api_index}"
-        cached = self._cache.get(entity_id)
+        cached = self.cache.get(entity_id)
         if cached is not None:
             return cached
 
+        if self.snapshot is not None:
+            compiled = self.snapshot.get(entity_id, lazy_raw_json=self.lazy_raw_json)
+            if compiled is not None:
+                self.cache.put(entity_id, compiled)
+                return compiled
+
         row = self.db.get_row(endpoint, api_index)
         compiled = self._compile_row(row)
-        self._cache[entity_id] = compiled
+        self.cache.put(entity_id, compiled)
         return compiled
 
+    def get_many(self, endpoint: str, api_indexes: Iterable[str]) -> List[Any]:
+        return self.get_many_by_ids(f"{endpoint}:{api_index}" for api_index in api_indexes)
+
+    def get_many_by_ids(self, entity_ids: Iterable[str]) -> List[Any]:
+        """
+        Compiled entities in request order (duplicates allowed); all cache misses
+        are fetched with a single batched query.
+        """
+        ids = list(entity_ids)
+        found: Dict[str, Any] = {}
+        misses: List[str] = []
+        for eid in dict.fromkeys(ids):
+            cached = self.cache.get(eid)
+            if cached is None and self.snapshot is not None:
+                cached = self.snapshot.get(eid, lazy_raw_json=self.lazy_raw_json)
+                if cached is not None:
+                    self.cache.put(eid, cached)
+            if cached is None:
+                misses.append(eid)
+            else:
+                found[eid] = cached
+
+        if misses:
+            rows = self.db.get_rows_by_ids(misses)
+            missing = [eid for eid in misses if eid not in rows]
+            if missing:
+                raise KeyError(f"Entities not found: {', '.join(missing)}")
+            for eid in misses:
+                compiled = self._compile_row(rows[eid])
+                self.cache.put(eid, compiled)
+                found[eid] = compiled
+        return [found[eid] for eid in ids]
+
     def list_compiled(self, endpoint: str, *, limit: int | None = None) -> List[Any]:
-        out: List[Any] = []
+        if self.snapshot is not None:
+            ids = self.snapshot.ids_for(endpoint, limit=limit)
+            if ids:
+                return self.get_many_by_ids(ids)
+
+        return list(self._iter_rows_compiled(endpoint, limit=limit, populate_cache=True))
+
+    def iter_compiled(
+        self,
+        endpoint: str,
+        *,
+        limit: int | None = None,
+        populate_cache: bool = False,
+    ) -> Iterator[Any]:
+        """
+        Yield compiled definitions of `endpoint` in api_index order without
+        building a list. Cached entries are reused, but new ones are only added
+        to the cache with `populate_cache`, so a full scan stays constant-memory.
+        """
+        if self.snapshot is not None:
+            ids = self.snapshot.ids_for(endpoint, limit=limit)
+            if ids:
+                for eid in ids:
+                    compiled = self.cache.get(eid)
+                    if compiled is None:
+                        compiled = self.snapshot.get(eid, lazy_raw_json=self.lazy_raw_json)
+                        if populate_cache:
+                            self.cache.put(eid, compiled)
+                    yield compiled
+                return
+
+        yield from self._iter_rows_compiled(endpoint, limit=limit, populate_cache=populate_cache)
+
+    def _iter_rows_compiled(self, endpoint: str, *, limit: int | None, populate_cache: bool) -> Iterator[Any]:
         for row in self.db.iter_endpoint(endpoint, limit=limit):
-            if row.id in self._cache:
-                out.append(self._cache[row.id])
+            cached = self.cache.get(row.id)
+            if cached is not None:
+                yield cached
                 continue
             compiled = self._compile_row(row)
-            self._cache[row.id] = compiled
-            out.append(compiled)
-        return out
+            if populate_cache:
+                self.cache.put(row.id, compiled)
+            yield compiled
+
+    def search(
+        self,
+        query: str,
+        *,
+        endpoints: Iterable[str] | None = None,
+        limit: int = 50,
+    ) -> List[SearchHit]:
+        """Ranked matches for `query` by id, name or description; compile hits with `get_compiled`."""
+        return self.db.search(query, endpoints=endpoints, limit=limit)
+
+    def clear_cache(self) -> None:
+        self.cache.clear()
+
+    def cache_stats(self) -> CacheStats:
+        return self.cache.stats()
 
     def list_endpoints(self) -> List[str]:
         return list(self.db.list_endpoints())
@@ -67,12 +166,64 @@ class ContentStore:
     def get_monster(self, api_index: str) -> MonsterDefinition:
         return cast(MonsterDefinition, self.get_compiled("monsters", api_index))
 
+    def get_monsters(self, api_indexes: Iterable[str]) -> List[MonsterDefinition]:
+        return cast(List[MonsterDefinition], self.get_many("monsters", api_indexes))
+
     def list_monsters(self, *, limit: int | None = None) -> List[MonsterDefinition]:
         return cast(List[MonsterDefinition], self.list_compiled("monsters", limit=limit))
 
+    def get_monster_template(self, api_index: str) -> Optional[MonsterTemplateRow]:
+        """Merge-time combat template for a monster, or None when the codex has none."""
+        return self.db.get_monster_template(f"monsters:{api_index}")
+
+    def get_monster_templates(self, api_indexes: Iterable[str]) -> Dict[str, MonsterTemplateRow]:
+        """Merge-time combat templates keyed by api_index; missing monsters are absent."""
+        rows = self.db.get_monster_templates(f"monsters:{api_index}" for api_index in api_indexes)
+        return {row.api_index: row for row in rows.values()}
+
+    def query_monsters(
+        self,
+        *,
+        challenge_rating: Range | None = None,
+        xp: Range | None = None,
+        hit_points: Range | None = None,
+        armor_class: Range | None = None,
+        dexterity: Range | None = None,
+        sizes: Iterable[str] | None = None,
+        creature_types: Iterable[str] | None = None,
+        min_attacks: int | None = None,
+        min_melee_attacks: int | None = None,
+        min_ranged_attacks: int | None = None,
+        order_by: str = "challenge_rating",
+        descending: bool = False,
+        limit: int | None = None,
+    ) -> List[MonsterStats]:
+        """
+        Indexed stat query over monsters that compiles nothing; pass the ids of
+        the chosen rows to `get_many_by_ids` for full definitions.
+        """
+        return self.db.query_monster_stats(
+            challenge_rating=challenge_rating,
+            xp=xp,
+            hit_points=hit_points,
+            armor_class=armor_class,
+            dexterity=dexterity,
+            sizes=sizes,
+            creature_types=creature_types,
+            min_attacks=min_attacks,
+            min_melee_attacks=min_melee_attacks,
+            min_ranged_attacks=min_ranged_attacks,
+            order_by=order_by,
+            descending=descending,
+            limit=limit,
+        )
+
     def get_equipment(self, api_index: str) -> EquipmentDefinition:
         return cast(EquipmentDefinition, self.get_compiled("equipment", api_index))
 
+    def get_equipment_many(self, api_indexes: Iterable[str]) -> List[EquipmentDefinition]:
+        return cast(List[EquipmentDefinition], self.get_many("equipment", api_indexes))
+
     def list_equipment(self, *, limit: int | None = None) -> List[EquipmentDefinition]:
         return cast(List[EquipmentDefinition], self.list_compiled("equipment", limit=limit))
 
@@ -91,16 +242,9 @@ class ContentStore:
     def get_generic(self, endpoint: str, api_index: str) -> GenericEntityDefinition:
         return cast(GenericEntityDefinition, self.get_compiled(endpoint, api_index))
 
-    @staticmethod
-    def _to_record(row: EntityRow) -> EntityRecord:
-        return EntityRecord(
-            id=row.id,
-            endpoint=row.endpoint,
-            api_index=row.api_index,
-            name=row.name,
-            json=row.json,
-        )
-
     def _compile_row(self, row: EntityRow) -> Any:
-        compiler = self.registry.resolve(row.endpoint)
-        return compiler.compile(self._to_record(row))
+        if self.lazy_raw_json:
+            # Compilers keep the proxy as `raw_json`, so the decoded JSON is
+            # dropped once the typed fields are built.
+            row = replace(row, raw_json=LazyRawJson(row.id, self.db.get_json))
+        return self.registry.resolve(row.endpoint).compile(row)
@@ -4,7 +4,7 @@ from typing import Optional
 
 from icos.content.defs.creature import MonsterDefinition
 from icos.game.runtime.actor import ActorBlueprint
-from icos.game.runtime.instances import instantiate_actor_blueprint, monster_to_template
+from icos.game.runtime.instances import ActorTemplateCache, instantiate_actor_blueprint, monster_to_template
 
 
 def monster_to_actor_blueprint(
@@ -16,8 +16,12 @@ def monster_to_actor_blueprint(
     ac_override: Optional[int] = None,
     heals_remaining: int = 0,
     heal_dice: str = "1d8+2",
+    templates: Optional[ActorTemplateCache] = None,
 ) -> ActorBlueprint:
-    template = monster_to_template(monster, team=team)
+    if templates is not None:
+        template = templates.for_monster(monster, team=team)
+    else:
+        template = monster_to_template(monster, team=team)
     return instantiate_actor_blueprint(
         template,
         instance_id=instance_id,
@@ -1,3 +1,4 @@
+from .columns import NumericColumns, numeric_fields
 from .components import (
     AIProfileComponent,
     AbilitySetComponent,
@@ -6,7 +7,9 @@ from .components import (
     AttackProfileData,
     ConditionComponent,
     EncounterComponent,
+    EntityHandle,
     EntityId,
+    EntityRef,
     FlagComponent,
     HealProfileComponent,
     HealthComponent,
@@ -17,7 +20,7 @@ from .components import (
     PositionComponent,
     StatsComponent,
 )
-from .registry import ECSRegistry
+from .registry import CachedQuery, ECSRegistry
 from .systems import SystemRegistry
 
 __all__ = [
@@ -26,10 +29,13 @@ __all__ = [
     "ArmorComponent",
     "AttackProfileComponent",
     "AttackProfileData",
+    "CachedQuery",
     "ConditionComponent",
     "ECSRegistry",
     "EncounterComponent",
+    "EntityHandle",
     "EntityId",
+    "EntityRef",
     "FlagComponent",
     "HealProfileComponent",
     "HealthComponent",
@@ -37,7 +43,9 @@ __all__ = [
     "InitiativeComponent",
     "InventoryComponent",
     "MovementComponent",
+    "NumericColumns",
     "PositionComponent",
     "StatsComponent",
     "SystemRegistry",
+    "numeric_fields",
 ]
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import fields
+from operator import attrgetter
+from typing import Any, Callable, Sequence
+
+from .components import EntityId
+
+# field annotation -> (array typecode, NumPy dtype name, scalar cast on write-back)
+_NUMERIC_TYPES: dict[str, tuple[str, str, Callable[[Any], Any]]] = {
+    "int": ("q", "int64", int),
+    "float": ("d", "float64", float),
+    "bool": ("b", "bool", bool),
+}
+
+
+def numeric_fields(ctype: type[Any]) -> tuple[str, ...]:
+    """Fields of a dataclass component annotated `int`, `float` or `bool`."""
+    return tuple(f.name for f in fields(ctype) if _type_name(f.type) in _NUMERIC_TYPES)
+
+
+class NumericColumns:
+    """
+    Struct-of-arrays view of numeric component fields, one column per field in
+    entity creation order (`array.array`, or NumPy arrays with `numpy=True`).
+
+    Columns are a copy of the component values, not the registry's storage:
+    the components stay the source of truth, so building a view costs one
+    extra slot per entity and field, and `write_back` costs a pass over the
+    components. Vectorized systems update the columns in place and call
+    `write_back` to store the values into the components.
+    """
+
+    def __init__(
+        self,
+        ctype: type[Any],
+        ids: Sequence[EntityId],
+        components: Sequence[Any],
+        names: Sequence[str],
+        *,
+        numpy: bool = False,
+        writable: Callable[[EntityId], Any] | None = None,
+    ) -> None:
+        kinds = {f.name: _type_name(f.type) for f in fields(ctype)}
+        unknown = [name for name in names if kinds.get(name) not in _NUMERIC_TYPES]
+        if unknown:
+            raise ValueError(f"Not numeric fields of {ctype.__name__}: {', '.join(unknown)}")
+
+        self.ctype = ctype
+        self.ids = ids
+        self._components = components
+        self._writable = writable
+        self._casts = {name: _NUMERIC_TYPES[kinds[name]][2] for name in names}
+        self.columns: dict[str, Any] = {}
+        for name in names:
+            typecode, dtype, _ = _NUMERIC_TYPES[kinds[name]]
+            values = map(attrgetter(name), components)
+            if numpy:
+                self.columns[name] = _numpy().fromiter(values, dtype=dtype, count=len(components))
+            else:
+                self.columns[name] = array(typecode, values)
+
+    def __getitem__(self, name: str) -> Any:
+        return self.columns[name]
+
+    def __len__(self) -> int:
+        return len(self._components)
+
+    def write_back(self, *names: str) -> None:
+        """Store columns (all by default) into the component fields."""
+        names = names or tuple(self.columns)
+        components = self._components
+        if self._writable is not None:
+            components = self._components = [self._writable(eid) for eid in self.ids]
+        for name in names:
+            cast = self._casts[name]
+            for component, value in zip(components, self.columns[name]):
+                setattr(component, name, cast(value))
+
+
+def _type_name(annotation: Any) -> str:
+    # Components use postponed annotations, so field types are usually strings.
+    return annotation if isinstance(annotation, str) else getattr(annotation, "__name__", "")
+
+
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError as exc:
+        raise ImportError("NumericColumns(numpy=True) requires NumPy (pip install numpy).") from exc
+    return numpy
@@ -4,6 +4,16 @@ from dataclasses import dataclass, field
 
 
 EntityId = str
+# Integer handle: slot index in the low 32 bits, slot generation above them.
+EntityHandle = int
+# Registry methods accept either the string id or a live handle.
+EntityRef = EntityId | EntityHandle
+
+# Components that never change after they are added are frozen: clones share
+# them instead of copying (replace them with add_component to change them).
+# Hot per-actor components that are mutated in place use slots (no instance
+# __dict__); their numeric fields are also readable column-wise through
+# ECSRegistry.numeric_columns.
 
 
 @dataclass(frozen=True)
@@ -15,19 +25,19 @@ class AttackProfileData:
     attack_kind: str = "melee"
 
 
-@dataclass
+@dataclass(frozen=True)
 class IdentityComponent:
     name: str
     team: str
 
 
-@dataclass
+@dataclass(slots=True)
 class PositionComponent:
     x: int = 0
     y: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class MovementComponent:
     speed: int = 30
     remaining: int = 30
@@ -43,14 +53,14 @@ class StatsComponent:
     charisma: int = 10
 
 
-@dataclass
+@dataclass(slots=True)
 class HealthComponent:
     max_hp: int = 1
     hp: int = 1
     alive: bool = True
 
 
-@dataclass
+@dataclass(frozen=True)
 class ArmorComponent:
     base_ac: int = 10
 
@@ -60,7 +70,7 @@ class FlagComponent:
     flags: set[str] = field(default_factory=set)
 
 
-@dataclass
+@dataclass(slots=True)
 class ConditionComponent:
     turns: dict[str, int] = field(default_factory=dict)
 
@@ -75,7 +85,7 @@ class InventoryComponent:
     heal_bonus: int = 0
 
 
-@dataclass
+@dataclass(frozen=True)
 class AttackProfileComponent:
     attacks: tuple[AttackProfileData, ...] = field(default_factory=tuple)
 
@@ -86,18 +96,18 @@ class HealProfileComponent:
     heal_dice: str = "1d8+2"
 
 
-@dataclass
+@dataclass(frozen=True)
 class InitiativeComponent:
     total: int = 0
     dex_mod: int = 0
 
 
-@dataclass
+@dataclass(frozen=True)
 class AbilitySetComponent:
     ability_ids: tuple[str, ...] = field(default_factory=tuple)
 
 
-@dataclass
+@dataclass(frozen=True)
 class AIProfileComponent:
     policy: str = "planner"
 
@@ -1,29 +1,228 @@
 from __future__ import annotations
 
+import weakref
 from copy import deepcopy
 from dataclasses import is_dataclass
-from typing import Any, Iterator, TypeVar
+from operator import attrgetter
+from typing import Any, Callable, Iterable, Iterator, TypeVar
 
-from .components import EntityId
+from .columns import NumericColumns, numeric_fields
+from .components import EntityHandle, EntityId, EntityRef
 
 T = TypeVar("T")
 
+_by_seq = attrgetter("seq")
+
+_INDEX_BITS = 32
+_INDEX_MASK = (1 << _INDEX_BITS) - 1
+
+_frozen_types: dict[type[Any], bool] = {}
+
+
+def _is_frozen(ctype: type[Any]) -> bool:
+    """Frozen dataclass components are immutable and shared between worlds outright."""
+    frozen = _frozen_types.get(ctype)
+    if frozen is None:
+        params = getattr(ctype, "__dataclass_params__", None)
+        frozen = _frozen_types[ctype] = bool(params is not None and params.frozen)
+    return frozen
+
+
+class _Record:
+    """Where an entity lives: its handle, creation order, archetype and row there."""
+
+    __slots__ = ("entity_id", "handle", "seq", "archetype", "row")
+
+    def __init__(self, entity_id: EntityId, handle: EntityHandle, seq: int, archetype: "_Archetype", row: int) -> None:
+        self.entity_id = entity_id
+        self.handle = handle
+        self.seq = seq
+        self.archetype = archetype
+        self.row = row
+
+
+class _Archetype:
+    """Table of the entities sharing one component signature, one dense column per type."""
+
+    __slots__ = ("signature", "columns", "records", "ordered", "add_edges", "remove_edges")
+
+    def __init__(self, signature: frozenset[type[Any]]) -> None:
+        self.signature = signature
+        # Columns in a fixed (name) order so rows are built and moved deterministically.
+        self.columns: dict[type[Any], list[Any]] = {
+            ctype: [] for ctype in sorted(signature, key=lambda t: (t.__module__, t.__qualname__))
+        }
+        self.records: list[_Record] = []
+        # True while rows are in entity creation order.
+        self.ordered = True
+        self.add_edges: dict[type[Any], _Archetype] = {}
+        self.remove_edges: dict[type[Any], _Archetype] = {}
+
+    def append(self, record: _Record, values: list[Any]) -> None:
+        for column, value in zip(self.columns.values(), values):
+            column.append(value)
+        if self.records and self.records[-1].seq > record.seq:
+            self.ordered = False
+        record.archetype = self
+        record.row = len(self.records)
+        self.records.append(record)
+
+    def swap_remove(self, row: int) -> None:
+        last = len(self.records) - 1
+        if row != last:
+            for column in self.columns.values():
+                column[row] = column[last]
+            moved = self.records[last]
+            moved.row = row
+            self.records[row] = moved
+            self.ordered = False
+        for column in self.columns.values():
+            column.pop()
+        self.records.pop()
+
+    def sort_rows(self) -> None:
+        """Put rows back into entity creation order (after moves and removals)."""
+        if self.ordered:
+            return
+        order = sorted(range(len(self.records)), key=lambda i: self.records[i].seq)
+        for ctype, column in self.columns.items():
+            self.columns[ctype] = [column[i] for i in order]
+        self.records = [self.records[i] for i in order]
+        for row, record in enumerate(self.records):
+            record.row = row
+        self.ordered = True
+
+
+class CachedQuery:
+    """
+    Registered query whose rows are kept between calls.
+
+    Rows are rebuilt only after `add_component`, `remove_component` or
+    `remove_entity` touched one of the query's types, or `get_mut` copied a
+    component shared with a clone, so repeated reads cost nothing while
+    membership is stable. The returned lists are shared: treat them as
+    read-only.
+    """
+
+    __slots__ = ("ctypes", "_build", "_rows", "_ids")
+
+    def __init__(
+        self,
+        ctypes: tuple[type[Any], ...],
+        build: Callable[[tuple[type[Any], ...]], list[tuple[Any, ...]]],
+    ) -> None:
+        self.ctypes = ctypes
+        self._build = build
+        self._rows: list[tuple[Any, ...]] | None = None
+        self._ids: list[EntityId] | None = None
+
+    @property
+    def dirty(self) -> bool:
+        return self._rows is None
+
+    def invalidate(self) -> None:
+        self._rows = None
+        self._ids = None
+
+    def rows(self) -> list[tuple[Any, ...]]:
+        """`(entity_id, *components)` per matching entity, in creation order."""
+        rows = self._rows
+        if rows is None:
+            rows = self._rows = self._build(self.ctypes)
+        return rows
+
+    def ids(self) -> list[EntityId]:
+        ids = self._ids
+        if ids is None:
+            ids = self._ids = [row[0] for row in self.rows()]
+        return ids
+
+    def __iter__(self) -> Iterator[tuple[Any, ...]]:
+        # Iterates a snapshot: a rebuild replaces the list instead of mutating it.
+        return iter(self.rows())
+
+    def __len__(self) -> int:
+        return len(self.rows())
+
 
 class ECSRegistry:
-    """Deterministic in-memory ECS registry with component-indexed storage."""
+    """
+    Deterministic in-memory ECS registry with archetype (table) storage.
+
+    Entities with the same set of component types share an archetype, which
+    keeps one dense column per type; adding or removing a component type moves
+    the entity's row to the neighbouring archetype. Queries only visit
+    archetypes holding every requested type and yield entities in creation order.
+
+    Entities live in generational slots: `handle(entity_id)` gives an integer
+    handle that every method accepts in place of the string id and that goes
+    stale when the entity is removed, even if its slot is reused. String ids
+    are a name index over the slots, which also keeps creation order.
+
+    `clone` shares component instances between the two worlds. Reads
+    (`get_component`, `try_component`, queries) return them as they are, so
+    change components in place only through `get_mut` / `try_mut`, which copy
+    a shared mutable component first; or replace them with `add_component`.
+    """
 
     def __init__(self) -> None:
-        self._entities: list[EntityId] = []
-        self._entity_set: set[EntityId] = set()
+        # name index, in creation order (removal keeps the order of the rest)
+        self._records: dict[EntityId, _Record] = {}
+        self._slots: list[_Record | None] = []
+        self._generations: list[int] = []
+        self._free_slots: list[int] = []
         self._next_entity_index: int = 1
-        self._components: dict[type[Any], dict[EntityId, Any]] = {}
+        self._next_seq: int = 0
+        self._root = _Archetype(frozenset())
+        self._archetypes: dict[frozenset[type[Any]], _Archetype] = {self._root.signature: self._root}
+        # component type -> archetypes whose signature contains it
+        self._type_archetypes: dict[type[Any], list[_Archetype]] = {}
+        self._queries: dict[tuple[type[Any], ...], CachedQuery] = {}
+        # component type -> registered queries over it
+        self._type_queries: dict[type[Any], list[CachedQuery]] = {}
+        # ids of mutable components this world got from the world it was cloned
+        # from (and shares with that world's other forks): copied before writes
+        self._shared: set[int] = set()
+        # ids of mutable components this world lent to its forks: copied before
+        # writes only while one of those forks is still alive
+        self._lent: set[int] = set()
+        self._forks: weakref.WeakSet[ECSRegistry] = weakref.WeakSet()
 
     def clone(self) -> "ECSRegistry":
+        """
+        Fork the world. Only the entity bookkeeping is copied; components are
+        shared copy-on-write, so the fork pays for the components it later
+        mutates. This world keeps writing in place, except that a component
+        still shared with a live fork is copied the first time it is mutated.
+        References to components taken before the clone must not be used to
+        mutate them afterwards.
+        """
         out = ECSRegistry()
-        out._entities = list(self._entities)
-        out._entity_set = set(self._entity_set)
         out._next_entity_index = self._next_entity_index
-        out._components = deepcopy(self._components)
+        out._next_seq = self._next_seq
+        out._generations = list(self._generations)
+        out._free_slots = list(self._free_slots)
+        out._slots = [None] * len(self._slots)
+        for arch in self._archetypes.values():
+            copy = out._archetype(arch.signature)
+            copy.columns = {ctype: list(column) for ctype, column in arch.columns.items()}
+            copy.ordered = arch.ordered
+            copy.records = [_Record(rec.entity_id, rec.handle, rec.seq, copy, rec.row) for rec in arch.records]
+            for rec in copy.records:
+                out._slots[rec.handle & _INDEX_MASK] = rec
+        for rec in self._records.values():
+            out._records[rec.entity_id] = out._slots[rec.handle & _INDEX_MASK]  # type: ignore[assignment]
+
+        lent = {
+            id(component)
+            for arch in self._archetypes.values()
+            for ctype, column in arch.columns.items()
+            if not _is_frozen(ctype)
+            for component in column
+        }
+        out._shared = lent
+        self._lent = self._lent | lent if self._forks else set(lent)
+        self._forks.add(out)
         return out
 
     def create_entity(self, entity_id: EntityId | None = None) -> EntityId:
@@ -31,76 +230,276 @@ class ECSRegistry:
             entity_id = f"entity:{self._next_entity_index:08d}"
             self._next_entity_index += 1
 
-        if entity_id in self._entity_set:
+        if entity_id in self._records:
             raise ValueError(f"Duplicate entity id: {entity_id}")
 
-        self._entities.append(entity_id)
-        self._entity_set.add(entity_id)
+        if self._free_slots:
+            index = self._free_slots.pop()
+        else:
+            index = len(self._slots)
+            self._slots.append(None)
+            self._generations.append(0)
+        record = _Record(entity_id, (self._generations[index] << _INDEX_BITS) | index, self._next_seq, self._root, 0)
+        self._next_seq += 1
+        self._root.append(record, [])
+        self._slots[index] = record
+        self._records[entity_id] = record
         return entity_id
 
     def ensure_entity(self, entity_id: EntityId) -> EntityId:
-        if entity_id in self._entity_set:
+        if entity_id in self._records:
             return entity_id
         return self.create_entity(entity_id)
 
-    def has_entity(self, entity_id: EntityId) -> bool:
-        return entity_id in self._entity_set
+    def has_entity(self, entity_id: EntityRef) -> bool:
+        return self._lookup(entity_id) is not None
+
+    def handle(self, entity_id: EntityId) -> EntityHandle:
+        """Integer handle of a live entity (valid until the entity is removed)."""
+        try:
+            return self._records[entity_id].handle
+        except KeyError as exc:
+            raise KeyError(f"Unknown entity: {entity_id}") from exc
+
+    def entity_id(self, handle: EntityHandle) -> EntityId:
+        record = self._lookup(handle)
+        if record is None:
+            raise KeyError(f"Stale or unknown entity handle: {handle}")
+        return record.entity_id
 
-    def remove_entity(self, entity_id: EntityId) -> None:
-        if entity_id not in self._entity_set:
+    def remove_entity(self, entity_id: EntityRef) -> None:
+        record = self._lookup(entity_id)
+        if record is None:
             return
 
-        self._entity_set.remove(entity_id)
-        self._entities = [eid for eid in self._entities if eid != entity_id]
-        for store in self._components.values():
-            store.pop(entity_id, None)
+        self._invalidate(record.archetype.signature)
+        for column in record.archetype.columns.values():
+            self._forget(column[record.row])
+        record.archetype.swap_remove(record.row)
+        del self._records[record.entity_id]
+        index = record.handle & _INDEX_MASK
+        self._slots[index] = None
+        self._generations[index] += 1
+        self._free_slots.append(index)
 
     def entities(self) -> tuple[EntityId, ...]:
-        return tuple(self._entities)
+        return tuple(self._records)
 
-    def add_component(self, entity_id: EntityId, component: Any) -> None:
-        if entity_id not in self._entity_set:
+    def add_component(self, entity_id: EntityRef, component: Any) -> None:
+        record = self._lookup(entity_id)
+        if record is None:
             raise KeyError(f"Unknown entity: {entity_id}")
         if not is_dataclass(component):
             raise TypeError("Components must be dataclass instances.")
 
         ctype = type(component)
-        store = self._components.setdefault(ctype, {})
-        store[entity_id] = component
+        self._invalidate((ctype,))
+        src = record.archetype
+        column = src.columns.get(ctype)
+        if column is not None:
+            if column[record.row] is not component:
+                self._forget(column[record.row])
+            column[record.row] = component
+            return
 
-    def has_component(self, entity_id: EntityId, ctype: type[T]) -> bool:
-        return entity_id in self._components.get(ctype, {})
+        dest = src.add_edges.get(ctype)
+        if dest is None:
+            dest = self._archetype(src.signature | {ctype})
+            src.add_edges[ctype] = dest
+            dest.remove_edges[ctype] = src
+        row = record.row
+        values = [component if t is ctype else src.columns[t][row] for t in dest.columns]
+        src.swap_remove(row)
+        dest.append(record, values)
 
-    def get_component(self, entity_id: EntityId, ctype: type[T]) -> T:
-        try:
-            return self._components[ctype][entity_id]
-        except KeyError as exc:
-            raise KeyError(f"Component {ctype.__name__} missing for entity {entity_id}") from exc
+    def has_component(self, entity_id: EntityRef, ctype: type[T]) -> bool:
+        record = self._lookup(entity_id)
+        return record is not None and ctype in record.archetype.columns
+
+    def get_component(self, entity_id: EntityRef, ctype: type[T]) -> T:
+        """The component for reading; it may be shared with a clone (see `get_mut`)."""
+        record = self._records.get(entity_id) or self._lookup(entity_id)  # type: ignore[arg-type]
+        column = record.archetype.columns.get(ctype) if record is not None else None
+        if column is None:
+            raise KeyError(f"Component {ctype.__name__} missing for entity {entity_id}")
+        return column[record.row]
+
+    def try_component(self, entity_id: EntityRef, ctype: type[T]) -> T | None:
+        record = self._lookup(entity_id)
+        if record is None:
+            return None
+        column = record.archetype.columns.get(ctype)
+        if column is None:
+            return None
+        return column[record.row]
+
+    def get_mut(self, entity_id: EntityRef, ctype: type[T]) -> T:
+        """The component for changing in place; copied first while shared with a clone."""
+        record = self._records.get(entity_id) or self._lookup(entity_id)  # type: ignore[arg-type]
+        column = record.archetype.columns.get(ctype) if record is not None else None
+        if column is None:
+            raise KeyError(f"Component {ctype.__name__} missing for entity {entity_id}")
+        return self._writable(ctype, column, record.row)
+
+    def try_mut(self, entity_id: EntityRef, ctype: type[T]) -> T | None:
+        record = self._lookup(entity_id)
+        if record is None:
+            return None
+        column = record.archetype.columns.get(ctype)
+        if column is None:
+            return None
+        return self._writable(ctype, column, record.row)
+
+    def remove_component(self, entity_id: EntityRef, ctype: type[Any]) -> None:
+        record = self._lookup(entity_id)
+        if record is None or ctype not in record.archetype.columns:
+            return
 
-    def try_component(self, entity_id: EntityId, ctype: type[T]) -> T | None:
-        return self._components.get(ctype, {}).get(entity_id)
+        self._invalidate((ctype,))
+        src = record.archetype
+        self._forget(src.columns[ctype][record.row])
+        dest = src.remove_edges.get(ctype)
+        if dest is None:
+            dest = self._archetype(src.signature - {ctype})
+            src.remove_edges[ctype] = dest
+            dest.add_edges[ctype] = src
+        row = record.row
+        values = [src.columns[t][row] for t in dest.columns]
+        src.swap_remove(row)
+        dest.append(record, values)
 
-    def remove_component(self, entity_id: EntityId, ctype: type[Any]) -> None:
-        self._components.get(ctype, {}).pop(entity_id, None)
+    def cached_query(self, *ctypes: type[Any]) -> CachedQuery:
+        """Register (or return the registered) cached query over `ctypes`."""
+        query = self._queries.get(ctypes)
+        if query is None:
+            if not ctypes:
+                raise ValueError("cached_query needs at least one component type.")
+            query = CachedQuery(ctypes, self._build_rows)
+            self._queries[ctypes] = query
+            for ctype in set(ctypes):
+                self._type_queries.setdefault(ctype, []).append(query)
+        return query
+
+    def numeric_columns(self, ctype: type[Any], *names: str, numpy: bool = False) -> NumericColumns:
+        """
+        Struct-of-arrays view of `ctype`'s numeric fields (all of them unless
+        `names` are given) over every entity holding it, in creation order.
+        Membership comes from a cached query, so repeated calls only re-read values.
+        `write_back` stores values through `get_mut`, so clones stay isolated.
+        """
+        rows = self.cached_query(ctype).rows()
+        return NumericColumns(
+            ctype,
+            [row[0] for row in rows],
+            [row[1] for row in rows],
+            names or numeric_fields(ctype),
+            numpy=numpy,
+            writable=lambda entity_id: self.get_mut(entity_id, ctype),
+        )
 
     def query_ids(self, *ctypes: type[Any]) -> list[EntityId]:
         if not ctypes:
-            return list(self._entities)
-
-        out: list[EntityId] = []
-        for entity_id in self._entities:
-            include = True
-            for ctype in ctypes:
-                if entity_id not in self._components.get(ctype, {}):
-                    include = False
-                    break
-            if include:
-                out.append(entity_id)
-        return out
+            return list(self._records)
+
+        query = self._queries.get(ctypes)
+        if query is not None:
+            return list(query.ids())
+
+        records: list[_Record] = []
+        archetypes = self._matching_archetypes(ctypes)
+        for arch in archetypes:
+            arch.sort_rows()
+            records.extend(arch.records)
+        # Each archetype is a sorted run, which the sort merges in linear passes.
+        if len(archetypes) > 1:
+            records.sort(key=_by_seq)
+        return [record.entity_id for record in records]
 
     def query(self, *ctypes: type[Any]) -> Iterator[tuple[Any, ...]]:
-        for entity_id in self.query_ids(*ctypes):
-            row: list[Any] = [entity_id]
-            for ctype in ctypes:
-                row.append(self._components[ctype][entity_id])
-            yield tuple(row)
+        if not ctypes:
+            rows: list[tuple[Any, ...]] = [(entity_id,) for entity_id in self._records]
+        else:
+            query = self._queries.get(ctypes)
+            rows = query.rows() if query is not None else self._build_rows(ctypes)
+        # Rows are materialized first so systems may add or remove components while iterating.
+        yield from rows
+
+    def _build_rows(self, ctypes: tuple[type[Any], ...]) -> list[tuple[Any, ...]]:
+        rows: list[tuple[Any, ...]] = []
+        seqs: list[int] = []
+        archetypes = self._matching_archetypes(ctypes)
+        for arch in archetypes:
+            arch.sort_rows()
+            ids = [record.entity_id for record in arch.records]
+            rows.extend(zip(ids, *[arch.columns[ctype] for ctype in ctypes]))
+            if len(archetypes) > 1:
+                seqs.extend(record.seq for record in arch.records)
+        if seqs:
+            rows = [rows[i] for i in sorted(range(len(rows)), key=seqs.__getitem__)]
+        return rows
+
+    def _lookup(self, entity: EntityRef) -> _Record | None:
+        # Names hit the index directly; an int misses it and is resolved as a handle.
+        record = self._records.get(entity)  # type: ignore[arg-type]
+        if record is None and type(entity) is int:
+            return self._by_handle(entity)
+        return record
+
+    def _by_handle(self, handle: EntityHandle) -> _Record | None:
+        index = handle & _INDEX_MASK
+        if index >= len(self._slots):
+            return None
+        record = self._slots[index]
+        return record if record is not None and record.handle == handle else None
+
+    def _writable(self, ctype: type[Any], column: list[Any], row: int) -> Any:
+        """The component at `row`, first copied if another world may still read it."""
+        component = column[row]
+        cid = id(component)
+        if cid in self._shared:
+            self._shared.discard(cid)
+        elif cid not in self._lent:
+            return component
+        elif not self._forks:
+            # Every fork it was lent to is gone, so this world holds it alone again.
+            self._lent.clear()
+            return component
+        else:
+            self._lent.discard(cid)
+        component = deepcopy(component)
+        column[row] = component
+        # Cached rows still reference the instance the other world keeps.
+        self._invalidate((ctype,))
+        return component
+
+    def _forget(self, component: Any) -> None:
+        """Drop bookkeeping for a component leaving this world (its id may be reused)."""
+        self._shared.discard(id(component))
+        self._lent.discard(id(component))
+
+    def _invalidate(self, ctypes: Iterable[type[Any]]) -> None:
+        for ctype in ctypes:
+            for query in self._type_queries.get(ctype, ()):
+                query.invalidate()
+
+    def _matching_archetypes(self, ctypes: tuple[type[Any], ...]) -> list[_Archetype]:
+        candidates: list[_Archetype] | None = None
+        for ctype in ctypes:
+            archetypes = self._type_archetypes.get(ctype)
+            if not archetypes:
+                return []
+            if candidates is None or len(archetypes) < len(candidates):
+                candidates = archetypes
+
+        required = frozenset(ctypes)
+        return [arch for arch in candidates or () if arch.records and required <= arch.signature]
+
+    def _archetype(self, signature: frozenset[type[Any]]) -> _Archetype:
+        arch = self._archetypes.get(signature)
+        if arch is None:
+            arch = _Archetype(signature)
+            self._archetypes[signature] = arch
+            for ctype in signature:
+                self._type_archetypes.setdefault(ctype, []).append(arch)
+        return arch
+
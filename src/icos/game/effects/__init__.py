@@ -1,4 +1,5 @@
 from .ability import AbilityDefinition
+from .catalog import AbilityCatalog, AbilityCatalogCache, ability_fingerprint
 from .engine import execute_ability
 from .loader import ability_from_feature
 from .models import (
@@ -12,6 +13,8 @@ from .models import (
 )
 
 __all__ = [
+    "AbilityCatalog",
+    "AbilityCatalogCache",
     "AbilityDefinition",
     "ApplyConditionEffect",
     "DamageEffect",
@@ -22,4 +25,5 @@ __all__ = [
     "RollCheckEffect",
     "execute_ability",
     "ability_from_feature",
+    "ability_fingerprint",
 ]
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+from icos.content.defs.entity import GenericEntityDefinition
+from icos.content.snapshot import compiler_fingerprint
+from icos.content.store import ContentStore
+
+from .ability import AbilityDefinition
+from .loader import ability_from_feature
+
+ABILITY_CATALOG_FORMAT = 1
+
+AbilityCatalog = Dict[str, AbilityDefinition]
+
+
+@lru_cache(maxsize=1)
+def ability_fingerprint() -> str:
+    """Hash of the sources that turn features into abilities (compilers, defs, effects)."""
+    h = hashlib.sha256(compiler_fingerprint().encode("ascii"))
+    for path in sorted(Path(__file__).resolve().parent.glob("*.py")):
+        h.update(path.name.encode("utf-8"))
+        h.update(b"\0")
+        h.update(path.read_bytes())
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+class AbilityCatalogCache:
+    """
+    Ability catalog (feature api_index and id -> `AbilityDefinition`) memoized
+    per codex checksum.
+
+    With `path`, a built catalog is also written there and reused by later
+    processes while the codex checksum and the ability sources are unchanged.
+    Callers must treat the returned catalog as read-only.
+    """
+
+    def __init__(self, content: ContentStore, *, path: Path | None = None) -> None:
+        self.content = content
+        self.path = path
+        self.codex_checksum: str | None = None
+        self._catalog: AbilityCatalog | None = None
+
+    def reset(self, codex_checksum: str | None = None) -> None:
+        """Drop the catalog unless it was built for `codex_checksum`."""
+        if codex_checksum is None or codex_checksum != self.codex_checksum:
+            self._catalog = None
+        self.codex_checksum = codex_checksum
+
+    def get(self) -> AbilityCatalog:
+        catalog = self._catalog
+        if catalog is None:
+            for _ in self.build():
+                pass
+            catalog = self._catalog if self._catalog is not None else {}
+        return catalog
+
+    def build(self) -> Iterator[Any]:
+        """
+        Load or build the catalog for the current codex, yielding once per
+        feature compiled, so a warm-up can report progress. Does nothing when
+        the catalog is already built. A build abandoned part-way (generator
+        closed) or failing part-way keeps nothing, so the next call retries.
+        """
+        if self._catalog is not None:
+            return
+        checksum = self._current_checksum()
+        loaded = self._load(checksum)
+        if loaded is not None:
+            self._catalog = loaded
+            return
+
+        catalog: AbilityCatalog = {}
+        try:
+            for entry in self.content.iter_compiled("features", populate_cache=True):
+                _add_ability(catalog, entry)
+                yield entry
+        except Exception:
+            # Like the per-encounter build this replaces, a failed read leaves the
+            # catalog empty for this call only; a partial one is never memoized.
+            return
+        self._save(checksum, catalog)
+        self._catalog = catalog
+
+    def _current_checksum(self) -> str:
+        if self.codex_checksum is None:
+            try:
+                self.codex_checksum = self.content.db.get_meta("codex_checksum") or ""
+            except Exception:
+                return ""
+        return self.codex_checksum
+
+    def _load(self, checksum: str) -> AbilityCatalog | None:
+        if self.path is None or not checksum or not self.path.exists():
+            return None
+        try:
+            with self.path.open("rb") as fh:
+                data = pickle.load(fh)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return None
+        if (
+            not isinstance(data, dict)
+            or data.get("format") != ABILITY_CATALOG_FORMAT
+            or data.get("codex_checksum") != checksum
+            or data.get("fingerprint") != ability_fingerprint()
+        ):
+            return None
+        abilities = data.get("abilities")
+        return abilities if isinstance(abilities, dict) else None
+
+    def _save(self, checksum: str, catalog: AbilityCatalog) -> None:
+        if self.path is None or not checksum:
+            return
+        data = {
+            "format": ABILITY_CATALOG_FORMAT,
+            "codex_checksum": checksum,
+            "fingerprint": ability_fingerprint(),
+            "abilities": catalog,
+        }
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with tmp_path.open("wb") as fh:
+                pickle.dump(data, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # Persistence is an optimization; the in-memory catalog is still used.
+            tmp_path.unlink(missing_ok=True)
+
+
+def _add_ability(catalog: AbilityCatalog, entry: Any) -> None:
+    if not isinstance(entry, GenericEntityDefinition):
+        return
+    try:
+        ability = ability_from_feature(entry)
+    except Exception:
+        return
+    if ability is None:
+        return
+    catalog[entry.api_index] = ability
+    catalog[entry.id] = ability
@@ -7,19 +7,29 @@ from .ecs import (
     snapshot_combatant,
 )
 from .inventory import EquipmentModifiers, EquippedItem, Inventory, equipment_to_modifiers
-from .instances import ActorTemplate, CombatantTemplate, instantiate_actor_blueprint, instantiate_combatant, monster_to_template
+from .instances import (
+    ActorTemplate,
+    ActorTemplateCache,
+    CombatantTemplate,
+    build_actor_template,
+    instantiate_actor_blueprint,
+    instantiate_combatant,
+    monster_to_template,
+)
 from .party import EncounterPlan
 
 __all__ = [
     "AttackProfile",
     "ActorBlueprint",
     "ActorTemplate",
+    "ActorTemplateCache",
     "CombatantTemplate",
     "ENCOUNTER_ENTITY_ID",
     "EquipmentModifiers",
     "EquippedItem",
     "EncounterPlan",
     "Inventory",
+    "build_actor_template",
     "build_world_from_actor_blueprints",
     "build_world_from_combatants",
     "equipment_to_modifiers",
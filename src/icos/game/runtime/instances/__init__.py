@@ -1,9 +1,19 @@
-from .creature import ActorTemplate, CombatantTemplate, instantiate_actor_blueprint, instantiate_combatant, monster_to_template
+from .creature import (
+    ActorTemplate,
+    CombatantTemplate,
+    build_actor_template,
+    instantiate_actor_blueprint,
+    instantiate_combatant,
+    monster_to_template,
+)
 from .item import equipment_to_equipped_item
+from .templates import ActorTemplateCache
 
 __all__ = [
     "ActorTemplate",
+    "ActorTemplateCache",
     "CombatantTemplate",
+    "build_actor_template",
     "equipment_to_equipped_item",
     "instantiate_actor_blueprint",
     "instantiate_combatant",
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 
-from icos.content.defs.creature import MonsterDefinition
+from icos.content.defs.creature import MonsterDefinition, usable_attacks
 from icos.game.runtime.actor import AttackProfile, ActorBlueprint
 
 
@@ -19,14 +19,19 @@ class ActorTemplate:
     max_hp: int
     dex: int
     attacks: tuple[AttackProfile, ...] = field(default_factory=tuple)
+    challenge_rating: float = 0.0
 
 
 def monster_to_template(monster: MonsterDefinition, *, team: str = "enemies") -> ActorTemplate:
-    ac = monster.armor_class[0].value if monster.armor_class else 10
-    attacks = _extract_attacks(monster)
-    if not attacks:
+    template = build_actor_template(monster, team=team)
+    if not template.attacks:
         raise ValueError(f"Monster {monster.name!r} has no usable attacks.")
+    return template
+
 
+def build_actor_template(monster: MonsterDefinition, *, team: str = "enemies") -> ActorTemplate:
+    """Like `monster_to_template`, but a monster without usable attacks yields empty `attacks`."""
+    ac = monster.armor_class[0].value if monster.armor_class else 10
     return ActorTemplate(
         source_id=monster.id,
         api_index=monster.api_index,
@@ -35,7 +40,8 @@ def monster_to_template(monster: MonsterDefinition, *, team: str = "enemies") ->
         ac=ac,
         max_hp=max(1, int(monster.hit_points)),
         dex=int(monster.abilities.dexterity),
-        attacks=tuple(attacks),
+        attacks=tuple(_extract_attacks(monster)),
+        challenge_rating=float(monster.challenge_rating),
     )
 
 
@@ -73,27 +79,16 @@ def instantiate_actor_blueprint(
 
 
 def _extract_attacks(monster: MonsterDefinition) -> list[AttackProfile]:
-    attacks: list[AttackProfile] = []
-    for action in monster.actions:
-        if action.attack_bonus is None or not action.damages:
-            continue
-
-        damage = action.damages[0]
-        if not damage.damage_dice:
-            continue
-
-        damage_type = damage.damage_type.name if damage.damage_type is not None else "Unknown"
-        attacks.append(
-            AttackProfile(
-                name=action.name or "Attack",
-                attack_bonus=int(action.attack_bonus),
-                damage_dice=damage.damage_dice.strip(),
-                damage_type=str(damage_type),
-                attack_kind=action.attack_kind or "melee",
-            )
+    return [
+        AttackProfile(
+            name=name,
+            attack_bonus=attack_bonus,
+            damage_dice=damage_dice,
+            damage_type=damage_type,
+            attack_kind=attack_kind,
         )
-
-    return attacks
+        for name, attack_bonus, damage_dice, damage_type, attack_kind in usable_attacks(monster)
+    ]
 
 
 # Backward-compatible aliases (deprecated naming).
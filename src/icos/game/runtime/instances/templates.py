@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+from icos.content.db import MonsterTemplateRow
+from icos.content.defs.creature import MonsterDefinition
+from icos.content.store import ContentStore
+from icos.game.runtime.actor import AttackProfile
+
+from .creature import ActorTemplate, build_actor_template
+
+
+class ActorTemplateCache:
+    """
+    In-process `ActorTemplate` cache keyed by (api_index, team).
+
+    Misses are served from the codex's merge-time `monster_templates` table, so
+    spawning a monster never recompiles it; codexes without that table fall back
+    to compiling. Monsters without usable attacks are cached too (empty
+    `attacks`) and raise `ValueError` on every request, like `monster_to_template`.
+    """
+
+    def __init__(self, content: ContentStore) -> None:
+        self.content = content
+        self.codex_checksum: str | None = None
+        self._templates: dict[tuple[str, str], ActorTemplate] = {}
+
+    def reset(self, codex_checksum: str | None = None) -> None:
+        """Drop cached templates unless they were built for `codex_checksum`."""
+        if codex_checksum is None or codex_checksum != self.codex_checksum:
+            self._templates.clear()
+        self.codex_checksum = codex_checksum
+
+    def get(self, api_index: str, *, team: str = "enemies") -> ActorTemplate:
+        key = (api_index, team)
+        template = self._templates.get(key)
+        if template is None:
+            row = self.content.get_monster_template(api_index)
+            if row is not None:
+                template = _template_from_row(row, team=team)
+            else:
+                template = build_actor_template(self.content.get_monster(api_index), team=team)
+            self._templates[key] = template
+        return _require_attacks(template)
+
+    def for_monster(self, monster: MonsterDefinition, *, team: str = "enemies") -> ActorTemplate:
+        """Template for an already compiled monster, built once per (api_index, team)."""
+        key = (monster.api_index, team)
+        template = self._templates.get(key)
+        if template is None:
+            template = build_actor_template(monster, team=team)
+            self._templates[key] = template
+        return _require_attacks(template)
+
+    def prefetch(self, api_indexes: Iterable[str], *, team: str = "enemies") -> None:
+        """Load templates for many monsters with one batched query."""
+        wanted = [api_index for api_index in dict.fromkeys(api_indexes) if (api_index, team) not in self._templates]
+        if not wanted:
+            return
+        for api_index, row in self.content.get_monster_templates(wanted).items():
+            self._templates[(api_index, team)] = _template_from_row(row, team=team)
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+
+def _template_from_row(row: MonsterTemplateRow, *, team: str) -> ActorTemplate:
+    return ActorTemplate(
+        source_id=row.id,
+        api_index=row.api_index,
+        name=row.name,
+        team=team,
+        ac=row.ac,
+        max_hp=row.max_hp,
+        dex=row.dex,
+        attacks=tuple(
+            AttackProfile(
+                name=name,
+                attack_bonus=attack_bonus,
+                damage_dice=damage_dice,
+                damage_type=damage_type,
+                attack_kind=attack_kind,
+            )
+            for name, attack_bonus, damage_dice, damage_type, attack_kind in row.attacks
+        ),
+        challenge_rating=row.challenge_rating,
+    )
+
+
+def _require_attacks(template: ActorTemplate) -> ActorTemplate:
+    if not template.attacks:
+        raise ValueError(f"Monster {template.name!r} has no usable attacks.")
+    return template
@@ -60,14 +60,14 @@ def apply_event_to_world(
 
     if event.type == TURN_CONTEXT_RESET and event.actor:
         if world.has_component(event.actor, FlagComponent):
-            flags = world.get_component(event.actor, FlagComponent)
+            flags = world.get_mut(event.actor, FlagComponent)
             flags.flags.discard("defending")
 
         if world.has_component(event.actor, ConditionComponent):
-            world.get_component(event.actor, ConditionComponent).turns.pop("defending", None)
+            world.get_mut(event.actor, ConditionComponent).turns.pop("defending", None)
 
         if world.has_component(event.actor, MovementComponent):
-            move = world.get_component(event.actor, MovementComponent)
+            move = world.get_mut(event.actor, MovementComponent)
             move.remaining = int(move.speed)
 
         return spawned
@@ -75,13 +75,13 @@ def apply_event_to_world(
     if event.type == CONDITION_TICKED and event.actor:
         if not world.has_component(event.actor, ConditionComponent):
             return spawned
-        comp = world.get_component(event.actor, ConditionComponent)
+        comp = world.get_mut(event.actor, ConditionComponent)
         for key in list(comp.turns):
             comp.turns[key] -= 1
             if comp.turns[key] <= 0:
                 del comp.turns[key]
                 if key == "defending" and world.has_component(event.actor, FlagComponent):
-                    world.get_component(event.actor, FlagComponent).flags.discard("defending")
+                    world.get_mut(event.actor, FlagComponent).flags.discard("defending")
                 spawned.append(
                     Event(
                         type=CONDITION_EXPIRED,
@@ -106,14 +106,14 @@ def apply_event_to_world(
             duration = 1
 
         if world.has_component(event.target, ConditionComponent):
-            comp = world.get_component(event.target, ConditionComponent)
+            comp = world.get_mut(event.target, ConditionComponent)
         else:
             comp = ConditionComponent()
             world.add_component(event.target, comp)
 
         comp.turns[condition] = max(comp.turns.get(condition, 0), duration)
         if condition == "defending" and world.has_component(event.target, FlagComponent):
-            world.get_component(event.target, FlagComponent).flags.add("defending")
+            world.get_mut(event.target, FlagComponent).flags.add("defending")
         return spawned
 
     if event.type == INITIATIVE_ROLLED and event.actor:
@@ -134,7 +134,7 @@ def apply_event_to_world(
         if not world.has_component(event.target, HealthComponent):
             return spawned
 
-        health = world.get_component(event.target, HealthComponent)
+        health = world.get_mut(event.target, HealthComponent)
         amount = _as_non_negative_int(event.data.get("amount", 0))
 
         before = int(health.hp)
@@ -176,7 +176,7 @@ def apply_event_to_world(
         if not world.has_component(event.target, HealthComponent):
             return spawned
 
-        health = world.get_component(event.target, HealthComponent)
+        health = world.get_mut(event.target, HealthComponent)
         amount = _as_non_negative_int(event.data.get("amount", 0))
 
         before = int(health.hp)
@@ -185,7 +185,7 @@ def apply_event_to_world(
         health.alive = after > 0
 
         if bool(event.data.get("consume_heal", False)) and event.actor and world.has_component(event.actor, HealProfileComponent):
-            heals = world.get_component(event.actor, HealProfileComponent)
+            heals = world.get_mut(event.actor, HealProfileComponent)
             heals.heals_remaining = max(0, int(heals.heals_remaining) - 1)
 
         spawned.append(
@@ -208,7 +208,7 @@ def apply_event_to_world(
         distance = _as_int(event.data.get("distance", 0), default=0)
 
         if world.has_component(event.target, MovementComponent):
-            move = world.get_component(event.target, MovementComponent)
+            move = world.get_mut(event.target, MovementComponent)
             allowed = min(abs(distance), max(0, move.remaining))
             signed = allowed if distance >= 0 else -allowed
             move.remaining = max(0, move.remaining - allowed)
@@ -216,7 +216,7 @@ def apply_event_to_world(
             signed = distance
 
         if world.has_component(event.target, PositionComponent):
-            pos = world.get_component(event.target, PositionComponent)
+            pos = world.get_mut(event.target, PositionComponent)
             pos.x += signed
         else:
             world.add_component(event.target, PositionComponent(x=signed, y=0))
@@ -228,7 +228,7 @@ def apply_event_to_world(
         if not isinstance(bonuses_raw, dict):
             return spawned
 
-        stats = world.try_component(event.target, StatsComponent)
+        stats = world.try_mut(event.target, StatsComponent)
         if stats is None:
             stats = StatsComponent()
             world.add_component(event.target, stats)
@@ -259,7 +259,7 @@ def _encounter(world: ECSRegistry, encounter_entity: str) -> EncounterComponent:
     if not world.has_component(encounter_entity, EncounterComponent):
         world.ensure_entity(encounter_entity)
         world.add_component(encounter_entity, EncounterComponent())
-    return world.get_component(encounter_entity, EncounterComponent)
+    return world.get_mut(encounter_entity, EncounterComponent)
 
 
 def _as_non_negative_int(value: object) -> int:
@@ -89,7 +89,7 @@ def actor_snapshot(world: ECSRegistry, actor_id: str) -> ActorSnapshot:
 def living_enemies(world: ECSRegistry, actor_id: str) -> list[ActorSnapshot]:
     source = actor_snapshot(world, actor_id)
     out: list[ActorSnapshot] = []
-    for entity_id, ident, health in world.query(IdentityComponent, HealthComponent):
+    for entity_id, ident, health in world.cached_query(IdentityComponent, HealthComponent):
         if entity_id == actor_id:
             continue
         if not health.alive or ident.team == source.team:
@@ -102,7 +102,7 @@ def living_enemies(world: ECSRegistry, actor_id: str) -> list[ActorSnapshot]:
 def living_allies(world: ECSRegistry, actor_id: str) -> list[ActorSnapshot]:
     source = actor_snapshot(world, actor_id)
     out: list[ActorSnapshot] = []
-    for entity_id, ident, health in world.query(IdentityComponent, HealthComponent):
+    for entity_id, ident, health in world.cached_query(IdentityComponent, HealthComponent):
         if not health.alive or ident.team != source.team:
             continue
         out.append(actor_snapshot(world, entity_id))
@@ -112,7 +112,7 @@ def living_allies(world: ECSRegistry, actor_id: str) -> list[ActorSnapshot]:
 
 def alive_teams(world: ECSRegistry) -> set[str]:
     out: set[str] = set()
-    for _, ident, health in world.query(IdentityComponent, HealthComponent):
+    for _, ident, health in world.cached_query(IdentityComponent, HealthComponent):
         if health.alive:
             out.add(ident.team)
     return out
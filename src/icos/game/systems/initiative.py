@@ -16,7 +16,7 @@ def initiative_system(world: ECSRegistry, bus: EventBus, context: dict[str, obje
 
     rolls: list[tuple[int, int, str, str]] = []
 
-    for entity_id in world.query_ids(StatsComponent):
+    for entity_id in world.cached_query(StatsComponent).ids():
         actor = actor_snapshot(world, entity_id)
         if not actor.alive:
             continue
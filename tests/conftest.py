@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from icos.content.bundles import bundle_packs  # noqa: E402
+from icos.content.codex import bundle_name_for_pack, merge_codex, read_codex_manifest  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def codex_db(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """A codex merged from the shipped packs into a scratch directory."""
+    work = tmp_path_factory.mktemp("codex")
+    pack_roots = [p if p.is_absolute() else ROOT / p for p in read_codex_manifest(ROOT / "data/codex/manifest.json")]
+    bundle_dir = work / "bundles"
+    bundle_packs([(root, bundle_dir / bundle_name_for_pack(root)) for root in pack_roots])
+    db_path = work / "codex.db"
+    merge_codex(pack_roots, bundle_dir, db_path)
+    return db_path
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+
+from icos.content.db import CodexDb
+from icos.content.store import ContentStore
+from icos.game.effects import AbilityCatalogCache
+
+
+@pytest.fixture
+def store(codex_db: Path) -> Iterator[ContentStore]:
+    db = CodexDb(codex_db)
+    try:
+        yield ContentStore(db=db)
+    finally:
+        db.close()
+
+
+def test_failed_build_is_not_memoized(store: ContentStore, monkeypatch: pytest.MonkeyPatch) -> None:
+    features = store.count_by_endpoint()["features"]
+    iter_compiled = store.iter_compiled
+
+    def failing(endpoint: str, **kwargs: Any) -> Iterator[Any]:
+        for i, entry in enumerate(iter_compiled(endpoint, **kwargs)):
+            if i == 3:
+                raise RuntimeError("codex read failed")
+            yield entry
+
+    cache = AbilityCatalogCache(store)
+    monkeypatch.setattr(store, "iter_compiled", failing)
+    assert len(list(cache.build())) == 3
+    assert cache.get() == {}
+
+    # The failure left nothing behind, so the next build scans every feature.
+    monkeypatch.setattr(store, "iter_compiled", iter_compiled)
+    assert len(list(cache.build())) == features
+    assert list(cache.build()) == []
+
+
+def test_build_after_get_reuses_the_catalog(store: ContentStore) -> None:
+    cache = AbilityCatalogCache(store)
+    catalog = cache.get()
+    assert list(cache.build()) == []
+    assert cache.get() is catalog
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from icos.content import bundles
+from icos.content.bundles import bundle_pack
+
+
+def _write(pack: Path, endpoint: str, api_index: str, raw: Dict[str, object]) -> Path:
+    path = pack / endpoint / f"{api_index}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(raw), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def pack(tmp_path: Path) -> Path:
+    root = tmp_path / "pack"
+    root.mkdir()
+    (root / "manifest.json").write_text(json.dumps({"type": "base", "name": "test"}), encoding="utf-8")
+    _write(root, "monsters", "goblin", {"index": "goblin", "name": "Goblin"})
+    _write(root, "monsters", "orc", {"index": "orc", "name": "Orc"})
+    _write(root, "spells", "light", {"index": "light", "name": "Light"})
+    return root
+
+
+@pytest.fixture
+def loads(monkeypatch: pytest.MonkeyPatch) -> List[str]:
+    """api_index of every file the bundler reads and hashes."""
+    seen: List[str] = []
+    load_source = bundles._load_source
+
+    def recording(task: bundles._SourceTask) -> bundles._LoadedSource:
+        seen.append(task.source.api_index)
+        return load_source(task)
+
+    monkeypatch.setattr(bundles, "_load_source", recording)
+    return seen
+
+
+def _entities(db: Path) -> Dict[str, str]:
+    conn = sqlite3.connect(db)
+    try:
+        return dict(conn.execute("SELECT id, json FROM entities").fetchall())
+    finally:
+        conn.close()
+
+
+def _file_paths(db: Path) -> List[str]:
+    conn = sqlite3.connect(db)
+    try:
+        return sorted(Path(row[0]).stem for row in conn.execute("SELECT source_path FROM files"))
+    finally:
+        conn.close()
+
+
+def test_unchanged_files_are_skipped(pack: Path, tmp_path: Path, loads: List[str]) -> None:
+    out = tmp_path / "test.db"
+    first = bundle_pack(pack, out)
+    assert sorted(loads) == ["goblin", "light", "orc"]
+
+    loads.clear()
+    assert bundle_pack(pack, out) == first
+    assert loads == []
+
+
+def test_modified_file_is_reread(pack: Path, tmp_path: Path, loads: List[str]) -> None:
+    out = tmp_path / "test.db"
+    first = bundle_pack(pack, out)
+
+    loads.clear()
+    _write(pack, "monsters", "orc", {"index": "orc", "name": "Orc Warchief"})
+    assert bundle_pack(pack, out) != first
+    assert loads == ["orc"]
+    assert json.loads(_entities(out)["monsters:orc"])["name"] == "Orc Warchief"
+
+
+def test_deleted_file_is_removed(pack: Path, tmp_path: Path, loads: List[str]) -> None:
+    out = tmp_path / "test.db"
+    bundle_pack(pack, out)
+
+    loads.clear()
+    (pack / "monsters" / "goblin.json").unlink()
+    bundle_pack(pack, out)
+    assert loads == []
+    assert sorted(_entities(out)) == ["monsters:orc", "spells:light"]
+    assert _file_paths(out) == ["light", "orc"]
+
+
+def test_incremental_bundle_matches_full_build(pack: Path, tmp_path: Path) -> None:
+    patched = tmp_path / "patched.db"
+    bundle_pack(pack, patched)
+    _write(pack, "monsters", "orc", {"index": "orc", "name": "Orc Warchief"})
+    _write(pack, "spells", "shield", {"index": "shield", "name": "Shield"})
+    (pack / "monsters" / "goblin.json").unlink()
+
+    full = tmp_path / "full.db"
+    assert bundle_pack(pack, patched) == bundle_pack(pack, full, incremental=False)
+    assert _entities(patched) == _entities(full)
+
+
+def test_full_flag_rebuilds_every_file(
+    pack: Path, tmp_path: Path, loads: List[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    out_dir = tmp_path / "bundles"
+    argv = ["bundles", "--pack", str(pack), "--out-dir", str(out_dir)]
+    monkeypatch.setattr(sys, "argv", argv)
+    bundles.main()
+
+    loads.clear()
+    monkeypatch.setattr(sys, "argv", argv + ["--full"])
+    bundles.main()
+    assert sorted(loads) == ["goblin", "light", "orc"]
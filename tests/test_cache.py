@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from icos.content.cache import LruCache, approx_size
+
+
+def _value(n: int) -> str:
+    return "x" * n
+
+
+def test_byte_budget_evicts_least_recently_used() -> None:
+    size = approx_size(_value(100))
+    cache = LruCache(max_entries=None, max_bytes=3 * size)
+    for key in ("monsters:a", "monsters:b", "monsters:c"):
+        cache.put(key, _value(100))
+    assert cache.get("monsters:a") is not None  # now most recently used
+
+    cache.put("monsters:d", _value(100))
+    assert cache.get("monsters:b") is None
+    assert all(cache.get(key) is not None for key in ("monsters:a", "monsters:c", "monsters:d"))
+
+    stats = cache.stats()
+    assert stats.evictions == 1
+    assert stats.entries == 3
+    assert stats.approx_bytes <= 3 * size
+
+
+def test_oversized_entry_is_not_kept() -> None:
+    cache = LruCache(max_entries=None, max_bytes=approx_size(_value(10)))
+    cache.put("monsters:big", _value(1000))
+    assert cache.get("monsters:big") is None
+    assert cache.stats().approx_bytes == 0
+
+
+def test_pinned_entries_are_never_evicted() -> None:
+    cache = LruCache(max_entries=1, max_bytes=approx_size(_value(10)), pinned_endpoints=["conditions"])
+    cache.put("conditions:prone", _value(1000))
+    for i in range(5):
+        cache.put(f"monsters:m{i}", _value(10))
+
+    assert cache.get("conditions:prone") == _value(1000)
+    assert cache.get("monsters:m4") is not None
+    assert cache.get("monsters:m0") is None
+
+    stats = cache.stats()
+    assert stats.pinned_entries == 1
+    assert stats.entries == 2
+    assert stats.evictions == 4
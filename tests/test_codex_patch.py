@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+import shutil
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from icos.content import codex
+from icos.content.bundles import bundle_pack
+from icos.content.codex import bundle_name_for_pack, merge_codex
+
+ROOT = Path(__file__).resolve().parents[1]
+BASE_MONSTERS = ROOT / "data/packs/base/monsters"
+
+
+def _pack(root: Path, manifest: Dict[str, str]) -> Path:
+    (root / "monsters").mkdir(parents=True)
+    (root / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+    return root
+
+
+def _override(pack: Path, api_index: str, **changes: Any) -> None:
+    raw = json.loads((BASE_MONSTERS / f"{api_index}.json").read_text(encoding="utf-8"))
+    raw.update(changes)
+    (pack / "monsters" / f"{api_index}.json").write_text(json.dumps(raw), encoding="utf-8")
+
+
+def _rows(db: Path, table: str) -> List[tuple]:
+    conn = sqlite3.connect(db)
+    try:
+        return conn.execute(f"SELECT * FROM {table} ORDER BY id").fetchall()
+    finally:
+        conn.close()
+
+
+def test_patch_matches_full_rebuild(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    base = _pack(tmp_path / "base", {"type": "base", "name": "base"})
+    for api_index in ("goblin", "orc", "wolf", "skeleton"):
+        shutil.copy(BASE_MONSTERS / f"{api_index}.json", base / "monsters")
+    mod = _pack(tmp_path / "mod", {"type": "mod", "name": "mod"})
+    _override(mod, "goblin", hit_points=12)
+    _override(mod, "orc", hit_points=20)
+
+    packs = [base, mod]
+    bundle_dir = tmp_path / "bundles"
+
+    def bundle() -> None:
+        for root in packs:
+            bundle_pack(root, bundle_dir / bundle_name_for_pack(root))
+
+    bundle()
+    patched = tmp_path / "patched.db"
+    merge_codex(packs, bundle_dir, patched)
+
+    # Edit one override, drop another and add a new entity, all in one bundle.
+    _override(mod, "orc", hit_points=30, name="Orc Warchief")
+    (mod / "monsters" / "goblin.json").unlink()
+    _override(mod, "zombie")
+    bundle()
+
+    outcomes: List[bool] = []
+    patch_codex = codex._patch_codex
+
+    def spy(*args: Any, **kwargs: Any) -> bool:
+        outcomes.append(patch_codex(*args, **kwargs))
+        return outcomes[-1]
+
+    monkeypatch.setattr(codex, "_patch_codex", spy)
+    patched_checksum = merge_codex(packs, bundle_dir, patched)
+    assert outcomes == [True]
+
+    full = tmp_path / "full.db"
+    assert merge_codex(packs, bundle_dir, full, incremental=False) == patched_checksum
+    for table in ("entities", "monster_stats", "monster_templates"):
+        assert _rows(patched, table) == _rows(full, table)
+    names = {row[0]: row[3] for row in _rows(patched, "entities")}
+    assert names["monsters:orc"] == "Orc Warchief"
+    assert "monsters:zombie" in names
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import pytest
+
+from icos.game.ecs.components import FlagComponent, HealthComponent, PositionComponent
+from icos.game.ecs.registry import ECSRegistry
+
+
+def _spawn(world: ECSRegistry, *components: object) -> str:
+    entity_id = world.create_entity()
+    for component in components:
+        world.add_component(entity_id, component)
+    return entity_id
+
+
+def test_stale_handle_is_rejected_after_slot_reuse() -> None:
+    world = ECSRegistry()
+    old = _spawn(world, HealthComponent(hp=5))
+    handle = world.handle(old)
+    world.remove_entity(old)
+
+    new = _spawn(world, HealthComponent(hp=9))
+    assert world.handle(new) & 0xFFFFFFFF == handle & 0xFFFFFFFF  # same slot, new generation
+    assert world.handle(new) != handle
+
+    assert not world.has_entity(handle)
+    assert world.try_component(handle, HealthComponent) is None
+    with pytest.raises(KeyError):
+        world.entity_id(handle)
+    with pytest.raises(KeyError):
+        world.get_component(handle, HealthComponent)
+    assert world.get_component(world.handle(new), HealthComponent).hp == 9
+
+
+def test_queries_follow_component_add_and_remove() -> None:
+    world = ECSRegistry()
+    a = _spawn(world, HealthComponent())
+    b = _spawn(world, HealthComponent(), PositionComponent())
+    cached = world.cached_query(HealthComponent, PositionComponent)
+    assert cached.ids() == [b]
+
+    world.add_component(a, PositionComponent(x=3))
+    assert cached.ids() == [a, b]
+    assert world.query_ids(HealthComponent, PositionComponent) == [a, b]
+    assert [row[2].x for row in world.query(HealthComponent, PositionComponent)] == [3, 0]
+
+    world.remove_component(b, HealthComponent)
+    assert cached.ids() == [a]
+    assert world.query_ids(HealthComponent) == [a]
+    assert world.query_ids(PositionComponent) == [a, b]
+
+
+def test_creation_order_survives_swap_remove() -> None:
+    world = ECSRegistry()
+    ids = [_spawn(world, HealthComponent(hp=i)) for i in range(5)]
+    cached = world.cached_query(HealthComponent)
+
+    world.remove_entity(ids[1])  # the last row is swapped into the hole
+    expected = [ids[0], *ids[2:]]
+    assert world.query_ids(HealthComponent) == expected
+    assert cached.ids() == expected
+    assert [health.hp for _, health in world.query(HealthComponent)] == [0, 2, 3, 4]
+    assert list(world.entities()) == expected
+
+
+def test_clone_worlds_are_independent() -> None:
+    world = ECSRegistry()
+    entity_id = _spawn(world, HealthComponent(hp=10), FlagComponent())
+    fork = world.clone()
+
+    fork.get_mut(entity_id, HealthComponent).hp = 1
+    fork.get_mut(entity_id, FlagComponent).flags.add("defending")
+    assert world.get_component(entity_id, HealthComponent).hp == 10
+    assert world.get_component(entity_id, FlagComponent).flags == set()
+
+    world.get_mut(entity_id, HealthComponent).hp = 7
+    world.remove_component(entity_id, FlagComponent)
+    assert fork.get_component(entity_id, HealthComponent).hp == 1
+    assert fork.get_component(entity_id, FlagComponent).flags == {"defending"}
+
+    fork.remove_entity(entity_id)
+    assert world.has_entity(entity_id)
+    assert world.get_component(entity_id, HealthComponent).hp == 7
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import shutil
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from icos.content.db import CodexDb
+from icos.content.store import ContentStore
+from icos.game.runtime.instances import ActorTemplateCache, build_actor_template
+
+
+def _store(path: Path) -> ContentStore:
+    return ContentStore(db=CodexDb(path.as_posix()))
+
+
+def test_persisted_templates_match_compiled_monsters(codex_db: Path) -> None:
+    store = _store(codex_db)
+    try:
+        monsters = store.list_monsters()
+        templates = ActorTemplateCache(store)
+        templates.prefetch(m.api_index for m in monsters)
+        assert len(templates) == len(monsters)
+        for monster in monsters:
+            compiled = build_actor_template(monster)
+            if not compiled.attacks:
+                with pytest.raises(ValueError):
+                    templates.get(monster.api_index)
+                continue
+            persisted = templates.get(monster.api_index)
+            assert persisted == compiled
+            # served from the prefetched entry, not rebuilt
+            assert templates.get(monster.api_index) is persisted
+            assert templates.for_monster(monster) is persisted
+        assert len(templates) == len(monsters)
+    finally:
+        store.db.close()
+
+
+def test_codex_without_templates_table_compiles(codex_db: Path, tmp_path: Path) -> None:
+    legacy = tmp_path / "legacy.db"
+    shutil.copyfile(codex_db, legacy)
+    with sqlite3.connect(legacy) as conn:
+        conn.execute("DROP TABLE monster_templates")
+
+    store = _store(legacy)
+    try:
+        assert store.get_monster_template("goblin") is None
+        assert store.get_monster_templates(["goblin"]) == {}
+
+        templates = ActorTemplateCache(store)
+        templates.prefetch(["goblin"])
+        assert len(templates) == 0
+        assert templates.get("goblin") == build_actor_template(store.get_monster("goblin"))
+    finally:
+        store.db.close()
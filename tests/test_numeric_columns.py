@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from icos.game.ecs.components import HealthComponent
+from icos.game.ecs.registry import ECSRegistry
+
+
+def _world(*hps: int) -> tuple[ECSRegistry, list[str]]:
+    world = ECSRegistry()
+    ids = []
+    for hp in hps:
+        entity_id = world.create_entity()
+        world.add_component(entity_id, HealthComponent(max_hp=10, hp=hp))
+        ids.append(entity_id)
+    return world, ids
+
+
+def test_write_back_round_trips_into_registry() -> None:
+    world, ids = _world(10, 7, 3)
+    cols = world.numeric_columns(HealthComponent, "hp", "alive")
+    assert list(cols["hp"]) == [10, 7, 3]
+
+    for i in range(len(cols)):
+        cols["hp"][i] = max(0, cols["hp"][i] - 5)
+        cols["alive"][i] = cols["hp"][i] > 0
+    cols.write_back()
+
+    assert [world.get_component(e, HealthComponent).hp for e in ids] == [5, 2, 0]
+    assert [world.get_component(e, HealthComponent).alive for e in ids] == [True, True, False]
+    assert list(world.numeric_columns(HealthComponent, "hp")["hp"]) == [5, 2, 0]
+
+
+def test_write_back_in_clone_leaves_source_untouched() -> None:
+    world, ids = _world(10, 7)
+    fork = world.clone()
+
+    cols = fork.numeric_columns(HealthComponent, "hp")
+    cols["hp"][0] = 1
+    cols.write_back("hp")
+
+    assert fork.get_component(ids[0], HealthComponent).hp == 1
+    assert world.get_component(ids[0], HealthComponent).hp == 10
+    assert world.get_component(ids[1], HealthComponent).hp == 7
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Iterator, List, Tuple
+
+import pytest
+
+from icos.adapters.cli.commands import _cmd_find
+from icos.content.db import CodexDb
+
+
+@pytest.fixture(scope="module")
+def db(codex_db: Path) -> Iterator[CodexDb]:
+    db = CodexDb(codex_db)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _ids(db: CodexDb, query: str, **kwargs: object) -> List[str]:
+    return [hit.id for hit in db.search(query, **kwargs)]  # type: ignore[arg-type]
+
+
+def test_name_matches_rank_above_description_matches(db: CodexDb) -> None:
+    ids = _ids(db, "fire bolt", limit=10)
+    assert ids[0] == "spells:fire-bolt"
+    # Casters list the cantrip in their description only.
+    assert "monsters:mage" in ids
+
+
+def test_search_matches_prefixes_and_filters_endpoints(db: CodexDb) -> None:
+    assert "monsters:goblin" in _ids(db, "gobl")
+    assert _ids(db, "goblin", endpoints=["monsters"])[0] == "monsters:goblin"
+    assert all(eid.startswith("monsters:") for eid in _ids(db, "dragon red", endpoints=["monsters"]))
+    assert len(_ids(db, "dragon", limit=3)) == 3
+
+
+def test_search_ignores_query_syntax(db: CodexDb) -> None:
+    assert _ids(db, '"goblin" OR (orc*') == _ids(db, "goblin orc")
+    assert _ids(db, "!!!") == []
+
+
+class _Engine:
+    def __init__(self) -> None:
+        self.calls: List[Tuple[str, int]] = []
+
+    def search(self, query: str, *, limit: int) -> list:
+        self.calls.append((query, limit))
+        return []
+
+
+@pytest.mark.parametrize(
+    ("args", "expected"),
+    [
+        (["cr", "3"], ("cr 3", 50)),
+        (["young", "red", "--limit", "5"], ("young red", 5)),
+        (["--limit=7", "orc"], ("orc", 7)),
+        (["goblin", "limit=2"], ("goblin", 2)),
+    ],
+)
+def test_find_takes_the_limit_from_explicit_tokens(args: List[str], expected: Tuple[str, int]) -> None:
+    engine = _Engine()
+    assert _cmd_find(SimpleNamespace(engine=engine), args) == "No matches."  # type: ignore[arg-type]
+    assert engine.calls == [expected]
+
+
+@pytest.mark.parametrize("args", [["goblin", "--limit"], ["goblin", "--limit", "x"], ["goblin", "limit=0"]])
+def test_find_rejects_invalid_limits(args: List[str]) -> None:
+    engine = _Engine()
+    assert _cmd_find(SimpleNamespace(engine=engine), args) == "Invalid limit."  # type: ignore[arg-type]
+    assert engine.calls == []
+
+
+def test_find_needs_query_text() -> None:
+    assert _cmd_find(SimpleNamespace(engine=_Engine()), ["--limit", "3"]).startswith("Usage:")  # type: ignore[arg-type]
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from icos.content.db import CodexDb
+from icos.content.rawjson import LazyRawJson
+from icos.content.snapshot import CodexSnapshot, build_snapshot
+from icos.content.store import ContentStore
+
+
+def test_snapshot_serves_compiled_definitions(codex_db: Path, tmp_path: Path) -> None:
+    db = CodexDb(codex_db)
+    path = tmp_path / "codex.snapshot"
+    build_snapshot(db, path)
+    compiled = ContentStore(db=db)
+    served = ContentStore(db=db, snapshot=CodexSnapshot(path))
+    try:
+        for endpoint in ("monsters", "spells", "conditions", "equipment"):
+            ids = [row.api_index for row in db.iter_endpoint(endpoint, limit=5)]
+            assert served.get_many(endpoint, ids) == compiled.get_many(endpoint, ids)
+    finally:
+        served.set_snapshot(None)
+        db.close()
+
+
+def test_lazy_raw_json_applies_to_snapshot_definitions(codex_db: Path, tmp_path: Path) -> None:
+    db = CodexDb(codex_db)
+    path = tmp_path / "codex.snapshot"
+    build_snapshot(db, path)
+    store = ContentStore(db=db, snapshot=CodexSnapshot(path), lazy_raw_json=True)
+    try:
+        goblin = store.get_monster("goblin")
+        assert isinstance(goblin.raw_json, LazyRawJson)
+        assert not goblin.raw_json.loaded
+        assert dict(goblin.raw_json) == db.get_json("monsters:goblin")
+    finally:
+        store.set_snapshot(None)
+        db.close()
+
+
+def test_lazy_raw_json_applies_to_compiled_definitions(codex_db: Path) -> None:
+    db = CodexDb(codex_db)
+    try:
+        goblin = ContentStore(db=db, lazy_raw_json=True).get_monster("goblin")
+        assert isinstance(goblin.raw_json, LazyRawJson)
+        assert not goblin.raw_json.loaded
+        assert goblin == ContentStore(db=db).get_monster("goblin")
+    finally:
+        db.close()
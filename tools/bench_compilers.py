@@ -0,0 +1,125 @@
+"""
+Compile throughput per endpoint (entities/sec) over an existing codex DB.
+
+Usage:
+  python tools/bench_compilers.py [--codex data/codex/codex.db] [--rounds 5] [--json]
+  python tools/bench_compilers.py --save before.json      # on the old tree
+  python tools/bench_compilers.py --baseline before.json  # on the new tree
+
+Rows are decoded once up front; only `compiler.compile` is timed. Endpoints
+without a bespoke compiler are reported together as "generic".
+
+For the old tree, copy this file into its tools/ and build its codex there
+first (with `src` on `PYTHONPATH`, `python -m icos.content.bundles --pack ...`
+for every manifest pack, then `python -m icos.content.codex`). Only names the
+baseline already exports are required; newer entry points are used when present.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from icos.content import compilers  # noqa: E402
+from icos.content.compilers import (  # noqa: E402
+    CompilerRegistry,
+    ConditionCompiler,
+    EntityRecord,
+    EquipmentCompiler,
+    MonsterCompiler,
+    SpellCompiler,
+)
+from icos.content.db import CodexDb  # noqa: E402
+
+
+def default_registry() -> CompilerRegistry:
+    """The store's default compilers; registered by hand on trees before `register_default_compilers`."""
+    register = getattr(compilers, "register_default_compilers", None)
+    if register is not None:
+        return register(CompilerRegistry())
+    registry = CompilerRegistry()
+    for compiler in (MonsterCompiler(), EquipmentCompiler(), SpellCompiler(), ConditionCompiler()):
+        registry.register(compiler)
+    return registry
+
+
+def as_record(row: Any) -> EntityRecord:
+    """Rows are records since the field-plan compilers; older trees convert like their store did."""
+    if isinstance(row, EntityRecord):
+        return row
+    return EntityRecord(id=row.id, endpoint=row.endpoint, api_index=row.api_index, name=row.name, json=row.json)
+
+
+def bench(codex: Path, *, rounds: int) -> Dict[str, Dict[str, float]]:
+    registry = default_registry()
+    bespoke = set(registry.endpoints())
+
+    db = CodexDb(codex.as_posix())
+    try:
+        groups: Dict[str, List[EntityRecord]] = {}
+        for endpoint in db.list_endpoints():
+            group = groups.setdefault(endpoint if endpoint in bespoke else "generic", [])
+            group.extend(as_record(row) for row in db.iter_endpoint(endpoint))
+    finally:
+        # CodexDb gained close() with its connection pool.
+        close = getattr(db, "close", None)
+        if close is not None:
+            close()
+
+    results: Dict[str, Dict[str, float]] = {}
+    for group, records in groups.items():
+        best = float("inf")
+        for _ in range(max(1, rounds)):
+            start = time.perf_counter()
+            for record in records:
+                registry.resolve(record.endpoint).compile(record)
+            best = min(best, time.perf_counter() - start)
+        results[group] = {
+            "entities": len(records),
+            "seconds": best,
+            "entities_per_sec": len(records) / best if best > 0 else 0.0,
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--codex", default="data/codex/codex.db", help="Codex DB path")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed rounds per endpoint (best is reported)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--save", default=None, help="Also write results as JSON to this path")
+    parser.add_argument("--baseline", default=None, help="Compare against results saved with --save")
+    args = parser.parse_args()
+
+    results = bench(Path(args.codex), rounds=args.rounds)
+    if args.save:
+        Path(args.save).write_text(json.dumps(results, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    if args.json:
+        print(json.dumps(results, indent=2, sort_keys=True))
+        return
+
+    baseline: Dict[str, Dict[str, float]] = {}
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+
+    header = f"{'endpoint':<12} {'entities':>8} {'ms':>9} {'entities/sec':>14}"
+    print(header + (f" {'before':>14} {'speedup':>8}" if baseline else ""))
+    for group in sorted(results):
+        r = results[group]
+        line = f"{group:<12} {int(r['entities']):>8} {r['seconds'] * 1000:>9.2f} {r['entities_per_sec']:>14,.0f}"
+        before = baseline.get(group, {}).get("entities_per_sec")
+        if before:
+            line += f" {before:>14,.0f} {r['entities_per_sec'] / before:>7.2f}x"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
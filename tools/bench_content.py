@@ -0,0 +1,276 @@
+"""
+Content pipeline benchmark: bundling, merging, checksums, compiled lookups and
+the ability catalog, over the real packs and over scaled copies of them.
+
+Usage:
+  python tools/bench_content.py                        # real packs + 10x
+  python tools/bench_content.py --scales 10,100 --out after.json
+  python tools/bench_content.py --baseline before.json # compare with a saved run
+  python tools/bench_content.py --scales 1 --synthetic 10000,100000 --layers 3
+
+Every scenario works in a scratch directory (bundles, codex and, for scaled
+runs, the generated packs), so data/ is never touched. A scale of N writes N
+copies of every entity of every enabled pack, renamed `<api_index>-xK`, and
+keeps the manifest load order. `--synthetic N` adds a scenario over packs
+from `tools/synthetic_packs.py` with N base entities per generated endpoint.
+Results are seconds (lower is better) in a flat JSON object per scenario so
+two runs can be diffed key by key.
+
+To compare commits, copy this file and `synthetic_packs.py` into the other
+checkout's tools/. Any commit from the baseline on runs: options the tree
+does not accept are dropped (jobs, incremental), bundling falls back to
+per-pack `bundle_pack`, `ability_catalog.build` times the engine's
+`_build_ability_catalog` on trees without the catalog cache, and
+`--synthetic` is skipped where the generator's dependencies are missing.
+`--compress` requires a tree with compressed codex storage.
+"""
+from __future__ import annotations
+
+import argparse
+import inspect
+import json
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from icos.app.services import GameEngine  # noqa: E402
+from icos.content import bundles  # noqa: E402
+from icos.content.bundles import iter_pack_json_files  # noqa: E402
+from icos.content.codex import bundle_name_for_pack, compute_codex_checksum, merge_codex, read_codex_manifest  # noqa: E402
+from icos.content.db import CodexDb  # noqa: E402
+from icos.content.store import ContentStore  # noqa: E402
+
+# Later additions to the pipeline; older trees are benchmarked without them.
+try:
+    from icos.game.effects import AbilityCatalogCache  # noqa: E402
+except ImportError:
+    AbilityCatalogCache = None  # type: ignore[assignment,misc]
+try:
+    from synthetic_packs import SyntheticSpec, generate_packs  # noqa: E402
+except ImportError:
+    SyntheticSpec = generate_packs = None  # type: ignore[assignment,misc]
+
+Results = Dict[str, float]
+
+
+def accepted(fn: Callable[..., Any], **kwargs: Any) -> Dict[str, Any]:
+    """The subset of `kwargs` that `fn` takes, so one call works on older trees."""
+    params = inspect.signature(fn).parameters
+    return {key: value for key, value in kwargs.items() if key in params}
+
+
+def build_ability_catalog(store: ContentStore) -> Any:
+    if AbilityCatalogCache is not None:
+        return AbilityCatalogCache(store).get()
+    # Before the catalog cache the engine rebuilt the catalog per encounter from
+    # its content store, which is all the method reads.
+    return GameEngine._build_ability_catalog(SimpleNamespace(content=store))  # type: ignore[attr-defined,arg-type]
+
+
+def bundle_all(pairs: List[Tuple[Path, Path]], *, incremental: bool, jobs: int) -> None:
+    bundle_packs = getattr(bundles, "bundle_packs", None)
+    if bundle_packs is not None:
+        bundle_packs(pairs, **accepted(bundle_packs, incremental=incremental, jobs=jobs))
+        return
+    for pack_root, out_db in pairs:
+        bundles.bundle_pack(pack_root, out_db, **accepted(bundles.bundle_pack, incremental=incremental))
+
+
+def scale_packs(pack_roots: List[Path], out_dir: Path, factor: int) -> List[Path]:
+    """Write `factor` renamed copies of every entity of each pack under `out_dir`."""
+    scaled: List[Path] = []
+    for i, pack_root in enumerate(pack_roots):
+        dst_root = out_dir / f"{i:02d}_{pack_root.name}"
+        dst_root.mkdir(parents=True, exist_ok=True)
+        manifest = pack_root / "manifest.json"
+        if manifest.exists():
+            shutil.copyfile(manifest, dst_root / "manifest.json")
+
+        for src in iter_pack_json_files(pack_root):
+            endpoint_dir = dst_root / src.endpoint
+            endpoint_dir.mkdir(exist_ok=True)
+            raw = json.loads(src.path.read_text(encoding="utf-8"))
+            name = raw.get("name") if isinstance(raw, dict) else None
+            for k in range(factor):
+                api_index = src.api_index if k == 0 else f"{src.api_index}-x{k}"
+                if k and isinstance(raw, dict):
+                    raw["index"] = api_index
+                    if isinstance(name, str):
+                        raw["name"] = f"{name} x{k}"
+                (endpoint_dir / f"{api_index}.json").write_text(json.dumps(raw), encoding="utf-8")
+        scaled.append(dst_root)
+    return scaled
+
+
+def timed(fn: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def best_of(rounds: int, fn: Callable[[], Any]) -> float:
+    return min(timed(fn) for _ in range(max(1, rounds)))
+
+
+def bench_scenario(
+    pack_roots: List[Path], work: Path, *, rounds: int, sample: int, jobs: int, compress: bool = False
+) -> Results:
+    bundle_dir = work / "bundles"
+    codex_db = work / "codex" / "codex.db"
+    pairs = [(root, bundle_dir / bundle_name_for_pack(root)) for root in pack_roots]
+    out: Results = {}
+
+    checksum_kw = accepted(compute_codex_checksum, compress=compress)
+    full_kw = accepted(merge_codex, incremental=False, compress=compress)
+    noop_kw = accepted(merge_codex, incremental=True, compress=compress)
+
+    out["bundle_pack.full"] = timed(lambda: bundle_all(pairs, incremental=False, jobs=jobs))
+    out["bundle_pack.noop"] = timed(lambda: bundle_all(pairs, incremental=True, jobs=jobs))
+    out["compute_codex_checksum"] = best_of(
+        rounds, lambda: compute_codex_checksum(pack_roots, bundle_dir, **checksum_kw)
+    )
+    out["merge_codex.full"] = timed(lambda: merge_codex(pack_roots, bundle_dir, codex_db, **full_kw))
+    out["merge_codex.noop"] = timed(lambda: merge_codex(pack_roots, bundle_dir, codex_db, **noop_kw))
+
+    db = CodexDb(codex_db.as_posix())
+    try:
+        counts = db.count_by_endpoint()
+        out["entities"] = float(sum(counts.values()))
+
+        ids = [row.id for endpoint in sorted(counts) for row in db.iter_endpoint(endpoint)]
+        step = max(1, len(ids) // max(1, sample))
+        picks = [eid.split(":", 1) for eid in ids[::step][:sample]]
+        out["get_compiled.sample"] = float(len(picks))
+
+        store = ContentStore(db=db)
+        out["get_compiled.cold"] = timed(lambda: [store.get_compiled(e, a) for e, a in picks])
+        out["get_compiled.warm"] = best_of(rounds, lambda: [store.get_compiled(e, a) for e, a in picks])
+
+        for endpoint in sorted(counts):
+            out[f"list_compiled.{endpoint}"] = best_of(
+                rounds, lambda: ContentStore(db=db).list_compiled(endpoint)
+            )
+
+        out["ability_catalog.build"] = best_of(rounds, lambda: build_ability_catalog(ContentStore(db=db)))
+    finally:
+        # CodexDb gained close() with its connection pool.
+        close = getattr(db, "close", None)
+        if close is not None:
+            close()
+    return out
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--manifest", default="data/codex/manifest.json", help="Codex manifest with the real packs")
+    parser.add_argument("--scales", default="1,10", help="Comma-separated scale factors (1 = the real packs)")
+    parser.add_argument("--synthetic", default="", help="Comma-separated base sizes of generated-pack scenarios")
+    parser.add_argument("--layers", type=int, default=3, help="Packs per generated scenario (1 base + overrides)")
+    parser.add_argument("--rounds", type=int, default=3, help="Rounds for repeatable timings (best is reported)")
+    parser.add_argument("--sample", type=int, default=2000, help="Entities looked up by get_compiled")
+    parser.add_argument("--compress", action="store_true", help="Merge codexes with compressed entity JSON")
+    parser.add_argument("--jobs", type=int, default=1, help="Bundle worker processes (0 = one per CPU)")
+    parser.add_argument("--workdir", default=None, help="Scratch directory (default: a temp dir, removed afterwards)")
+    parser.add_argument("--out", default=None, help="Write results as JSON to this path")
+    parser.add_argument("--baseline", default=None, help="Compare against results saved with --out")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    if args.compress and "compress" not in inspect.signature(merge_codex).parameters:
+        parser.error("--compress needs a tree with compressed codex storage")
+    if args.synthetic and generate_packs is None:
+        print("synthetic_packs is unavailable in this tree; skipping --synthetic scenarios.", file=sys.stderr)
+        args.synthetic = ""
+
+    manifest = Path(args.manifest)
+    if not manifest.is_absolute():
+        manifest = ROOT / manifest
+    pack_roots = [p if p.is_absolute() else ROOT / p for p in read_codex_manifest(manifest)]
+    scales = [int(s) for s in args.scales.split(",") if s.strip()]
+
+    work_root = Path(args.workdir) if args.workdir else Path(tempfile.mkdtemp(prefix="icos-bench-"))
+    scenarios: Dict[str, Results] = {}
+    try:
+        for scale in scales:
+            name = "real" if scale == 1 else f"x{scale}"
+            work = work_root / name
+            if work.exists():
+                shutil.rmtree(work)
+            work.mkdir(parents=True)
+            roots = pack_roots if scale == 1 else scale_packs(pack_roots, work / "packs", scale)
+            print(f"[{name}] benchmarking {len(roots)} packs...", file=sys.stderr)
+            scenarios[name] = bench_scenario(
+                roots, work, rounds=args.rounds, sample=args.sample, jobs=args.jobs, compress=args.compress
+            )
+        for size in [int(s) for s in args.synthetic.split(",") if s.strip()]:
+            name = f"synthetic{size}"
+            work = work_root / name
+            if work.exists():
+                shutil.rmtree(work)
+            spec = SyntheticSpec(monsters=size, features=size, equipment=size, spells=size, layers=args.layers)
+            roots = generate_packs(work / "packs", spec, jobs=args.jobs)
+            print(f"[{name}] benchmarking {len(roots)} packs...", file=sys.stderr)
+            scenarios[name] = bench_scenario(
+                roots, work, rounds=args.rounds, sample=args.sample, jobs=args.jobs, compress=args.compress
+            )
+    finally:
+        if not args.workdir:
+            shutil.rmtree(work_root, ignore_errors=True)
+
+    results = {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "rounds": args.rounds,
+            "jobs": args.jobs,
+            "compress": args.compress,
+        },
+        "scenarios": scenarios,
+    }
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    if args.json:
+        print(json.dumps(results, indent=2, sort_keys=True))
+        return
+
+    baseline: Dict[str, Results] = {}
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8")).get("scenarios", {})
+
+    for name, metrics in scenarios.items():
+        before = baseline.get(name, {})
+        print(f"\n== {name} ({int(metrics.get('entities', 0))} entities)")
+        print(f"{'metric':<36} {'ms':>10}" + (f" {'before':>10} {'speedup':>8}" if before else ""))
+        for key in sorted(metrics):
+            if key in ("entities", "get_compiled.sample"):
+                continue
+            line = f"{key:<36} {metrics[key] * 1000:>10.2f}"
+            old = before.get(key)
+            if old:
+                line += f" {old * 1000:>10.2f} {old / metrics[key] if metrics[key] else 0.0:>7.2f}x"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,413 @@
+"""
+Deterministic synthetic content packs for scale tests.
+
+Usage:
+  python tools/synthetic_packs.py --out /tmp/syn --count 100000 --layers 3 --jobs 0
+
+Writes one base pack plus override layers and a codex manifest
+(`<out>/manifest.json`) usable with `icos.content.codex --manifest`.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from icos.content.bundles import resolve_jobs  # noqa: E402
+
+Json = Dict[str, Any]
+
+# Marker key in the generated codex manifest; only directories carrying it are
+# ever cleared by a re-run.
+_MARKER = "synthetic"
+
+# Files per shard directory; packs may nest files below the endpoint folder.
+_SHARD_SIZE = 1000
+
+# Entities per generation task handed to a worker process.
+_TASK_SIZE = 5000
+
+ENDPOINTS: Tuple[str, ...] = ("monsters", "features", "equipment", "spells")
+
+_SIZES = ("Tiny", "Small", "Medium", "Large", "Huge", "Gargantuan")
+_TYPES = ("aberration", "beast", "construct", "dragon", "elemental", "fiend", "giant", "humanoid", "monstrosity", "undead")
+_CRS = (0.125, 0.25, 0.5, 1, 2, 3, 4, 5, 6, 8, 10, 12, 15, 17, 20, 24)
+_XP = {0.125: 25, 0.25: 50, 0.5: 100, 1: 200, 2: 450, 3: 700, 4: 1100, 5: 1800, 6: 2300, 8: 3900,
+       10: 5900, 12: 8400, 15: 13000, 17: 18000, 20: 25000, 24: 62000}
+_DAMAGE_TYPES = ("acid", "bludgeoning", "cold", "fire", "force", "lightning", "necrotic", "piercing",
+                 "poison", "psychic", "radiant", "slashing", "thunder")
+_CONDITIONS = ("blinded", "charmed", "frightened", "grappled", "paralyzed", "poisoned", "prone", "restrained", "stunned")
+_STATS = ("str", "dex", "con", "int", "wis", "cha")
+_CLASSES = ("barbarian", "bard", "cleric", "druid", "fighter", "monk", "paladin", "ranger", "rogue", "sorcerer", "warlock", "wizard")
+_SCHOOLS = ("abjuration", "conjuration", "divination", "enchantment", "evocation", "illusion", "necromancy", "transmutation")
+_DICE = ("1d4", "1d6", "1d8", "1d10", "1d12", "2d6", "2d8", "3d6", "4d6")
+_WORDS = ("ash", "bone", "storm", "shadow", "iron", "frost", "ember", "thorn", "void", "glass", "moss", "dusk")
+
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    """
+    Size and shape of a generated pack set.
+
+    `layers` packs are written in load order: one base pack holding the counts
+    below, then override packs that each replace roughly `override_ratio` of
+    the base ids with different content and add `new_ratio` new ids.
+    """
+    monsters: int = 1000
+    features: int = 1000
+    equipment: int = 1000
+    spells: int = 1000
+    layers: int = 1
+    override_ratio: float = 0.1
+    new_ratio: float = 0.02
+    seed: int = 0
+
+    def count(self, endpoint: str) -> int:
+        return int(getattr(self, endpoint))
+
+
+def generate_packs(out_dir: Path, spec: SyntheticSpec, *, jobs: int = 1) -> List[Path]:
+    """
+    Write the packs described by `spec` under `out_dir` plus a codex manifest
+    (`out_dir/manifest.json`) enabling them in load order; returns the pack roots.
+
+    Output depends only on `spec`: the same spec always produces byte-identical
+    files, whatever `jobs` is. Re-running over a previous output replaces it;
+    any other non-empty `out_dir` is refused.
+    """
+    if spec.layers < 1:
+        raise ValueError("layers must be >= 1")
+    _prepare_out_dir(out_dir)
+
+    pack_roots: List[Path] = []
+    tasks: List[Tuple[Path, int, str, int, int, SyntheticSpec]] = []
+    for layer in range(spec.layers):
+        pack_root = out_dir / ("base" if layer == 0 else f"layer_{layer:02d}")
+        pack_root.mkdir(parents=True)
+        _write_json(pack_root / "manifest.json", _pack_manifest(layer))
+        pack_roots.append(pack_root)
+
+        for endpoint in ENDPOINTS:
+            total = _layer_size(spec, layer, endpoint)
+            for start in range(0, total, _TASK_SIZE):
+                tasks.append((pack_root, layer, endpoint, start, min(total, start + _TASK_SIZE), spec))
+
+    jobs = resolve_jobs(jobs)
+    if jobs <= 1:
+        for task in tasks:
+            _write_task(task)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            list(pool.map(_write_task, tasks))
+
+    _write_json(
+        out_dir / "manifest.json",
+        {_MARKER: True, "spec": asdict(spec), "enabled": [{"path": root.resolve().as_posix()} for root in pack_roots]},
+    )
+    return pack_roots
+
+
+def generate_entity(spec: SyntheticSpec, endpoint: str, slot: int, *, layer: int = 0, new: bool = False) -> Json:
+    """One entity: `slot` is the base id number (or the new-id number of `layer` when `new`)."""
+    stem = endpoint[:-1] if endpoint.endswith("s") else endpoint
+    api_index = f"syn-{stem}-l{layer:02d}-{slot:07d}" if new else f"syn-{stem}-{slot:07d}"
+    endpoint_no = ENDPOINTS.index(endpoint)
+    rng = random.Random(((spec.seed * 64 + layer) * 8 + endpoint_no) * 100_000_019 + slot * 2 + int(new))
+    return _BUILDERS[endpoint](rng, api_index, layer)
+
+
+# An override layer writes base slots `first, first + stride, ...` (shifted per
+# layer so layers overlap only partly), then its own new ids.
+
+
+def _override_range(spec: SyntheticSpec, layer: int, endpoint: str) -> range:
+    if layer == 0 or spec.override_ratio <= 0:
+        return range(0)
+    stride = max(1, round(1 / spec.override_ratio))
+    return range((-layer) % stride, spec.count(endpoint), stride)
+
+
+def _layer_size(spec: SyntheticSpec, layer: int, endpoint: str) -> int:
+    if layer == 0:
+        return spec.count(endpoint)
+    return len(_override_range(spec, layer, endpoint)) + int(spec.count(endpoint) * spec.new_ratio)
+
+
+def _layer_slot(spec: SyntheticSpec, layer: int, endpoint: str, n: int) -> Tuple[int, bool]:
+    """(slot, is_new) of the n-th entity `layer` writes for `endpoint`."""
+    if layer == 0:
+        return n, False
+    overrides = _override_range(spec, layer, endpoint)
+    if n < len(overrides):
+        return overrides[n], False
+    return n - len(overrides), True
+
+
+def _write_task(task: Tuple[Path, int, str, int, int, SyntheticSpec]) -> None:
+    pack_root, layer, endpoint, start, stop, spec = task
+    shard: Path | None = None
+    for n in range(start, stop):
+        slot, new = _layer_slot(spec, layer, endpoint, n)
+        raw = generate_entity(spec, endpoint, slot, layer=layer, new=new)
+        if shard is None or n % _SHARD_SIZE == 0:
+            shard = pack_root / endpoint / f"{n // _SHARD_SIZE:04d}"
+            shard.mkdir(parents=True, exist_ok=True)
+        (shard / f"{raw['index']}.json").write_text(json.dumps(raw, sort_keys=True), encoding="utf-8")
+
+
+def _prepare_out_dir(out_dir: Path) -> None:
+    if not out_dir.exists():
+        out_dir.mkdir(parents=True)
+        return
+    if not any(out_dir.iterdir()):
+        return
+
+    manifest = out_dir / "manifest.json"
+    try:
+        previous = json.loads(manifest.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        previous = None
+    if not isinstance(previous, dict) or not previous.get(_MARKER):
+        raise ValueError(f"{out_dir} is not empty and was not written by the synthetic pack generator.")
+
+    for child in out_dir.iterdir():
+        if child.is_dir():
+            shutil.rmtree(child)
+        else:
+            child.unlink()
+
+
+def _pack_manifest(layer: int) -> Json:
+    if layer == 0:
+        return {"type": "base", "name": "synthetic", "bundle": "synthetic_base.db", "version": "0.0.0",
+                "description": "Generated scale-test base pack."}
+    return {"type": "mod", "name": f"synthetic_layer_{layer:02d}", "bundle": f"synthetic_layer_{layer:02d}.db",
+            "version": "0.0.0", "description": f"Generated scale-test override layer {layer}."}
+
+
+def _write_json(path: Path, raw: Json) -> None:
+    path.write_text(json.dumps(raw, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+# --- Entity builders ----------------------------------------------------------
+
+
+def _ref(endpoint: str, index: str) -> Json:
+    return {"index": index, "name": index.replace("-", " ").title(), "url": f"/api/2014/{endpoint}/{index}"}
+
+
+def _title(rng: random.Random, noun: str) -> str:
+    return f"{rng.choice(_WORDS).title()}{rng.choice(_WORDS)} {noun}"
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(_WORDS, k=words)).capitalize() + "."
+
+
+def _monster(rng: random.Random, api_index: str, layer: int) -> Json:
+    cr = rng.choice(_CRS)
+    prof = 2 + int(cr) // 4
+    abilities = {stat: rng.randint(3, 24) for stat in
+                 ("strength", "dexterity", "constitution", "intelligence", "wisdom", "charisma")}
+
+    actions: List[Json] = []
+    attack_count = rng.randint(1, 3)
+    if attack_count > 1:
+        actions.append({"name": "Multiattack", "desc": f"The creature makes {attack_count} attacks.", "actions": []})
+    for _ in range(attack_count):
+        ranged = rng.random() < 0.3
+        bonus = prof + rng.randint(0, 5)
+        dice = f"{rng.choice(_DICE)}+{rng.randint(0, 6)}"
+        kind = "Ranged" if ranged else "Melee"
+        actions.append({
+            "name": _title(rng, "Bolt" if ranged else "Strike"),
+            "desc": f"{kind} Weapon Attack: +{bonus} to hit, {'range 80/320 ft.' if ranged else 'reach 5 ft.'}, one target.",
+            "attack_bonus": bonus,
+            "damage": [{"damage_dice": dice, "damage_type": _ref("damage-types", rng.choice(_DAMAGE_TYPES))}],
+            "actions": [],
+        })
+
+    raw: Json = {
+        "index": api_index,
+        "name": _title(rng, "Horror"),
+        "url": f"/api/2014/monsters/{api_index}",
+        "size": rng.choice(_SIZES),
+        "type": rng.choice(_TYPES),
+        "alignment": rng.choice(("unaligned", "chaotic evil", "lawful neutral", "neutral")),
+        "armor_class": [{"type": "natural", "value": rng.randint(10, 22)}],
+        "hit_points": rng.randint(4, 400),
+        "hit_dice": f"{rng.randint(1, 30)}d{rng.choice((6, 8, 10, 12))}",
+        "speed": {"walk": f"{rng.choice((20, 30, 40))} ft."},
+        **abilities,
+        "proficiency_bonus": prof,
+        "challenge_rating": cr,
+        "xp": _XP[cr],
+        "languages": "",
+        "senses": {"passive_perception": rng.randint(8, 20)},
+        "damage_resistances": [],
+        "damage_immunities": [],
+        "damage_vulnerabilities": [],
+        "condition_immunities": [_ref("conditions", c) for c in rng.sample(_CONDITIONS, rng.randint(0, 2))],
+        "special_abilities": [{"name": _title(rng, "Aura"), "desc": _sentence(rng, 12), "damage": []}],
+        "actions": actions,
+        "reactions": [],
+        "legendary_actions": [],
+        "proficiencies": [],
+        "forms": [],
+    }
+    if cr >= 10:
+        raw["legendary_actions"] = [{"name": _title(rng, "Sweep"), "desc": _sentence(rng, 10)}]
+    if layer:
+        raw["desc"] = f"Overridden by layer {layer}."
+    return raw
+
+
+def _effect(rng: random.Random, depth: int) -> Json:
+    if depth < 2 and rng.random() < 0.5:
+        return {
+            "type": "roll_check",
+            "stat": rng.choice(_STATS),
+            "dc": rng.randint(8, 20),
+            "bonus": rng.randint(0, 3),
+            "on_success": [_effect(rng, depth + 1) for _ in range(rng.randint(0, 2))],
+            "on_failure": [_effect(rng, depth + 1) for _ in range(rng.randint(1, 2))],
+        }
+    kind = rng.choice(("damage", "heal", "apply_condition", "modify_stat"))
+    if kind == "damage":
+        return {"type": "damage", "amount": rng.choice(_DICE), "damage_type": rng.choice(_DAMAGE_TYPES)}
+    if kind == "heal":
+        return {"type": "heal", "amount": rng.choice(_DICE), "target": "self"}
+    if kind == "apply_condition":
+        return {"type": "apply_condition", "condition": rng.choice(_CONDITIONS), "duration": rng.randint(1, 3)}
+    return {"type": "modify_stat", "bonuses": {rng.choice(_STATS): rng.randint(-2, 2)}, "target": "self"}
+
+
+def _feature(rng: random.Random, api_index: str, layer: int) -> Json:
+    cls = rng.choice(_CLASSES)
+    raw: Json = {
+        "index": api_index,
+        "name": _title(rng, "Technique"),
+        "url": f"/api/2014/features/{api_index}",
+        "class": _ref("classes", cls),
+        "level": rng.randint(1, 20),
+        "prerequisites": [],
+        "desc": [_sentence(rng, 16), _sentence(rng, 8)],
+    }
+    if rng.random() < 0.6:
+        raw["target"] = rng.choice(("target", "self"))
+        raw["range"] = rng.choice(("melee", "ranged"))
+        raw["effects"] = [_effect(rng, 0) for _ in range(rng.randint(1, 3))]
+    return raw
+
+
+def _equipment(rng: random.Random, api_index: str, layer: int) -> Json:
+    raw: Json = {
+        "index": api_index,
+        "name": _title(rng, "Blade" if rng.random() < 0.6 else "Mail"),
+        "url": f"/api/2014/equipment/{api_index}",
+        "cost": {"quantity": rng.randint(1, 500), "unit": "gp"},
+        "weight": rng.randint(1, 65),
+        "desc": [],
+        "special": [],
+        "contents": [],
+        "properties": [],
+    }
+    if raw["name"].endswith("Blade"):
+        melee = rng.random() < 0.7
+        raw.update({
+            "equipment_category": _ref("equipment-categories", "weapon"),
+            "weapon_category": rng.choice(("Simple", "Martial")),
+            "weapon_range": "Melee" if melee else "Ranged",
+            "category_range": f"{rng.choice(('Simple', 'Martial'))} {'Melee' if melee else 'Ranged'}",
+            "damage": {"damage_dice": rng.choice(_DICE), "damage_type": _ref("damage-types", rng.choice(_DAMAGE_TYPES))},
+            "range": {"normal": 5} if melee else {"normal": 80, "long": 320},
+            "properties": [_ref("weapon-properties", p) for p in
+                           rng.sample(("finesse", "light", "heavy", "versatile", "thrown"), rng.randint(0, 2))],
+        })
+    else:
+        raw.update({
+            "equipment_category": _ref("equipment-categories", "armor"),
+            "armor_category": rng.choice(("Light", "Medium", "Heavy")),
+            "armor_class": {"base": rng.randint(11, 18), "dex_bonus": rng.random() < 0.5},
+            "str_minimum": rng.choice((0, 13, 15)),
+            "stealth_disadvantage": rng.random() < 0.3,
+        })
+    return raw
+
+
+def _spell(rng: random.Random, api_index: str, layer: int) -> Json:
+    level = rng.randint(0, 9)
+    raw: Json = {
+        "index": api_index,
+        "name": _title(rng, "Hex"),
+        "url": f"/api/2014/spells/{api_index}",
+        "level": level,
+        "school": _ref("magic-schools", rng.choice(_SCHOOLS)),
+        "classes": [_ref("classes", c) for c in rng.sample(_CLASSES, rng.randint(1, 3))],
+        "subclasses": [],
+        "components": rng.sample(["V", "S", "M"], rng.randint(1, 3)),
+        "range": rng.choice(("Self", "Touch", "30 feet", "60 feet", "120 feet")),
+        "duration": rng.choice(("Instantaneous", "1 minute", "1 hour")),
+        "concentration": rng.random() < 0.3,
+        "ritual": rng.random() < 0.1,
+        "casting_time": "1 action",
+        "desc": [_sentence(rng, 20)],
+        "higher_level": [_sentence(rng, 8)] if level else [],
+    }
+    if rng.random() < 0.6:
+        raw["damage"] = {
+            "damage_type": _ref("damage-types", rng.choice(_DAMAGE_TYPES)),
+            "damage_at_slot_level": {str(slot): f"{slot + 1}d6" for slot in range(max(1, level), 10)},
+        }
+    if rng.random() < 0.4:
+        raw["dc"] = {"dc_type": _ref("ability-scores", rng.choice(_STATS)), "dc_success": rng.choice(("half", "none"))}
+    return raw
+
+
+_BUILDERS: Dict[str, Callable[[random.Random, str, int], Json]] = {
+    "monsters": _monster,
+    "features": _feature,
+    "equipment": _equipment,
+    "spells": _spell,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate deterministic synthetic content packs.")
+    parser.add_argument("--out", required=True, help="Output directory (packs + codex manifest.json)")
+    parser.add_argument("--count", type=int, default=1000, help="Base entities per endpoint")
+    for endpoint in ENDPOINTS:
+        parser.add_argument(f"--{endpoint}", type=int, default=None, help=f"Base {endpoint} (default: --count)")
+    parser.add_argument("--layers", type=int, default=1, help="Packs in load order (1 base + overrides)")
+    parser.add_argument("--override-ratio", type=float, default=0.1, help="Share of base ids each override layer replaces")
+    parser.add_argument("--new-ratio", type=float, default=0.02, help="Share of new ids each override layer adds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes (0 = one per CPU)")
+    args = parser.parse_args()
+
+    counts = {endpoint: getattr(args, endpoint) for endpoint in ENDPOINTS}
+    spec = SyntheticSpec(
+        **{endpoint: args.count if value is None else value for endpoint, value in counts.items()},
+        layers=args.layers,
+        override_ratio=args.override_ratio,
+        new_ratio=args.new_ratio,
+        seed=args.seed,
+    )
+    out_dir = Path(args.out)
+    roots = generate_packs(out_dir, spec, jobs=args.jobs)
+    print(f"Wrote {len(roots)} packs to {out_dir} (codex manifest: {out_dir / 'manifest.json'})")
+
+
+if __name__ == "__main__":
+    main()